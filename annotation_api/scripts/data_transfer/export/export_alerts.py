@@ -5,10 +5,21 @@ materialize them as a self-contained ML dataset:
 
     OUTPUT_DIR/
     ├── manifest.jsonl                 # one line per alert
+    ├── image_checksums.jsonl          # size + sha256 of every image on disk
     └── images/{source_api}/{platform_alert_id}/{detection_id}.jpg
 
 Idempotent full pull: every run re-walks the export and rewrites the
-manifest; only images missing on disk are downloaded.
+manifest; only images missing on disk are downloaded. A download lands under
+its final name only once complete (Content-Length, and the S3 ETag when it is
+a plain MD5, are checked first), and its size and sha256 are appended to
+image_checksums.jsonl and copied into the manifest. An existing image whose
+size no longer matches its record is re-downloaded; --verify re-hashes every
+existing image instead. The next page is
+fetched while the current page's images download, on one download pool that
+lives for the whole walk.
+
+With --format parquet the manifest is written as a partitioned Parquet
+dataset (alerts.parquet/, see parquet_dataset.py) instead of manifest.jsonl.
 
 Example:
 uv run python -m scripts.data_transfer.export.export_alerts \
@@ -19,12 +30,14 @@ uv run python -m scripts.data_transfer.export.export_alerts \
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import logging
+import re
 import sys
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple
@@ -43,7 +56,16 @@ logger = logging.getLogger(__name__)
 
 DOWNLOAD_ATTEMPTS = 3
 DOWNLOAD_TIMEOUT_S = 30
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
 PAGE_TIMEOUT_S = 120
+CHECKSUMS_FILE = "image_checksums.jsonl"
+# An S3 ETag is the object's MD5 unless it was a multipart or SSE-KMS upload.
+_MD5_ETAG = re.compile(r"[0-9a-f]{32}")
+# Every complete JPEG ends with the End Of Image marker.
+_JPEG_EOI = b"\xff\xd9"
+
+# (size in bytes, sha256 hex digest) of an image file.
+Checksum = Tuple[int, str]
 
 
 def frame_rel_path(source_api: str, platform_alert_id: int, detection_id: int) -> str:
@@ -73,12 +95,18 @@ def plan_downloads(item: Dict[str, Any]) -> Dict[int, Tuple[Optional[str], str]]
     return plan
 
 
-def to_manifest_item(item: Dict[str, Any], materialized: Set[int]) -> Dict[str, Any]:
+def to_manifest_item(
+    item: Dict[str, Any],
+    materialized: Set[int],
+    checksums: Optional[Dict[int, Checksum]] = None,
+) -> Dict[str, Any]:
     """Copy of the API item with each frame's image_url swapped for image_path.
 
     image_path is set when the image file exists on disk (detection_id in
-    `materialized`), else None so a re-run can heal it.
+    `materialized`), else None so a re-run can heal it. image_bytes and
+    image_sha256 carry the file's entry in `checksums`, if any.
     """
+    checksums = checksums or {}
     out = json.loads(json.dumps(item))  # deep copy; payload is JSON-only data
     for obj in out["objects"]:
         for frame in obj["frames"]:
@@ -89,9 +117,89 @@ def to_manifest_item(item: Dict[str, Any], materialized: Set[int]) -> Dict[str,
                 if det_id in materialized
                 else None
             )
+            size, sha256 = checksums.get(det_id, (None, None))
+            frame["image_bytes"] = size
+            frame["image_sha256"] = sha256
     return out
 
 
+def file_checksum(path: Path) -> Checksum:
+    """(size, sha256) of a file, read in chunks."""
+    digest = hashlib.sha256()
+    size = 0
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(DOWNLOAD_CHUNK_BYTES), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    return size, digest.hexdigest()
+
+
+def _ends_like_jpeg(path: Path) -> bool:
+    with path.open("rb") as fh:
+        fh.seek(0, 2)
+        if fh.tell() < len(_JPEG_EOI):
+            return False
+        fh.seek(-len(_JPEG_EOI), 2)
+        return fh.read() == _JPEG_EOI
+
+
+class ChecksumLog:
+    """image_checksums.jsonl: the size and sha256 each image was written with.
+
+    Append-only while a run goes, one line per record and last line wins, so
+    the records of an interrupted run survive it; a line cut short by a crash
+    is ignored. compact() rewrites the file with one line per image.
+    Only the main thread records, like ExportStats.
+    """
+
+    def __init__(self, output_dir: Path) -> None:
+        self._path = output_dir / CHECKSUMS_FILE
+        self._records: Dict[str, Checksum] = {}
+        if self._path.exists():
+            with self._path.open(encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        entry = json.loads(line)
+                        self._records[entry["path"]] = (
+                            entry["bytes"],
+                            entry["sha256"],
+                        )
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        self._file = self._path.open("a", encoding="utf-8")
+
+    def get(self, rel_path: str) -> Optional[Checksum]:
+        return self._records.get(rel_path)
+
+    def record(self, rel_path: str, checksum: Checksum) -> None:
+        if self._records.get(rel_path) == checksum:
+            return
+        self._records[rel_path] = checksum
+        self._write(self._file, rel_path, checksum)
+        self._file.flush()
+
+    def forget(self, rel_path: str) -> None:
+        # Nothing to append: a record only counts for a file that exists.
+        self._records.pop(rel_path, None)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def compact(self) -> None:
+        self.close()
+        tmp = self._path.with_suffix(".jsonl.tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            for rel_path, checksum in sorted(self._records.items()):
+                self._write(fh, rel_path, checksum)
+        tmp.replace(self._path)
+
+    @staticmethod
+    def _write(fh: Any, rel_path: str, checksum: Checksum) -> None:
+        size, sha256 = checksum
+        fh.write(json.dumps({"path": rel_path, "bytes": size, "sha256": sha256}))
+        fh.write("\n")
+
+
 @dataclass
 class ExportStats:
     alerts: int = 0
@@ -99,6 +207,7 @@ class ExportStats:
     skipped: int = 0
     failed: int = 0
     missing_url: int = 0
+    corrupt: int = 0
 
 
 FetchPage = Callable[[Optional[str]], Dict[str, Any]]
@@ -108,28 +217,86 @@ Download = Callable[[str, Path], None]
 def _download_pending(
     pending: List[Tuple[int, str, Path]],
     download: Download,
-    max_workers: int,
+    pool: ThreadPoolExecutor,
     stats: ExportStats,
+    checksums: ChecksumLog,
+    output_dir: Path,
 ) -> None:
     """Download (detection_id, url, dest) triples concurrently, tallying stats.
 
-    Workers return a success flag and the tally happens on the main thread —
-    `stats.x += 1` from worker threads would race.
+    Workers return the written file's checksum (None on failure) and the
+    tally and records happen on the main thread — `stats.x += 1` from worker
+    threads would race.
     """
 
-    def fetch_one(entry: Tuple[int, str, Path]) -> bool:
+    def fetch_one(entry: Tuple[int, str, Path]) -> Optional[Checksum]:
         det_id, url, dest = entry
         try:
             download(url, dest)
-            return True
+            return file_checksum(dest)
         except Exception:
             logger.warning("Download failed for detection %s", det_id, exc_info=True)
-            return False
+            return None
+
+    for (_det_id, _url, dest), checksum in zip(pending, pool.map(fetch_one, pending)):
+        if checksum is None:
+            stats.failed += 1
+        else:
+            stats.downloaded += 1
+            checksums.record(dest.relative_to(output_dir).as_posix(), checksum)
+
+
+def _inspect_existing(dest: Path, expected: Optional[Checksum]) -> Optional[Checksum]:
+    """Checksum of an image already on disk, or None if it is not intact.
+
+    Checked against its record when there is one; a file from before
+    checksums were kept can only be checked for a JPEG's closing marker.
+    """
+    try:
+        checksum = file_checksum(dest)
+        if expected is not None:
+            return checksum if checksum == expected else None
+        return checksum if _ends_like_jpeg(dest) else None
+    except OSError:
+        return None
+
+
+class JsonlManifestWriter:
+    """manifest.jsonl, one line per alert.
+
+    Written to a .tmp sibling and renamed only on commit(), so an interrupted
+    run never replaces a good manifest.
+    """
+
+    def __init__(self, output_dir: Path) -> None:
+        self._final = output_dir / "manifest.jsonl"
+        self._tmp = output_dir / "manifest.jsonl.tmp"
+        self._file = self._tmp.open("w", encoding="utf-8")
+
+    def write_page(self, items: List[Dict[str, Any]]) -> None:
+        for item in items:
+            self._file.write(json.dumps(item) + "\n")
+
+    def close(self) -> None:
+        self._file.close()
 
-    with ThreadPoolExecutor(max_workers=max_workers) as pool:
-        results = list(pool.map(fetch_one, pending))
-    stats.downloaded += sum(results)
-    stats.failed += len(results) - sum(results)
+    def commit(self) -> None:
+        self.close()
+        self._tmp.replace(self._final)
+
+
+OUTPUT_FORMATS = ("jsonl", "parquet")
+
+
+def _open_writer(output_format: str, output_dir: Path):
+    if output_format == "parquet":
+        # Imported here: pyarrow is only needed for this format.
+        from scripts.data_transfer.export.parquet_dataset import (
+            ParquetDatasetWriter,
+        )
+
+        return ParquetDatasetWriter(output_dir)
+    return JsonlManifestWriter(output_dir)
 
 
 def run_export(
@@ -137,52 +304,133 @@ def run_export(
     download: Download,
     output_dir: Path,
     max_workers: int,
+    output_format: str = "jsonl",
+    verify: bool = False,
 ) -> ExportStats:
     """Walk the export cursor, download missing images, rewrite the manifest.
 
-    The manifest is written to a .tmp sibling and renamed only after the walk
-    completes, so an interrupted run never replaces a good manifest.
+    Each page's manifest items are handed to the writer for ``output_format``
+    as soon as its images are in; the previous manifest is only replaced
+    once the walk completes. The following page is requested as soon as a
+    page arrives, so its fetch overlaps this page's downloads. Lookahead is a
+    single page: a prefetched presigned URL only waits out the downloads of
+    the page before it.
+
+    An image already on disk is kept when its size matches its checksum
+    record; with ``verify`` it is re-hashed instead. Either way an image that
+    fails its check is deleted and downloaded again.
     """
     stats = ExportStats()
     output_dir.mkdir(parents=True, exist_ok=True)
-    tmp_manifest = output_dir / "manifest.jsonl.tmp"
-
-    with tmp_manifest.open("w", encoding="utf-8") as manifest:
-        cursor: Optional[str] = None
-        while True:
-            page = fetch_page(cursor)
-            plans = [(item, plan_downloads(item)) for item in page["items"]]
-
-            pending: List[Tuple[int, str, Path]] = []
-            for _, plan in plans:
-                for det_id, (url, rel) in plan.items():
-                    dest = output_dir / rel
-                    if dest.exists():
-                        stats.skipped += 1
-                    elif url is None:
-                        stats.missing_url += 1
-                        logger.warning("No image_url for detection %s", det_id)
-                    else:
-                        pending.append((det_id, url, dest))
-            _download_pending(pending, download, max_workers, stats)
-
-            for item, plan in plans:
-                materialized = {
-                    det_id
-                    for det_id, (_, rel) in plan.items()
-                    if (output_dir / rel).exists()
-                }
-                manifest.write(json.dumps(to_manifest_item(item, materialized)) + "\n")
-                stats.alerts += 1
-
-            cursor = page.get("next_cursor")
-            if cursor is None:
-                break
-
-    tmp_manifest.replace(output_dir / "manifest.jsonl")
+    writer = _open_writer(output_format, output_dir)
+    checksums = ChecksumLog(output_dir)
+
+    try:
+        with ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="export-page"
+        ) as page_pool, ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="export-download"
+        ) as download_pool:
+            next_page: Optional[Future] = page_pool.submit(fetch_page, None)
+            while next_page is not None:
+                page = next_page.result()
+                cursor: Optional[str] = page.get("next_cursor")
+                next_page = (
+                    page_pool.submit(fetch_page, cursor) if cursor is not None else None
+                )
+                _export_page(
+                    page,
+                    download,
+                    download_pool,
+                    output_dir,
+                    writer,
+                    stats,
+                    checksums,
+                    verify,
+                )
+    finally:
+        writer.close()
+        checksums.close()
+
+    writer.commit()
+    checksums.compact()
     return stats
 
 
+def _export_page(
+    page: Dict[str, Any],
+    download: Download,
+    download_pool: ThreadPoolExecutor,
+    output_dir: Path,
+    writer: Any,
+    stats: ExportStats,
+    checksums: ChecksumLog,
+    verify: bool,
+) -> None:
+    """Download one page's missing or damaged images, then hand its items to
+    `writer`."""
+    plans = [(item, plan_downloads(item)) for item in page["items"]]
+
+    # Images on disk that need reading before they can be trusted.
+    to_inspect: List[Tuple[int, Optional[str], str]] = []
+    absent: List[Tuple[int, Optional[str], str]] = []
+    for _, plan in plans:
+        for det_id, (url, rel) in plan.items():
+            dest = output_dir / rel
+            record = checksums.get(rel)
+            if not dest.exists():
+                absent.append((det_id, url, rel))
+            elif record is None or verify:
+                to_inspect.append((det_id, url, rel))
+            elif dest.stat().st_size == record[0]:
+                stats.skipped += 1
+            else:
+                logger.warning("Image %s does not have its recorded size", rel)
+                _discard(output_dir, rel, checksums, stats)
+                absent.append((det_id, url, rel))
+
+    inspected = download_pool.map(
+        lambda entry: _inspect_existing(output_dir / entry[2], checksums.get(entry[2])),
+        to_inspect,
+    )
+    for (det_id, url, rel), checksum in zip(to_inspect, list(inspected)):
+        if checksum is not None:
+            stats.skipped += 1
+            checksums.record(rel, checksum)
+        else:
+            logger.warning("Image %s failed its integrity check", rel)
+            _discard(output_dir, rel, checksums, stats)
+            absent.append((det_id, url, rel))
+
+    pending: List[Tuple[int, str, Path]] = []
+    for det_id, url, rel in absent:
+        if url is None:
+            stats.missing_url += 1
+            logger.warning("No image_url for detection %s", det_id)
+        else:
+            pending.append((det_id, url, output_dir / rel))
+    _download_pending(pending, download, download_pool, stats, checksums, output_dir)
+
+    manifest_items = []
+    for item, plan in plans:
+        recorded = {
+            det_id: checksums.get(rel)
+            for det_id, (_, rel) in plan.items()
+            if (output_dir / rel).exists() and checksums.get(rel) is not None
+        }
+        manifest_items.append(to_manifest_item(item, set(recorded), recorded))
+    writer.write_page(manifest_items)
+    stats.alerts += len(manifest_items)
+
+
+def _discard(
+    output_dir: Path, rel: str, checksums: ChecksumLog, stats: ExportStats
+) -> None:
+    (output_dir / rel).unlink(missing_ok=True)
+    checksums.forget(rel)
+    stats.corrupt += 1
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Export annotated alerts (manifest + images) from the "
@@ -203,12 +451,28 @@ def parse_args() -> argparse.Namespace:
         "--page-size",
         type=int,
         default=100,
-        help="Alerts per page (max 500); one page's downloads bound how old "
-        "a presigned image URL can get before use",
+        help="Alerts per page (max 500); the next page is fetched while this "
+        "one downloads, so two pages' downloads bound how old a presigned "
+        "image URL can get before use",
     )
     parser.add_argument(
         "--max-workers", type=int, default=4, help="Concurrent image downloads"
     )
+    parser.add_argument(
+        "--format",
+        dest="output_format",
+        default="jsonl",
+        choices=OUTPUT_FORMATS,
+        help="Manifest format: manifest.jsonl, or a Parquet dataset partitioned "
+        "by source_api and month (alerts.parquet/, needs pyarrow)",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Re-hash every image already on disk against its recorded "
+        "checksum (on --max-workers threads) and re-download any that fail, "
+        "instead of only comparing sizes",
+    )
     parser.add_argument(
         "--loglevel",
         default="info",
@@ -252,17 +516,49 @@ def _download_session() -> requests.Session:
     return session
 
 
+class IncompleteDownload(Exception):
+    """The body received does not match the response's length or ETag."""
+
+
+def _download_to(url: str, part: Path) -> None:
+    """Stream `url` into `part`, checking it against the response headers.
+
+    Content-Length catches a cut-off body; a plain-MD5 ETag also catches a
+    corrupted one. Neither applies to a content-encoded body, whose headers
+    describe the encoded bytes.
+    """
+    with _download_session().get(
+        url, timeout=DOWNLOAD_TIMEOUT_S, stream=True
+    ) as response:
+        response.raise_for_status()
+        md5 = hashlib.md5(usedforsecurity=False)
+        size = 0
+        with part.open("wb") as fh:
+            for chunk in response.iter_content(DOWNLOAD_CHUNK_BYTES):
+                fh.write(chunk)
+                md5.update(chunk)
+                size += len(chunk)
+        if response.headers.get("Content-Encoding"):
+            return
+        length = response.headers.get("Content-Length")
+        if length is not None and size != int(length):
+            raise IncompleteDownload(f"got {size} of {length} bytes")
+        etag = response.headers.get("ETag", "").strip('"')
+        if _MD5_ETAG.fullmatch(etag) and md5.hexdigest() != etag:
+            raise IncompleteDownload(f"MD5 {md5.hexdigest()} does not match ETag")
+
+
 def _download_impl(url: str, dest: Path) -> None:
+    """Download to a .part sibling, renamed into place only once verified."""
     dest.parent.mkdir(parents=True, exist_ok=True)
+    part = dest.with_suffix(dest.suffix + ".part")
     for attempt in range(DOWNLOAD_ATTEMPTS):
         try:
-            response = _download_session().get(url, timeout=DOWNLOAD_TIMEOUT_S)
-            response.raise_for_status()
-            part = dest.with_suffix(dest.suffix + ".part")
-            part.write_bytes(response.content)
+            _download_to(url, part)
             part.replace(dest)
             return
-        except requests.RequestException:
+        except (requests.RequestException, IncompleteDownload):
+            part.unlink(missing_ok=True)
             if attempt == DOWNLOAD_ATTEMPTS - 1:
                 raise
             time.sleep(2**attempt)
@@ -285,15 +581,18 @@ def main() -> None:
         _download_impl,
         args.output_dir,
         args.max_workers,
+        args.output_format,
+        args.verify,
     )
     logger.info(
         "Exported %d alerts: %d images downloaded, %d already present, "
-        "%d failed, %d without URL",
+        "%d failed, %d without URL, %d damaged on disk",
         stats.alerts,
         stats.downloaded,
         stats.skipped,
         stats.failed,
         stats.missing_url,
+        stats.corrupt,
     )
     if stats.failed:
         logger.error(
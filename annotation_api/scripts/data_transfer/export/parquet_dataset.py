@@ -0,0 +1,177 @@
+"""
+Columnar form of the export_alerts manifest: the same alert -> object ->
+frame -> box hierarchy as manifest.jsonl, written as a hive-partitioned
+Parquet dataset so training jobs can memory-map and filter it:
+
+    OUTPUT_DIR/alerts.parquet/source_api={source_api}/month={YYYY-MM}/part-0.parquet
+
+One row per alert, partitioned by source_api and by the month of the alert's
+recorded_at; both come back as columns when read with hive partitioning
+(``pyarrow.dataset.dataset(path, partitioning="hive")``). Boxes are
+fixed-size ``[x1, y1, x2, y2]`` float64 lists.
+
+Needs pyarrow, which is not a project dependency:
+uv run --with pyarrow python -m scripts.data_transfer.export.export_alerts \
+  --format parquet ...
+"""
+
+from __future__ import annotations
+
+import shutil
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+DATASET_DIR = "alerts.parquet"
+
+BOX = pa.struct(
+    [
+        ("xyxyn", pa.list_(pa.float64(), 4)),
+        ("smoke_type", pa.string()),
+        ("false_positive_types", pa.list_(pa.string())),
+        ("origin", pa.string()),
+    ]
+)
+FRAME = pa.struct(
+    [
+        ("detection_id", pa.int64()),
+        ("recorded_at", pa.timestamp("us", tz="UTC")),
+        ("bucket_key", pa.string()),
+        ("image_path", pa.string()),
+        ("image_bytes", pa.int64()),
+        ("image_sha256", pa.string()),
+        ("boxes", pa.list_(BOX)),
+    ]
+)
+OBJECT = pa.struct(
+    [
+        ("sequence_id", pa.int64()),
+        ("record_kind", pa.string()),
+        ("smoke_types", pa.list_(pa.string())),
+        ("false_positive_types", pa.list_(pa.string())),
+        ("frames", pa.list_(FRAME)),
+    ]
+)
+# source_api is a partition key, so it lives in the directory names only.
+ALERT_SCHEMA = pa.schema(
+    [
+        ("platform_alert_id", pa.int64()),
+        ("camera_id", pa.int64()),
+        ("camera_name", pa.string()),
+        ("organisation_id", pa.int64()),
+        ("organisation_name", pa.string()),
+        ("lat", pa.float64()),
+        ("lon", pa.float64()),
+        ("azimuth", pa.int64()),
+        ("recorded_at", pa.timestamp("us", tz="UTC")),
+        ("last_annotated_at", pa.timestamp("us", tz="UTC")),
+        ("temporal_model_score", pa.float64()),
+        ("temporal_model_version", pa.string()),
+        ("temporal_api_version", pa.string()),
+        ("objects", pa.list_(OBJECT)),
+    ]
+)
+
+
+def _timestamp(value: Optional[str]) -> Optional[datetime]:
+    """API datetimes are ISO strings; naive ones are UTC."""
+    if value is None:
+        return None
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+def partition_of(item: Dict[str, Any]) -> Tuple[str, str]:
+    """(source_api, YYYY-MM of the alert's recorded_at) for a manifest item."""
+    return item["source_api"], _timestamp(item["recorded_at"]).strftime("%Y-%m")
+
+
+def to_row(item: Dict[str, Any]) -> Dict[str, Any]:
+    """A manifest item (see export_alerts.to_manifest_item) as an ALERT_SCHEMA
+    row: partition key dropped, datetimes parsed."""
+    row = {name: item.get(name) for name in ALERT_SCHEMA.names}
+    row["recorded_at"] = _timestamp(item["recorded_at"])
+    row["last_annotated_at"] = _timestamp(item["last_annotated_at"])
+    row["objects"] = [
+        {
+            **obj,
+            "frames": [
+                {**frame, "recorded_at": _timestamp(frame["recorded_at"])}
+                for frame in obj["frames"]
+            ],
+        }
+        for obj in item["objects"]
+    ]
+    return row
+
+
+# Rows per row group. Pages follow alert keys, not time, so a page spreads
+# over many (source_api, month) partitions: rows are buffered per partition
+# and written once this many have gathered, or on close().
+ROW_GROUP_ROWS = 10_000
+# Cap on the rows buffered across all partitions; past it, the partition
+# holding the most is written early.
+MAX_BUFFERED_ROWS = 4 * ROW_GROUP_ROWS
+
+
+class ParquetDatasetWriter:
+    """Writes manifest items page by page into a partitioned dataset.
+
+    Keeps one open file per partition and buffers each partition's rows into
+    row groups of ROW_GROUP_ROWS, so a file is a few large row groups rather
+    than one small one per page. Everything goes to a .tmp sibling that
+    replaces the previous dataset only on commit(), like manifest.jsonl.
+    """
+
+    def __init__(self, output_dir: Path) -> None:
+        self._final = output_dir / DATASET_DIR
+        self._tmp = output_dir / f"{DATASET_DIR}.tmp"
+        shutil.rmtree(self._tmp, ignore_errors=True)
+        self._writers: Dict[Tuple[str, str], pq.ParquetWriter] = {}
+        self._buffers: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._buffered = 0
+
+    def _writer(self, partition: Tuple[str, str]) -> pq.ParquetWriter:
+        writer = self._writers.get(partition)
+        if writer is None:
+            source_api, month = partition
+            path = self._tmp / f"source_api={source_api}" / f"month={month}"
+            path.mkdir(parents=True, exist_ok=True)
+            writer = pq.ParquetWriter(path / "part-0.parquet", ALERT_SCHEMA)
+            self._writers[partition] = writer
+        return writer
+
+    def _flush(self, partition: Tuple[str, str]) -> None:
+        rows = self._buffers.pop(partition)
+        self._buffered -= len(rows)
+        self._writer(partition).write_table(
+            pa.Table.from_pylist(rows, schema=ALERT_SCHEMA),
+            row_group_size=ROW_GROUP_ROWS,
+        )
+
+    def write_page(self, items: List[Dict[str, Any]]) -> None:
+        for item in items:
+            partition = partition_of(item)
+            rows = self._buffers.setdefault(partition, [])
+            rows.append(to_row(item))
+            self._buffered += 1
+            if len(rows) >= ROW_GROUP_ROWS:
+                self._flush(partition)
+        while self._buffered > MAX_BUFFERED_ROWS:
+            self._flush(max(self._buffers, key=lambda p: len(self._buffers[p])))
+
+    def close(self) -> None:
+        for partition in list(self._buffers):
+            self._flush(partition)
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+    def commit(self) -> None:
+        self.close()
+        self._tmp.mkdir(parents=True, exist_ok=True)
+        shutil.rmtree(self._final, ignore_errors=True)
+        self._tmp.replace(self._final)
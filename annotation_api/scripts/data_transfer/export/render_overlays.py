@@ -17,9 +17,19 @@ usually distinct bucket_keys), so frames are aligned across lanes by exact
 the union of two objects at opposite ends of the frame just reproduces the
 frame.
 
+Sheets are independent of one another, so ``--workers`` renders them in a
+process pool; index.csv lists them in the same order whatever the worker count.
+One task covers all sheets of one alert, which share a cache of decoded
+captures: with ``--mode both`` the multi-object sheet's backdrops are the
+per-lane sheet's frames, decoded once for both.
+
+Reruns are incremental: fingerprints.json, next to index.csv, records a hash
+of each sheet's inputs, and a sheet whose inputs are unchanged since it was
+written is kept as is. ``--force`` re-renders everything.
+
 Example:
 uv run python -m scripts.data_transfer.export.render_overlays \
-  --dataset-dir outputs/alerts_export --fp-sample 40 --loglevel info
+  --dataset-dir outputs/alerts_export --fp-sample 40 --workers 8 --loglevel info
 """
 
 from __future__ import annotations
@@ -27,9 +37,15 @@ from __future__ import annotations
 import argparse
 import collections
 import csv
+import hashlib
 import json
+import os
 import logging
 import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 
@@ -45,6 +61,8 @@ MAX_COLS = 5
 HEADER_H = 56
 # Crop window = box size * this, so the box fills about a third of the panel.
 CROP_CONTEXT = 3.0
+# Decoded captures kept per alert; see FrameCache.
+FRAME_CACHE_SIZE = 64
 # A box narrower than this many pixels is drawn at this size on the full frame,
 # or a horizon-sized detection would be a single invisible pixel.
 MIN_BOX_PX = 8
@@ -56,6 +74,26 @@ LANE_COLORS = [
     (255, 0, 255),
     (255, 210, 0),
 ]
+# (item, lanes, output path, index.csv row) of one sheet to render.
+SheetJob = Tuple[Dict[str, Any], List[Dict[str, Any]], Path, Dict[str, Any]]
+
+# Part of every fingerprint: bump it when a change to the drawing code should
+# re-render sheets whose inputs did not change.
+RENDER_VERSION = 1
+FINGERPRINTS_FILE = "fingerprints.json"
+
+INDEX_FIELDS = [
+    "sheet",
+    "record_kind",
+    "platform_alert_id",
+    "sequence_id",
+    "camera_name",
+    "organisation",
+    "types",
+    "frames",
+    "boxes",
+    "recorded_at",
+]
 FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
 FONT_BOLD_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
 
@@ -85,10 +123,10 @@ def lane_types(obj: Dict[str, Any]) -> List[str]:
 
 
 def draw_full(
-    img: Image.Image, entries: List[Tuple[Tuple[int, int, int], Any]]
+    cell: Image.Image, entries: List[Tuple[Tuple[int, int, int], Any]]
 ) -> Image.Image:
-    """Frame scaled to a cell, every lane's boxes drawn at a visible minimum."""
-    cell = img.resize((FULL_W, FULL_H))
+    """Frame at cell size, every lane's boxes drawn at a visible minimum."""
+    cell = cell.copy()
     d = ImageDraw.Draw(cell)
     for color, box in entries:
         x1, y1, x2, y2 = box["xyxyn"]
@@ -104,7 +142,7 @@ def draw_full(
 
 
 def lane_panel(
-    img: Image.Image,
+    img: Optional[Image.Image],
     color: Tuple[int, int, int],
     seq_id: int,
     boxes: List[Dict[str, Any]],
@@ -120,6 +158,7 @@ def lane_panel(
         d.rectangle([0, 0, panel_w - 1, CROP_H - 1], outline=color, width=2)
         return panel
 
+    assert img is not None, "a lane with boxes needs the full-resolution frame"
     w, h = img.size
     xs = [v for b in boxes for v in (b["xyxyn"][0], b["xyxyn"][2])]
     ys = [v for b in boxes for v in (b["xyxyn"][1], b["xyxyn"][3])]
@@ -160,26 +199,74 @@ def lane_panel(
     return region
 
 
+@dataclass
+class DecodedFrame:
+    """A decoded capture: scaled to a cell, and at full resolution for crops."""
+
+    cell: Image.Image
+    full: Optional[Image.Image]
+
+
+class FrameCache:
+    """
+    Bounded LRU of decoded captures, keyed by image_path.
+
+    A capture only needed on the full-frame row (no box to crop around) is
+    decoded in JPEG draft mode, straight at a reduced scale close to the cell
+    size; full resolution is decoded, and kept, only for captures whose boxes
+    get a zoom panel. A maxsize of 0 decodes every time.
+    """
+
+    def __init__(self, dataset_dir: Path, maxsize: int = FRAME_CACHE_SIZE) -> None:
+        self.dataset_dir = dataset_dir
+        self.maxsize = maxsize
+        self._frames: "OrderedDict[str, DecodedFrame]" = OrderedDict()
+
+    def get(self, path: str, need_full: bool) -> DecodedFrame:
+        """The decoded capture at `path`; raises OSError/ValueError if unusable."""
+        frame = self._frames.get(path)
+        if frame is not None and (frame.full is not None or not need_full):
+            self._frames.move_to_end(path)
+            return frame
+        frame = self._decode(path, need_full)
+        if self.maxsize > 0:
+            self._frames[path] = frame
+            self._frames.move_to_end(path)
+            while len(self._frames) > self.maxsize:
+                self._frames.popitem(last=False)
+        return frame
+
+    def _decode(self, path: str, need_full: bool) -> DecodedFrame:
+        with Image.open(self.dataset_dir / path) as img:
+            if not need_full:
+                img.draft("RGB", (FULL_W, FULL_H))
+            # convert() forces the decode, so a truncated file fails here
+            # rather than later mid-render.
+            full = img.convert("RGB")
+        return DecodedFrame(
+            cell=full.resize((FULL_W, FULL_H)), full=full if need_full else None
+        )
+
+
 def open_backdrop(
-    dataset_dir: Path, per_lane: Dict[int, Dict[str, Any]]
-) -> Optional[Image.Image]:
+    cache: FrameCache, per_lane: Dict[int, Dict[str, Any]], need_full: bool
+) -> Optional[DecodedFrame]:
     """Decode some lane's copy of this capture, or None if none can be read.
 
     Sibling lanes hold their own copies of one capture, so any of them serves
     as the backdrop; lanes are tried in sequence-id order so the pick is
     stable, and a lane whose copy is missing or corrupt simply yields to the
     next. Two ways a copy is unusable: the exporter writes image_path null for
-    a download it could not complete, and a download that produced a truncated
-    file is never retried (its idempotency check is mere existence).
+    a download it could not complete, and a file can be damaged on disk after
+    the manifest was written (the exporter's next run catches a truncation,
+    its --verify any change).
     """
     for _seq_id, frame in sorted(per_lane.items()):
         path = frame.get("image_path")
         if not path:
             continue
         try:
-            # convert() forces the decode, so a truncated file fails here
-            # rather than later mid-render.
-            return Image.open(dataset_dir / path).convert("RGB")
+            return cache.get(path, need_full)
         except (OSError, ValueError) as exc:
             logger.warning("Unusable image %s: %s", path, exc)
     return None
@@ -190,6 +277,7 @@ def render_sheet(
     item: Dict[str, Any],
     lanes: List[Dict[str, Any]],
     out_path: Path,
+    cache: Optional[FrameCache] = None,
 ) -> bool:
     """One sheet covering `lanes` of `item`, frames aligned by recorded_at.
 
@@ -197,6 +285,8 @@ def render_sheet(
     or corrupt yields nothing, and the caller must not index a file that does
     not exist.
     """
+    if cache is None:
+        cache = FrameCache(dataset_dir, maxsize=0)
     if len(lanes) > len(LANE_COLORS):
         logger.warning(
             "alert %s has %d lanes but only %d distinct colours; some lanes "
@@ -222,8 +312,10 @@ def render_sheet(
     cells: List[Tuple[Image.Image, Image.Image, str]] = []
     for timestamp in sorted(by_time):
         per_lane = by_time[timestamp]
-        img = open_backdrop(dataset_dir, per_lane)
-        if img is None:
+        decoded = open_backdrop(
+            cache, per_lane, any(frame["boxes"] for frame in per_lane.values())
+        )
+        if decoded is None:
             continue
         entries = [
             (colors[seq_id], box)
@@ -244,14 +336,20 @@ def render_sheet(
                 )
                 pd.rectangle([0, 0, panel_w - 1, CROP_H - 1], outline=(80, 80, 80))
             else:
-                panel = lane_panel(img, colors[seq_id], seq_id, frame["boxes"], panel_w)
+                panel = lane_panel(
+                    decoded.full, colors[seq_id], seq_id, frame["boxes"], panel_w
+                )
             crop_row.paste(panel, (panel_i * panel_w, 0))
         present = ", ".join(
             f"{seq_id}:{len(f['boxes'])}b/det{f['detection_id']}"
             for seq_id, f in sorted(per_lane.items())
         )
         cells.append(
-            (draw_full(img, entries), crop_row, f"{timestamp[11:19]}  {present}")
+            (
+                draw_full(decoded.cell, entries),
+                crop_row,
+                f"{timestamp[11:19]}  {present}",
+            )
         )
 
     dropped = len(by_time) - len(cells)
@@ -380,6 +478,227 @@ def load_manifest(
     return items
 
 
+def plan_sheets(
+    items: List[Dict[str, Any]], out_dir: Path, mode: str, fp_sample: int
+) -> List[SheetJob]:
+    """Every sheet to render as (item, lanes, path, index row), in index order."""
+    jobs: List[SheetJob] = []
+
+    if mode in ("objects", "both"):
+        for item, obj in select_lanes(items, fp_sample):
+            name = (
+                f"alert{item['platform_alert_id']}_seq{obj['sequence_id']}"
+                f"_{slug(item['camera_name'])}.png"
+            )
+            path = out_dir / obj["record_kind"] / name
+            row = {
+                "sheet": str(path.relative_to(out_dir)),
+                "record_kind": obj["record_kind"],
+                "platform_alert_id": item["platform_alert_id"],
+                "sequence_id": obj["sequence_id"],
+                "camera_name": item["camera_name"],
+                "organisation": item["organisation_name"],
+                "types": ";".join(lane_types(obj)),
+                "frames": len(obj["frames"]),
+                "boxes": sum(len(f["boxes"]) for f in obj["frames"]),
+                "recorded_at": item["recorded_at"][:19],
+            }
+            jobs.append((item, [obj], path, row))
+
+    if mode in ("multi", "both"):
+        for item in items:
+            lanes = item["objects"]
+            if len(lanes) < 2:
+                continue
+            name = (
+                f"alert{item['platform_alert_id']}_{slug(item['camera_name'])}"
+                f"_{len(lanes)}objects.png"
+            )
+            path = out_dir / "multi_object" / name
+            row = {
+                "sheet": str(path.relative_to(out_dir)),
+                "record_kind": "+".join(o["record_kind"] for o in lanes),
+                "platform_alert_id": item["platform_alert_id"],
+                "sequence_id": ";".join(str(o["sequence_id"]) for o in lanes),
+                "camera_name": item["camera_name"],
+                "organisation": item["organisation_name"],
+                "types": " vs ".join(",".join(lane_types(o)) or "-" for o in lanes),
+                "frames": sum(len(o["frames"]) for o in lanes),
+                "boxes": sum(len(f["boxes"]) for o in lanes for f in o["frames"]),
+                "recorded_at": item["recorded_at"][:19],
+            }
+            jobs.append((item, lanes, path, row))
+
+    return jobs
+
+
+def _init_worker(loglevel: str) -> None:
+    """Give a pool process the parent's logging setup (lost under spawn)."""
+    logging.basicConfig(
+        level=loglevel.upper(),
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
+
+
+def render_alert_sheets(
+    dataset_dir: Path,
+    sheets: List[Tuple[Dict[str, Any], List[Dict[str, Any]], Path]],
+    cache_size: int = FRAME_CACHE_SIZE,
+) -> List[bool]:
+    """Render one alert's sheets sharing a FrameCache; whether each was written.
+
+    Image paths are per alert, so a cache outliving the alert could never hit.
+    The multi-object sheet draws on the lowest lane's copies, so it goes first
+    and that lane's sheet, which sorts next, finds them still cached.
+    """
+    cache = FrameCache(dataset_dir, cache_size)
+    order = sorted(
+        range(len(sheets)),
+        key=lambda i: (len(sheets[i][1]) < 2, sheets[i][1][0]["sequence_id"]),
+    )
+    written = [False] * len(sheets)
+    for i in order:
+        item, lanes, path = sheets[i]
+        written[i] = render_sheet(dataset_dir, item, lanes, path, cache)
+    return written
+
+
+def render_sheets(
+    dataset_dir: Path,
+    jobs: List[SheetJob],
+    workers: int,
+    loglevel: str = "info",
+    cache_size: int = FRAME_CACHE_SIZE,
+) -> List[Dict[str, Any]]:
+    """Render `jobs` on `workers` processes; the index rows of sheets written.
+
+    Each task is one alert's sheets (see render_alert_sheets). Rows keep the
+    order of `jobs` whatever finishes first, so index.csv is the same for any
+    worker count.
+    """
+    by_alert: Dict[int, List[int]] = collections.defaultdict(list)
+    for i, (item, _lanes, _path, _row) in enumerate(jobs):
+        by_alert[item["platform_alert_id"]].append(i)
+    groups = list(by_alert.values())
+    tasks = [[jobs[i][:3] for i in group] for group in groups]
+
+    if workers <= 1 or len(tasks) <= 1:
+        results = list(
+            map(render_alert_sheets, repeat(dataset_dir), tasks, repeat(cache_size))
+        )
+    else:
+        # An alert takes far longer to render than its task takes to pickle,
+        # so small chunks keep every process busy until the end.
+        chunksize = max(1, len(tasks) // (workers * 16))
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(loglevel,)
+        ) as pool:
+            results = list(
+                pool.map(
+                    render_alert_sheets,
+                    repeat(dataset_dir),
+                    tasks,
+                    repeat(cache_size),
+                    chunksize=chunksize,
+                )
+            )
+
+    written = [False] * len(jobs)
+    for group, flags in zip(groups, results):
+        for i, ok in zip(group, flags):
+            written[i] = ok
+    return [row for (_item, _lanes, _path, row), ok in zip(jobs, written) if ok]
+
+
+def sheet_fingerprint(
+    dataset_dir: Path, item: Dict[str, Any], lanes: List[Dict[str, Any]]
+) -> str:
+    """Hash of everything a sheet is drawn from.
+
+    That is the header fields, the lanes with their frames and boxes, and
+    each image file's size and mtime: the exporter never rewrites an image in
+    place, so a changed file also has a changed stat, and stat-ing a frame is
+    far cheaper than reading it.
+    """
+    images = {}
+    for obj in lanes:
+        for frame in obj["frames"]:
+            path = frame.get("image_path")
+            if path:
+                try:
+                    st = os.stat(dataset_dir / path)
+                    images[path] = [st.st_size, st.st_mtime_ns]
+                except OSError:
+                    images[path] = None
+    payload = {
+        "version": RENDER_VERSION,
+        "item": {
+            key: item[key]
+            for key in (
+                "platform_alert_id",
+                "camera_name",
+                "organisation_name",
+                "recorded_at",
+            )
+        },
+        "lanes": lanes,
+        "images": images,
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def load_fingerprints(out_dir: Path) -> Dict[str, str]:
+    """Fingerprints of the sheets a previous run wrote, keyed by sheet path."""
+    try:
+        with (out_dir / FINGERPRINTS_FILE).open(encoding="utf-8") as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable %s: %s", FINGERPRINTS_FILE, exc)
+        return {}
+
+
+def save_fingerprints(out_dir: Path, fingerprints: Dict[str, str]) -> None:
+    # Written aside and renamed, so an interrupted run leaves the old file.
+    path = out_dir / FINGERPRINTS_FILE
+    tmp = path.with_suffix(".json.tmp")
+    with tmp.open("w", encoding="utf-8") as fh:
+        json.dump(fingerprints, fh, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def split_stale(
+    dataset_dir: Path,
+    jobs: List[SheetJob],
+    previous: Dict[str, str],
+) -> Tuple[List[SheetJob], Dict[str, str]]:
+    """The jobs to render, and every job's current fingerprint by sheet.
+
+    A job is up to date when its sheet exists and was written from inputs
+    with the same fingerprint.
+    """
+    fingerprints = {}
+    stale = []
+    for item, lanes, path, row in jobs:
+        fingerprint = sheet_fingerprint(dataset_dir, item, lanes)
+        fingerprints[row["sheet"]] = fingerprint
+        if previous.get(row["sheet"]) != fingerprint or not path.exists():
+            stale.append((item, lanes, path, row))
+    return stale, fingerprints
+
+
+def write_index(out_dir: Path, rows: List[Dict[str, Any]]) -> Path:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    index = out_dir / "index.csv"
+    with index.open("w", encoding="utf-8", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=INDEX_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return index
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Render QA contact sheets from an exported alert dataset"
@@ -417,6 +736,25 @@ def parse_args() -> argparse.Namespace:
         nargs="*",
         help="Restrict to these platform_alert_ids",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes rendering sheets in parallel",
+    )
+    parser.add_argument(
+        "--frame-cache-size",
+        type=int,
+        default=FRAME_CACHE_SIZE,
+        help="Decoded captures each worker keeps while rendering one alert's "
+        "sheets, 0 to decode every time",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render every sheet, even those whose inputs are unchanged "
+        "since the last run",
+    )
     parser.add_argument(
         "--loglevel",
         default="info",
@@ -428,88 +766,40 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> None:
     args = parse_args()
-    logging.basicConfig(
-        level=args.loglevel.upper(),
-        format="%(asctime)s - %(levelname)s - %(message)s",
-    )
+    _init_worker(args.loglevel)
+    if args.workers < 1:
+        raise SystemExit("--workers must be at least 1")
     out_dir = args.output_dir or args.dataset_dir / "overlays"
     items = load_manifest(args.dataset_dir, args.alerts)
     logger.info("Loaded %d alerts from %s", len(items), args.dataset_dir)
 
-    rows: List[Dict[str, Any]] = []
-
-    if args.mode in ("objects", "both"):
-        for item, obj in select_lanes(items, args.fp_sample):
-            name = (
-                f"alert{item['platform_alert_id']}_seq{obj['sequence_id']}"
-                f"_{slug(item['camera_name'])}.png"
-            )
-            path = out_dir / obj["record_kind"] / name
-            if not render_sheet(args.dataset_dir, item, [obj], path):
-                continue
-            rows.append(
-                {
-                    "sheet": str(path.relative_to(out_dir)),
-                    "record_kind": obj["record_kind"],
-                    "platform_alert_id": item["platform_alert_id"],
-                    "sequence_id": obj["sequence_id"],
-                    "camera_name": item["camera_name"],
-                    "organisation": item["organisation_name"],
-                    "types": ";".join(lane_types(obj)),
-                    "frames": len(obj["frames"]),
-                    "boxes": sum(len(f["boxes"]) for f in obj["frames"]),
-                    "recorded_at": item["recorded_at"][:19],
-                }
-            )
-
-    if args.mode in ("multi", "both"):
-        for item in items:
-            lanes = item["objects"]
-            if len(lanes) < 2:
-                continue
-            name = (
-                f"alert{item['platform_alert_id']}_{slug(item['camera_name'])}"
-                f"_{len(lanes)}objects.png"
-            )
-            path = out_dir / "multi_object" / name
-            if not render_sheet(args.dataset_dir, item, lanes, path):
-                continue
-            rows.append(
-                {
-                    "sheet": str(path.relative_to(out_dir)),
-                    "record_kind": "+".join(o["record_kind"] for o in lanes),
-                    "platform_alert_id": item["platform_alert_id"],
-                    "sequence_id": ";".join(str(o["sequence_id"]) for o in lanes),
-                    "camera_name": item["camera_name"],
-                    "organisation": item["organisation_name"],
-                    "types": " vs ".join(",".join(lane_types(o)) or "-" for o in lanes),
-                    "frames": sum(len(o["frames"]) for o in lanes),
-                    "boxes": sum(len(f["boxes"]) for o in lanes for f in o["frames"]),
-                    "recorded_at": item["recorded_at"][:19],
-                }
-            )
-
-    out_dir.mkdir(parents=True, exist_ok=True)
-    index = out_dir / "index.csv"
-    with index.open("w", encoding="utf-8", newline="") as fh:
-        writer = csv.DictWriter(
-            fh,
-            fieldnames=[
-                "sheet",
-                "record_kind",
-                "platform_alert_id",
-                "sequence_id",
-                "camera_name",
-                "organisation",
-                "types",
-                "frames",
-                "boxes",
-                "recorded_at",
-            ],
+    jobs = plan_sheets(items, out_dir, args.mode, args.fp_sample)
+    previous = {} if args.force else load_fingerprints(out_dir)
+    stale, fingerprints = split_stale(args.dataset_dir, jobs, previous)
+    logger.info(
+        "Rendering %d of %d sheets on %d worker(s), %d unchanged",
+        len(stale),
+        len(jobs),
+        args.workers,
+        len(jobs) - len(stale),
+    )
+    rendered = {
+        row["sheet"]
+        for row in render_sheets(
+            args.dataset_dir, stale, args.workers, args.loglevel, args.frame_cache_size
         )
-        writer.writeheader()
-        writer.writerows(rows)
-    logger.info("Wrote %d sheets and %s", len(rows), index)
+    }
+    stale_sheets = {row["sheet"] for _item, _lanes, _path, row in stale}
+    rows = [
+        row
+        for _item, _lanes, _path, row in jobs
+        if row["sheet"] in rendered or row["sheet"] not in stale_sheets
+    ]
+    index = write_index(out_dir, rows)
+    save_fingerprints(
+        out_dir, {row["sheet"]: fingerprints[row["sheet"]] for row in rows}
+    )
+    logger.info("Rendered %d sheets; %s lists %d", len(rendered), index, len(rows))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,735 @@
+"""
+Asyncio engine for `import.py --engine async`: the alert API fetch and the
+annotation API posting.
+
+The threaded engine nests pools — a process per date, then threads per
+sequence and, inside each, threads per detection, sized by WorkerConfig from
+--max-workers — so how many requests reach a host at once is a product of
+pool sizes rather than a setting. It ends up too many for the annotation API
+and too few for the alert API at the same time.
+
+Here every request to a host goes through that host's `HostBudget`: one
+httpx connection pool and one cap on in-flight requests, shared by all the
+work aimed at the host. Each stage is drained by a fixed number of tasks
+(`bounded_map`), so work only starts when there is budget to run it and
+nothing piles up behind the cap.
+
+Both entry points return what their threaded counterparts return
+(`sequence_fetching.fetch_all_sequences_within` and
+`shared.post_records_to_annotation_api`), so the rest of the pipeline is
+shared.
+"""
+
+import asyncio
+import logging
+import random
+from contextlib import contextmanager
+from datetime import date
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+import httpx
+from rich.console import Console
+from rich.progress import (
+    BarColumn,
+    Progress,
+    SpinnerColumn,
+    TaskProgressColumn,
+    TextColumn,
+)
+
+from . import shared
+from . import utils as alert_api_utils
+from .checkpoint import ImportCheckpoint
+from .progress_management import ErrorCollector, LogSuppressor
+from .sequence_fetching import (
+    detection_fetch_limits,
+    get_dates_within,
+    print_date_range,
+    select_sequences,
+    sequence_detection_records,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Same (connect, read) bounds as the synchronous annotation API client.
+DEFAULT_TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+
+# Statuses a GET is retried on: rate limiting and transient server errors.
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# The alert API's page size for a date's sequence listing, and how many
+# pages are requested at once once a date turns out to need more than one.
+PAGE_SIZE = 1000
+PAGE_READAHEAD = 4
+
+
+class RateLimiter:
+    """
+    Spaces calls at least ``1 / rate`` seconds apart.
+
+    Attributes:
+        rate: Maximum calls per second
+    """
+
+    def __init__(self, rate: float) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self._interval = 1.0 / rate
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        """Return once the next call is allowed."""
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            start = max(now, self._next_at)
+            self._next_at = start + self._interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class HostBudget:
+    """
+    Every request to one remote host: a shared keep-alive connection pool,
+    a cap on how many requests are in flight at once and, optionally, on
+    how many start per second. GETs are retried on RETRY_STATUS_CODES and
+    network errors, with jittered exponential backoff.
+
+    Attributes:
+        base_url: Base URL requests are relative to
+        concurrency: Maximum requests in flight
+        max_retries: Retries of a failed GET
+        retry_base_delay: Backoff ceiling of the first retry, in seconds
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        concurrency: int,
+        timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        rate_limit: Optional[float] = None,
+        max_retries: int = 3,
+        retry_base_delay: float = 1.0,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.base_url = base_url.rstrip("/")
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self._slots = asyncio.Semaphore(concurrency)
+        self._limiter = RateLimiter(rate_limit) if rate_limit else None
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=concurrency, max_keepalive_connections=concurrency
+            ),
+            transport=transport,
+        )
+
+    async def request(
+        self, method: str, path: str, access_token: str, **kwargs
+    ) -> httpx.Response:
+        """Send an authenticated request once a slot is free."""
+        async with self._slots:
+            if self._limiter is not None:
+                await self._limiter.wait()
+            return await self._client.request(
+                method,
+                path,
+                headers={"Authorization": f"Bearer {access_token}"},
+                **kwargs,
+            )
+
+    async def get_json(
+        self, path: str, access_token: str, params: Optional[dict] = None
+    ) -> Any:
+        """
+        GET a JSON document, retrying transient failures.
+
+        Raises:
+            httpx.HTTPStatusError: On an error status, once retries are spent
+            httpx.TransportError: On a network error, once retries are spent
+        """
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                response = await self.request("GET", path, access_token, params=params)
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    raise
+            else:
+                if (
+                    response.status_code not in RETRY_STATUS_CODES
+                    or attempt == self.max_retries
+                ):
+                    response.raise_for_status()
+                    return response.json()
+                retry_after = response.headers.get("Retry-After")
+            # Back off without holding a slot.
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        """Seconds before a retry: the server's Retry-After, else full jitter."""
+        if retry_after is not None:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass  # an HTTP date; fall back to our own backoff
+        return random.uniform(0, self.retry_base_delay * (2**attempt))
+
+    async def run_sync(self, func: Callable[..., R], *args, **kwargs) -> R:
+        """
+        Run blocking client code in a thread while holding one slot.
+
+        For the paths that only exist on the synchronous client; they must
+        issue their requests one after another to stay within the slot.
+        """
+        async with self._slots:
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+async def bounded_map(
+    func: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    workers: int,
+    on_done: Optional[Callable[[], None]] = None,
+) -> List[R]:
+    """
+    ``[await func(item) for item in items]`` with ``workers`` calls at a time.
+
+    Items are pulled as workers free up, so no more than ``workers`` calls
+    exist at once. Results keep the order of ``items``. ``func`` should
+    handle its own errors: the first one raised cancels nothing and is
+    re-raised once every worker has stopped.
+    """
+    items = list(items)
+    results: List[Any] = [None] * len(items)
+    queue = iter(enumerate(items))
+
+    async def worker() -> None:
+        for index, item in queue:
+            results[index] = await func(item)
+            if on_done is not None:
+                on_done()
+
+    outcomes = await asyncio.gather(
+        *(worker() for _ in range(min(workers, len(items)))),
+        return_exceptions=True,
+    )
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            raise outcome
+    return results
+
+
+@contextmanager
+def _progress(
+    description: str, total: int, suppress_logs: bool
+) -> Iterator[Callable[[], None]]:
+    """A transient progress bar; yields the callback advancing it by one."""
+    with LogSuppressor(suppress=suppress_logs):
+        with Progress(
+            SpinnerColumn(),
+            TextColumn(f"[bold blue]{description}"),
+            BarColumn(bar_width=40),
+            TaskProgressColumn(),
+            console=Console(),
+            transient=True,
+        ) as progress_bar:
+            task = progress_bar.add_task(description, total=total)
+            yield lambda: progress_bar.advance(task)
+
+
+# -------------------- ALERT API FETCH --------------------
+
+
+async def _sequences_for_date(
+    alert_api: HostBudget,
+    access_token: str,
+    target_date: date,
+    risk_score: Optional[str],
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    A date's sequences and whether all came back (see
+    `sequence_fetching.fetch_date_listing`).
+
+    The first page is fetched alone, since most dates fit in it; past that,
+    PAGE_READAHEAD pages are requested at once until a short one shows up.
+    """
+
+    async def page(offset: int) -> List[Dict[str, Any]]:
+        params: Dict[str, Any] = {
+            "from_date": f"{target_date:%Y-%m-%d}",
+            "limit": PAGE_SIZE,
+            "offset": offset,
+        }
+        if risk_score:
+            params["risk_score"] = risk_score
+        return await alert_api.get_json(
+            "/api/v1/sequences/all/fromdate", access_token, params
+        )
+
+    offset = 0
+    wave = 1
+    sequences: List[Dict[str, Any]] = []
+    try:
+        while True:
+            pages = await asyncio.gather(
+                *(page(offset + i * PAGE_SIZE) for i in range(wave))
+            )
+            for fetched in pages:
+                sequences.extend(fetched)
+                if len(fetched) < PAGE_SIZE:
+                    return sequences, True
+            offset += wave * PAGE_SIZE
+            wave = PAGE_READAHEAD
+    except Exception as e:
+        logging.error(f"Error fetching sequences for date {target_date}: {e}")
+        return sequences, False
+
+
+async def _fetch_all_sequences(
+    alert_api: HostBudget,
+    date_from: date,
+    date_end: date,
+    detections_limit: int,
+    detections_order_by: str,
+    access_token: str,
+    access_token_admin: str,
+    selected_sequence_list: Optional[List[int]],
+    max_sequences: Optional[int],
+    suppress_logs: bool,
+    console: Console,
+    error_collector: ErrorCollector,
+    organization: Optional[str],
+    risk_score: Optional[str],
+    checkpoint: Optional[ImportCheckpoint],
+) -> List[Dict[str, Any]]:
+    with console.status("[bold blue]📡 Loading alert API metadata...", spinner="dots"):
+        try:
+            cameras, organizations = await asyncio.gather(
+                alert_api.get_json(
+                    "/api/v1/cameras/",
+                    access_token,
+                    {"include_non_trustable": "true"},
+                ),
+                alert_api.get_json("/api/v1/organizations/", access_token_admin),
+            )
+        except Exception as e:
+            error_msg = f"Failed to load alert API metadata: {e}"
+            error_collector.add_error(error_msg)
+            raise Exception(error_msg)
+    console.print("[green]✅ Metadata loaded[/]")
+    console.print(
+        f"   • [bold]{len(cameras)}[/] cameras, [bold]{len(organizations)}[/] organizations"
+    )
+    indexed_cameras = alert_api_utils.index_by(cameras, key="id")
+    indexed_organizations = alert_api_utils.index_by(organizations, key="id")
+
+    dates = get_dates_within(date_from=date_from, date_end=date_end)
+    print_date_range(dates, console)
+
+    async def date_sequences(mdate: date) -> List[Dict[str, Any]]:
+        if checkpoint is not None:
+            journaled = checkpoint.listing(mdate)
+            if journaled is not None:
+                return journaled
+        day_sequences, complete = await _sequences_for_date(
+            alert_api, access_token, mdate, risk_score
+        )
+        if checkpoint is not None and complete:
+            checkpoint.record_listing(mdate, day_sequences)
+        return day_sequences
+
+    with _progress("Fetching sequences by date", len(dates), suppress_logs) as advance:
+        per_date = await bounded_map(
+            date_sequences, dates, alert_api.concurrency, advance
+        )
+    sequences = select_sequences(
+        [sequence for day in per_date for sequence in day],
+        selected_sequence_list,
+        max_sequences,
+        console,
+        error_collector,
+    )
+
+    fetch_limit, unique_cap = detection_fetch_limits(detections_limit)
+
+    async def sequence_records(sequence: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if checkpoint is not None:
+            journaled = checkpoint.records(sequence)
+            if journaled is not None:
+                return journaled
+        try:
+            detections = await alert_api.get_json(
+                f"/api/v1/sequences/{sequence['id']}/detections",
+                access_token,
+                {
+                    "limit": fetch_limit,
+                    "desc": "true" if detections_order_by == "desc" else "false",
+                },
+            )
+            records = sequence_detection_records(
+                sequence,
+                detections,
+                indexed_cameras,
+                indexed_organizations,
+                unique_cap,
+            )
+        except Exception as e:
+            error_collector.add_error(
+                f"Error processing sequence {sequence.get('id', 'unknown')}: {e}"
+            )
+            return []
+        if checkpoint is not None:
+            checkpoint.record_fetch(sequence, records)
+        return records
+
+    org_context = f" {organization}" if organization else ""
+    console.print(
+        f"[blue]🔄 Processing{org_context} sequences with up to "
+        f"{alert_api.concurrency} concurrent alert API requests[/]"
+    )
+    with _progress(
+        f"Processing{org_context} sequence detections", len(sequences), suppress_logs
+    ) as advance:
+        per_sequence = await bounded_map(
+            sequence_records, sequences, alert_api.concurrency, advance
+        )
+    records = [record for records in per_sequence for record in records]
+
+    console.print("[green]✅ Processing complete[/]")
+    console.print(
+        f"   • [bold]{len(records)}[/] detection records from [bold]{len(sequences)}[/] sequences"
+    )
+    if error_collector.has_issues():
+        error_collector.print_summary(console, "Sequence Processing Issues")
+    return records
+
+
+def fetch_all_sequences_within(
+    date_from: date,
+    date_end: date,
+    detections_limit: int,
+    detections_order_by: str,
+    api_endpoint: str,
+    access_token: str,
+    access_token_admin: str,
+    concurrency: int,
+    selected_sequence_list: Optional[List[int]] = None,
+    max_sequences: Optional[int] = None,
+    suppress_logs: bool = True,
+    console: Optional[Console] = None,
+    error_collector: Optional[ErrorCollector] = None,
+    organization: Optional[str] = None,
+    risk_score: Optional[str] = None,
+    checkpoint: Optional[ImportCheckpoint] = None,
+    rate_limit: Optional[float] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch all sequences and detections between date_from and date_end.
+
+    Same records as `sequence_fetching.fetch_all_sequences_within`, with at
+    most ``concurrency`` requests in flight against the alert API instead of
+    a WorkerConfig, and at most ``rate_limit`` starting per second if set.
+    Dates are listed in date order, so a max_sequences cap keeps the earliest
+    sequences. With a ``checkpoint``, journaled dates and sequences are read
+    back instead of fetched.
+
+    Raises:
+        Exception: If metadata loading fails
+    """
+    console = console or Console()
+    error_collector = error_collector or ErrorCollector()
+
+    async def run() -> List[Dict[str, Any]]:
+        alert_api = HostBudget(
+            api_endpoint, concurrency, transport=transport, rate_limit=rate_limit
+        )
+        try:
+            return await _fetch_all_sequences(
+                alert_api,
+                date_from,
+                date_end,
+                detections_limit,
+                detections_order_by,
+                access_token,
+                access_token_admin,
+                selected_sequence_list,
+                max_sequences,
+                suppress_logs,
+                console,
+                error_collector,
+                organization,
+                risk_score,
+                checkpoint,
+            )
+        finally:
+            await alert_api.aclose()
+
+    return asyncio.run(run())
+
+
+# -------------------- ANNOTATION API POSTING --------------------
+
+
+async def _import_alert(
+    annotation_api: HostBudget,
+    auth_token: str,
+    alert_records: List[dict],
+    source_api: str,
+    force_url: bool,
+    max_retries: int = 3,
+    base_delay: float = 5.0,
+) -> Tuple[List[dict], Dict[int, List[dict]]]:
+    """Async counterpart of `shared._import_alert`: same results, never raises."""
+    platform_alert_id = alert_records[0]["platform_alert_id"]
+    try:
+        lanes_records, lanes, posted = shared.build_alert_import(
+            alert_records, source_api, force_url
+        )
+    except Exception as e:
+        logging.warning(
+            f"⚠️ Could not build the import of alert {platform_alert_id} ({e}) "
+            "— falling back to one import per lane"
+        )
+        return [], shared.group_records_by_sequence(alert_records)
+
+    payload = {
+        "source_api": source_api,
+        "platform_alert_id": platform_alert_id,
+        "lanes": lanes,
+    }
+    for attempt in range(max_retries + 1):
+        try:
+            response = await annotation_api.request(
+                "POST", "/api/v1/alerts/import", auth_token, json=payload
+            )
+        except httpx.HTTPError as e:
+            status_code, error = None, f"Network error: {e}"
+        else:
+            if response.is_success:
+                break
+            status_code, error = response.status_code, response.text
+        if status_code in shared.RETRYABLE_STATUS_CODES and attempt < max_retries:
+            delay = base_delay * (2**attempt)
+            logging.warning(
+                f"⚠️ Alert {platform_alert_id} import got HTTP {status_code} "
+                f"— retrying in {delay:.0f}s (attempt {attempt + 1}/{max_retries})"
+            )
+            # Back off without holding a slot.
+            await asyncio.sleep(delay)
+            continue
+        logging.warning(
+            f"⚠️ Alert {platform_alert_id} import failed ({error}) "
+            "— falling back to one import per lane"
+        )
+        return [], lanes_records
+
+    body = response.json()
+    if body["status"] == "exists":
+        # The stored lanes' temporal scores are refreshed in one batch
+        # request, which only exists on the synchronous client.
+        return await annotation_api.run_sync(
+            shared.settle_alert_import,
+            annotation_api.base_url,
+            auth_token,
+            body,
+            lanes_records,
+            posted,
+            source_api,
+        )
+    return shared.settle_alert_import(
+        annotation_api.base_url, auth_token, body, lanes_records, posted, source_api
+    )
+
+
+async def _lookup_existing_lanes(
+    annotation_api: HostBudget,
+    auth_token: str,
+    alert_api_sequence_ids: List[int],
+    source_api: str,
+) -> Dict[int, dict]:
+    """Async counterpart of `shared.lookup_existing_lanes`: same result, never raises."""
+    chunks = [
+        alert_api_sequence_ids[start : start + shared.SEQUENCE_LOOKUP_CHUNK]
+        for start in range(0, len(alert_api_sequence_ids), shared.SEQUENCE_LOOKUP_CHUNK)
+    ]
+
+    async def lookup(chunk: List[int]) -> List[dict]:
+        response = await annotation_api.request(
+            "POST",
+            "/api/v1/sequences/lookup",
+            auth_token,
+            json={
+                "sequences": [
+                    {"source_api": source_api, "alert_api_id": alert_api_id}
+                    for alert_api_id in chunk
+                ]
+            },
+        )
+        response.raise_for_status()
+        return response.json()["sequences"]
+
+    try:
+        per_chunk = await bounded_map(lookup, chunks, annotation_api.concurrency)
+    except httpx.HTTPError as e:
+        logging.warning(f"⚠️ Sequence lookup failed ({e}) — every lane will be posted")
+        return {}
+    return {stored["alert_api_id"]: stored for found in per_chunk for stored in found}
+
+
+async def _post_records(
+    annotation_api: HostBudget,
+    records: List[dict],
+    auth_token: str,
+    suppress_logs: bool,
+    source_api: str,
+    force_url: bool,
+) -> Dict:
+    grouped_records = shared.group_records_by_sequence(records)
+    existing = await _lookup_existing_lanes(
+        annotation_api, auth_token, list(grouped_records), source_api
+    )
+    alert_records, lone_lanes = shared.group_records_by_alert(
+        {
+            alert_api_sequence_id: sequence_records
+            for alert_api_sequence_id, sequence_records in grouped_records.items()
+            if alert_api_sequence_id not in existing
+        }
+    )
+    logging.info(
+        f"Processing {len(grouped_records)} unique sequences ({len(alert_records)} alerts) "
+        f"with {len(records)} total detections, at most {annotation_api.concurrency} "
+        "annotation API requests at once"
+    )
+    tally = shared.PostingTally()
+
+    with _progress(
+        "Creating API sequences", len(grouped_records), suppress_logs
+    ) as advance:
+
+        async def post_lane(
+            alert_api_sequence_id: int, sequence_records: List[dict]
+        ) -> None:
+            # The per-lane path (batch, per-detection fallback, 409 recovery)
+            # lives on the synchronous client. One detection worker keeps its
+            # requests sequential, so it stays within its slot.
+            try:
+                result = await annotation_api.run_sync(
+                    shared.post_sequence_to_annotation_api,
+                    annotation_api.base_url,
+                    sequence_records,
+                    auth_token,
+                    max_detection_workers=1,
+                    source_api=source_api,
+                    force_url=force_url,
+                )
+            except Exception as e:
+                tally.fail(alert_api_sequence_id, sequence_records, e)
+            else:
+                tally.add(alert_api_sequence_id, result)
+            advance()
+
+        async def post(work: Tuple[str, int, List[dict]]) -> None:
+            # (kind, platform alert or alert sequence id, records); the one
+            # "existing" item stands for every lane the lookup found.
+            kind, key, work_records = work
+            if kind == "existing":
+                # Every stored lane at once: their refreshes are batched,
+                # one request after another within the slot.
+                for lane in await annotation_api.run_sync(
+                    shared.settle_existing_lanes,
+                    annotation_api.base_url,
+                    auth_token,
+                    existing,
+                    grouped_records,
+                    source_api,
+                ):
+                    tally.add(lane["alert_api_sequence_id"], lane)
+                    advance()
+                return
+            if kind == "lane":
+                await post_lane(key, work_records)
+                return
+            lane_results, remaining = await _import_alert(
+                annotation_api, auth_token, work_records, source_api, force_url
+            )
+            for lane in lane_results:
+                tally.add(lane["alert_api_sequence_id"], lane)
+                advance()
+            for alert_api_sequence_id, lane_records in remaining.items():
+                await post_lane(alert_api_sequence_id, lane_records)
+
+        work = (
+            [("alert", key, recs) for key, recs in alert_records.items()]
+            + [("lane", key, recs) for key, recs in lone_lanes.items()]
+            + ([("existing", 0, [])] if existing else [])
+        )
+        await bounded_map(post, work, annotation_api.concurrency)
+
+    return tally.summary(len(grouped_records), len(records), auth_token)
+
+
+def post_records_to_annotation_api(
+    annotation_api_url: str,
+    records: List[dict],
+    concurrency: int = 8,
+    suppress_logs: bool = True,
+    source_api: str = "pyronear_french",
+    force_url: bool = False,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> Dict:
+    """
+    Post records to the annotation API, one alert import per platform alert.
+
+    Same summary as `shared.post_records_to_annotation_api`, with at most
+    ``concurrency`` requests in flight against the annotation API.
+    """
+    if not records:
+        logging.warning("No records to post")
+        return shared.PostingTally().summary(0, 0, None)
+
+    login, password = shared.get_annotation_credentials(annotation_api_url)
+    auth_token = shared.get_auth_token(
+        annotation_api_url, username=login, password=password
+    )
+
+    async def run() -> Dict:
+        annotation_api = HostBudget(
+            annotation_api_url, concurrency, transport=transport
+        )
+        try:
+            return await _post_records(
+                annotation_api,
+                records,
+                auth_token,
+                suppress_logs,
+                source_api,
+                force_url,
+            )
+        finally:
+            await annotation_api.aclose()
+
+    return asyncio.run(run())
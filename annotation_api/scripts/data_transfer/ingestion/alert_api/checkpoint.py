@@ -0,0 +1,206 @@
+"""
+Local journal that lets an interrupted import resume where it stopped.
+
+A multi-week backfill that dies halfway would otherwise refetch every date
+from the alert API and lean on 409s from the annotation API to skip the
+work already done. With `import.py --checkpoint PATH`, a SQLite file
+records, per run scope:
+
+- each date's sequence listing, once it was fetched completely;
+- each alert sequence's detection records, once fetched;
+- each object lane that is fully imported (created with its annotation,
+  or found to exist already).
+
+A rerun reads listings and records back instead of fetching them, and
+drops completed lanes before posting. Only settled data is journaled:
+dates before today, and sequences last seen before today, since a day in
+progress can still gain sequences and detections. Detection records are not
+journaled under `--image-transfer url`: their image URLs are presigned and
+would have expired by the time a rerun posts them.
+
+The scope ties entries to the options that shaped them (alert API, frames
+limit, risk score, annotation API), so a run with different options does
+not reuse them.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Lane statuses.
+LANE_IMPORTED = "imported"
+LANE_EXISTS = "exists"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS date_listings (
+    scope TEXT NOT NULL,
+    day TEXT NOT NULL,
+    sequences TEXT NOT NULL,
+    PRIMARY KEY (scope, day)
+);
+CREATE TABLE IF NOT EXISTS sequence_records (
+    scope TEXT NOT NULL,
+    alert_api_id INTEGER NOT NULL,
+    records TEXT NOT NULL,
+    PRIMARY KEY (scope, alert_api_id)
+);
+CREATE TABLE IF NOT EXISTS lanes (
+    scope TEXT NOT NULL,
+    alert_api_id INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    PRIMARY KEY (scope, alert_api_id)
+);
+"""
+
+
+def checkpoint_scope(
+    alert_api_url: str,
+    frames_limit: int,
+    risk_score: Optional[str],
+    annotation_api_url: str,
+) -> str:
+    """The scope entries are journaled under for a run with these options."""
+    return json.dumps(
+        {
+            "alert_api_url": alert_api_url.rstrip("/"),
+            "frames_limit": frames_limit,
+            "risk_score": risk_score,
+            "annotation_api_url": annotation_api_url.rstrip("/"),
+        },
+        sort_keys=True,
+    )
+
+
+class ImportCheckpoint:
+    """
+    The journal of one run scope, in a SQLite file shared by all scopes.
+
+    Safe to use from several threads; every write commits immediately, so
+    whatever was recorded before a crash is there on the next run.
+
+    Attributes:
+        path: SQLite file
+        scope: Run scope (`checkpoint_scope`)
+        today: First date considered still in progress
+        keep_records: Whether sequences' detection records are journaled
+    """
+
+    def __init__(
+        self,
+        path: str,
+        scope: str,
+        today: Optional[date] = None,
+        keep_records: bool = True,
+    ) -> None:
+        self.path = path
+        self.scope = scope
+        self.today = today or datetime.now().date()
+        self.keep_records = keep_records
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _query(self, sql: str, params: Tuple) -> List[Tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _write(self, sql: str, rows: List[Tuple]) -> None:
+        with self._lock:
+            self._conn.executemany(sql, rows)
+
+    # -------------------- FETCH --------------------
+
+    def listing(self, day: date) -> Optional[List[Dict[str, Any]]]:
+        """A date's journaled sequences, or None when it must be fetched."""
+        rows = self._query(
+            "SELECT sequences FROM date_listings WHERE scope = ? AND day = ?",
+            (self.scope, day.isoformat()),
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    def split_dates(
+        self, dates: Iterable[date]
+    ) -> Tuple[List[Dict[str, Any]], List[date]]:
+        """The journaled dates' sequences, and the dates still to fetch."""
+        cached: List[Dict[str, Any]] = []
+        pending: List[date] = []
+        for day in dates:
+            sequences = self.listing(day)
+            if sequences is None:
+                pending.append(day)
+            else:
+                cached.extend(sequences)
+        return cached, pending
+
+    def record_listing(self, day: date, sequences: List[Dict[str, Any]]) -> None:
+        """Journal a date's complete listing, if the date is settled."""
+        if day >= self.today:
+            return
+        self._write(
+            "INSERT OR REPLACE INTO date_listings VALUES (?, ?, ?)",
+            [(self.scope, day.isoformat(), json.dumps(sequences))],
+        )
+
+    def records(self, sequence: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """A sequence's journaled records, or None when they must be fetched."""
+        if not self.keep_records:
+            return None
+        rows = self._query(
+            "SELECT records FROM sequence_records WHERE scope = ? AND alert_api_id = ?",
+            (self.scope, sequence["id"]),
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    def split_sequences(
+        self, sequences: Iterable[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """The journaled sequences' records, and the sequences still to fetch."""
+        cached: List[Dict[str, Any]] = []
+        pending: List[Dict[str, Any]] = []
+        for sequence in sequences:
+            records = self.records(sequence)
+            if records is None:
+                pending.append(sequence)
+            else:
+                cached.extend(records)
+        return cached, pending
+
+    def record_fetch(
+        self, sequence: Dict[str, Any], records: List[Dict[str, Any]]
+    ) -> None:
+        """Journal a sequence's records, if the sequence is settled."""
+        if not self.keep_records:
+            return
+        last_seen = sequence.get("last_seen_at")
+        if not last_seen or date.fromisoformat(str(last_seen)[:10]) >= self.today:
+            return
+        self._write(
+            "INSERT OR REPLACE INTO sequence_records VALUES (?, ?, ?)",
+            [(self.scope, sequence["id"], json.dumps(records))],
+        )
+
+    # -------------------- POSTING --------------------
+
+    def completed_lanes(self) -> Set[int]:
+        """Alert sequence ids of the lanes a previous run fully imported."""
+        rows = self._query(
+            "SELECT alert_api_id FROM lanes WHERE scope = ?", (self.scope,)
+        )
+        return {row[0] for row in rows}
+
+    def record_lanes(self, alert_api_ids: Iterable[int], status: str) -> None:
+        """Mark lanes as fully imported, so no later run posts them again."""
+        self._write(
+            "INSERT OR REPLACE INTO lanes VALUES (?, ?, ?)",
+            [(self.scope, alert_api_id, status) for alert_api_id in alert_api_ids],
+        )
@@ -19,11 +19,46 @@ Functions:
 """
 
 import logging
+import threading
 from datetime import date
 from typing import Optional
 from urllib.parse import urlencode
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeout of a GET; the listing routes can be slow.
+REQUEST_TIMEOUT = (10, 120)
+
+_thread_local = threading.local()
+
+# GETs are idempotent, so they are retried on network errors, rate limiting
+# and transient server errors. The jitter spreads out the retries of worker
+# threads that hit the same 429 together, and a Retry-After from the server
+# takes precedence over the backoff. Once retries run out the last response
+# is returned rather than raised, and api_get reports it as before.
+_GET_RETRY = Retry(
+    total=4,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"GET"}),
+    backoff_factor=0.5,
+    backoff_jitter=0.5,
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+
+def _get_session() -> requests.Session:
+    """The calling thread's keep-alive `requests.Session`, built on first use."""
+    session: Optional[requests.Session] = getattr(_thread_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(max_retries=_GET_RETRY)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _thread_local.session = session
+    return session
 
 
 def get_api_access_token(api_endpoint: str, username: str, password: str) -> str:
@@ -42,7 +77,7 @@ def get_api_access_token(api_endpoint: str, username: str, password: str) -> str
         Exception: If the request to retrieve the access token fails.
     """
     url = f"{api_endpoint}/api/v1/login/creds"
-    response = requests.post(
+    response = _get_session().post(
         url,
         data={"username": username, "password": password},
         timeout=5,
@@ -63,7 +98,7 @@ def api_get(route: str, access_token: str):
     """
     headers = make_request_headers(access_token=access_token)
     logging.debug(f"Making an HTTP request to route {route}")
-    response = requests.get(route, headers=headers)
+    response = _get_session().get(route, headers=headers, timeout=REQUEST_TIMEOUT)
     try:
         return response.json()
     except Exception:
@@ -34,6 +34,11 @@ Arguments:
   --sequence-list (str): Comma-separated list of sequence alert_api_id, or path to a file
   --image-transfer (str): How detection images reach the annotation API (bucket-copy/url; default: bucket-copy for the French alert API, url for CENIA)
   --max-workers (int): Max workers for parallel processing, auto-scales for different operations (default: 4)
+  --engine (str): threads (nested worker pools sized from --max-workers) or async (one request budget per API; default: threads)
+  --alert-api-concurrency (int): With --engine async, max requests in flight against the alert API (default: 16)
+  --annotation-api-concurrency (int): With --engine async, max requests in flight against the annotation API (default: 8)
+  --alert-api-rate-limit (float): With --engine async, max alert API requests started per second (default: 0, unlimited)
+  --checkpoint (str): SQLite journal letting an interrupted run resume where it stopped (default: none)
   --dry-run: Preview actions without execution
   --loglevel (str): Logging level (debug/info/warning/error, default: info)
 
@@ -62,6 +67,12 @@ Examples:
 
   # High-performance processing with more workers
   uv run python -m scripts.data_transfer.ingestion.alert_api.import --date-from 2024-01-01 --max-workers 8
+
+  # Asyncio engine with an explicit request budget per API
+  uv run python -m scripts.data_transfer.ingestion.alert_api.import --date-from 2024-01-01 --engine async --alert-api-concurrency 32 --annotation-api-concurrency 8
+
+  # Long backfill that can be rerun after a crash without redoing finished work
+  uv run python -m scripts.data_transfer.ingestion.alert_api.import --date-from 2024-01-01 --date-end 2024-03-31 --checkpoint backfill.sqlite
 """
 
 import argparse
@@ -95,6 +106,8 @@ from .annotation_management import (
     annotate_split_sequence,
 )
 from . import shared
+from . import async_import
+from . import checkpoint as import_checkpoint
 from . import client as alert_api_client
 from app.clients import annotation_api
 
@@ -194,6 +207,49 @@ def make_cli_parser() -> argparse.ArgumentParser:
         type=int,
         default=4,
     )
+    parser.add_argument(
+        "--engine",
+        help=(
+            "'threads' runs nested worker pools sized from --max-workers; "
+            "'async' runs on asyncio with one request budget per API "
+            "(--alert-api-concurrency, --annotation-api-concurrency) and "
+            "ignores --max-workers for fetching and posting"
+        ),
+        type=str,
+        choices=["threads", "async"],
+        default="threads",
+    )
+    parser.add_argument(
+        "--alert-api-concurrency",
+        help="With --engine async, max requests in flight against the alert API",
+        type=int,
+        default=16,
+    )
+    parser.add_argument(
+        "--annotation-api-concurrency",
+        help="With --engine async, max requests in flight against the annotation API",
+        type=int,
+        default=8,
+    )
+    parser.add_argument(
+        "--alert-api-rate-limit",
+        help=(
+            "With --engine async, max alert API requests started per second "
+            "(0 for no limit)"
+        ),
+        type=float,
+        default=0,
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help=(
+            "SQLite file journaling fetched dates, fetched sequences and imported "
+            "lanes; a rerun with the same file and options resumes where an "
+            "interrupted run stopped"
+        ),
+        type=str,
+        default=None,
+    )
 
     # Logging
     parser.add_argument(
@@ -246,6 +302,16 @@ def validate_args(args: argparse.Namespace) -> bool:
         logging.error("--max-workers must be at least 1")
         return False
 
+    if args.alert_api_concurrency < 1 or args.annotation_api_concurrency < 1:
+        logging.error(
+            "--alert-api-concurrency and --annotation-api-concurrency must be at least 1"
+        )
+        return False
+
+    if args.alert_api_rate_limit < 0:
+        logging.error("--alert-api-rate-limit must not be negative")
+        return False
+
     return True
 
 
@@ -406,6 +472,9 @@ def main() -> None:
     organization = shared.getenv_with_fallback("ALERT_API_LOGIN") or "unknown"
     selected_sequence_list: List[int] = []
     sequence_list_source = "CLI input"
+    # FWI class the alert API listings are filtered on.
+    risk_score = "extreme"
+    checkpoint = None
 
     # Parse optional sequence restriction
     if args.sequence_list:
@@ -460,7 +529,13 @@ def main() -> None:
         console.print(
             f"[blue]ℹ️  Alert API: {args.alert_api_url} (source_api: {source_api})[/]"
         )
-        console.print(f"[blue]ℹ️  Worker config: {worker_config}[/]")
+        if args.engine == "async":
+            console.print(
+                f"[blue]ℹ️  Async engine: {args.alert_api_concurrency} alert API / "
+                f"{args.annotation_api_concurrency} annotation API requests in flight[/]"
+            )
+        else:
+            console.print(f"[blue]ℹ️  Worker config: {worker_config}[/]")
 
     try:
         # Step 1: Fetch alert API data
@@ -529,25 +604,48 @@ def main() -> None:
                 step_manager.complete_step(False, f"Authentication failed: {e}")
                 sys.exit(1)
 
+        if args.checkpoint:
+            checkpoint = import_checkpoint.ImportCheckpoint(
+                args.checkpoint,
+                import_checkpoint.checkpoint_scope(
+                    args.alert_api_url,
+                    args.frames_limit,
+                    risk_score,
+                    args.annotation_api_url,
+                ),
+                keep_records=(args.image_transfer == "bucket-copy"),
+            )
+            console.print(f"[blue]📒 Resuming from checkpoint {args.checkpoint}[/]")
+
         # Fetch alert API records
+        fetch_options = dict(
+            date_from=args.date_from,
+            date_end=args.date_end,
+            detections_limit=args.frames_limit,
+            detections_order_by="asc",
+            api_endpoint=args.alert_api_url,
+            access_token=access_token,
+            access_token_admin=access_token_admin,
+            selected_sequence_list=selected_sequence_list or None,
+            max_sequences=max_sequences,
+            suppress_logs=suppress_logs,
+            console=console,
+            error_collector=error_collector,
+            organization=organization,
+            risk_score=risk_score,
+            checkpoint=checkpoint,
+        )
         try:
-            records = fetch_all_sequences_within(
-                date_from=args.date_from,
-                date_end=args.date_end,
-                detections_limit=args.frames_limit,
-                detections_order_by="asc",
-                api_endpoint=args.alert_api_url,
-                access_token=access_token,
-                access_token_admin=access_token_admin,
-                worker_config=worker_config,
-                selected_sequence_list=selected_sequence_list or None,
-                max_sequences=max_sequences,
-                suppress_logs=suppress_logs,
-                console=console,
-                error_collector=error_collector,
-                organization=organization,
-                risk_score="extreme",
-            )
+            if args.engine == "async":
+                records = async_import.fetch_all_sequences_within(
+                    concurrency=args.alert_api_concurrency,
+                    rate_limit=args.alert_api_rate_limit or None,
+                    **fetch_options,
+                )
+            else:
+                records = fetch_all_sequences_within(
+                    worker_config=worker_config, **fetch_options
+                )
         except Exception as e:
             error_collector.add_error(f"Alert API data fetching failed: {e}")
             step_manager.complete_step(False, f"Alert API data fetching failed: {e}")
@@ -577,6 +675,28 @@ def main() -> None:
         # act on (#333); they are auto-skipped after annotation creation below.
         boxless_alert_ids = sorted(shared.boxless_platform_alert_ids(records))
 
+        # Lanes an interrupted run already settled are not posted again.
+        if checkpoint is not None:
+            completed_lanes = checkpoint.completed_lanes()
+            lanes_before = {record["sequence_id"] for record in records}
+            records = [
+                record
+                for record in records
+                if record["sequence_id"] not in completed_lanes
+            ]
+            resumed_lanes = len(lanes_before) - len(
+                {record["sequence_id"] for record in records}
+            )
+            console.print(
+                f"[blue]📒 Checkpoint: {resumed_lanes} lane(s) already imported "
+                "by a previous run[/]"
+            )
+            if resumed_lanes and not records and not args.dry_run:
+                step_manager.complete_step(
+                    True, "Every lane was already imported by a previous run"
+                )
+                sys.exit(0)
+
         if not records and not args.dry_run:
             step_manager.complete_step(False, "No records fetched from alert API")
             sys.exit(0)
@@ -588,15 +708,25 @@ def main() -> None:
             )
 
             try:
-                result = shared.post_records_to_annotation_api(
-                    args.annotation_api_url,
-                    records,
-                    max_workers=worker_config.api_posting,
-                    max_detection_workers=worker_config.detection_per_sequence,
-                    suppress_logs=suppress_logs,
-                    source_api=source_api,
-                    force_url=(args.image_transfer == "url"),
-                )
+                if args.engine == "async":
+                    result = async_import.post_records_to_annotation_api(
+                        args.annotation_api_url,
+                        records,
+                        concurrency=args.annotation_api_concurrency,
+                        suppress_logs=suppress_logs,
+                        source_api=source_api,
+                        force_url=(args.image_transfer == "url"),
+                    )
+                else:
+                    result = shared.post_records_to_annotation_api(
+                        args.annotation_api_url,
+                        records,
+                        max_workers=worker_config.api_posting,
+                        max_detection_workers=worker_config.detection_per_sequence,
+                        suppress_logs=suppress_logs,
+                        source_api=source_api,
+                        force_url=(args.image_transfer == "url"),
+                    )
 
                 # Capture import statistics in main stats and get successfully imported sequence IDs
                 stats["records_fetched"] = len(records)
@@ -619,6 +749,27 @@ def main() -> None:
                 stats["detections_skipped"] = result.get("skipped_detections", 0)
                 successfully_imported_sequence_ids = result["successful_sequence_ids"]
 
+                if checkpoint is not None:
+                    # Lanes that still need their annotation are recorded
+                    # once it is created, in step 3.
+                    checkpoint.record_lanes(
+                        [
+                            r["alert_api_sequence_id"]
+                            for r in result["sequence_results"]
+                            if r.get("annotation_id")
+                        ],
+                        import_checkpoint.LANE_IMPORTED,
+                    )
+                    checkpoint.record_lanes(
+                        [
+                            r["alert_api_sequence_id"]
+                            for r in result["sequence_results"]
+                            if r.get("skipped")
+                            and r.get("refresh_status") != shared.REFRESH_FAILED
+                        ],
+                        import_checkpoint.LANE_EXISTS,
+                    )
+
                 # Prepare step completion stats for display
                 step_stats = {
                     "Records fetched": len(records),
@@ -762,6 +913,17 @@ def main() -> None:
             # Captured here because the collection loop below rebinds `result`.
             annotation_auth_token = result["auth_token"]
 
+            # Lanes imported through POST /alerts/import committed with their
+            # seed annotation; only the lanes posted one by one still need one.
+            imported_with_annotation = [
+                r for r in alert_api_seq_results if r.get("annotation_id")
+            ]
+            stats["annotations_successful"] += len(imported_with_annotation)
+            stats["annotations_created"] += len(imported_with_annotation)
+            alert_api_seq_results = [
+                r for r in alert_api_seq_results if not r.get("annotation_id")
+            ]
+
         with concurrent.futures.ThreadPoolExecutor(
             max_workers=worker_config.annotation_processing
         ) as executor:
@@ -776,6 +938,10 @@ def main() -> None:
                 ): seq_result["sequence_id"]
                 for seq_result in alert_api_seq_results
             }
+            alert_api_ids = {
+                seq_result["sequence_id"]: seq_result["alert_api_sequence_id"]
+                for seq_result in alert_api_seq_results
+            }
 
             # Collect results with progress tracking
             with LogSuppressor(suppress=suppress_logs):
@@ -808,6 +974,11 @@ def main() -> None:
                                         stats["sequences_rolled_back"] += 1
                             else:
                                 stats["annotations_successful"] += 1
+                                if checkpoint is not None and not args.dry_run:
+                                    checkpoint.record_lanes(
+                                        [alert_api_ids[sequence_id]],
+                                        import_checkpoint.LANE_IMPORTED,
+                                    )
 
                             if result["annotation_created"]:
                                 stats["annotations_created"] += 1
@@ -7,7 +7,11 @@ including parallel processing, metadata loading, and error handling with progres
 Functions:
     get_dates_within: Generate list of dates between start and end dates
     fetch_sequences_for_date: Fetch sequences for a specific date
+    fetch_date_listing: Fetch a date's sequences and whether the listing is complete
     process_single_sequence_detections: Process detections for a single sequence
+    detection_fetch_limits: Detections to request and images to keep per sequence
+    sequence_detection_records: Flatten a sequence's fetched detections into records
+    select_sequences: Apply the alert_api_id restriction and max_sequences cap
     fetch_all_sequences_within: Main function to fetch all sequences and detections
 
 Example:
@@ -38,7 +42,7 @@ import concurrent.futures
 import logging
 import time
 from datetime import date, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 from rich.console import Console
 from rich.progress import (
@@ -51,6 +55,7 @@ from rich.progress import (
 
 from . import client as alert_api_client
 from . import utils as alert_api_utils
+from .checkpoint import ImportCheckpoint
 from .progress_management import ErrorCollector, LogSuppressor
 from .worker_config import WorkerConfig
 
@@ -119,6 +124,22 @@ def fetch_sequences_for_date(
     Returns:
         List of sequence dictionaries for the specified date
     """
+    return fetch_date_listing(api_endpoint, target_date, access_token, risk_score)[0]
+
+
+def fetch_date_listing(
+    api_endpoint: str,
+    target_date: date,
+    access_token: str,
+    risk_score: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    `fetch_sequences_for_date`, plus whether every page came back.
+
+    Returns:
+        (sequences fetched, True when the listing is complete); on an error
+        the pages fetched so far come back with False
+    """
     page_size = 1000
     offset = 0
     sequences: List[Dict[str, Any]] = []
@@ -136,10 +157,10 @@ def fetch_sequences_for_date(
             if len(page) < page_size:
                 break
             offset += page_size
-        return sequences
+        return sequences, True
     except Exception as e:
         logging.error(f"Error fetching sequences for date {target_date}: {e}")
-        return sequences
+        return sequences, False
 
 
 def process_single_sequence_detections(
@@ -180,30 +201,7 @@ def process_single_sequence_detections(
         ...     detections_order_by="asc"
         ... )
     """
-    camera_id = sequence.get("camera_id")
-    camera = indexed_cameras.get(camera_id, {})
-    org_id = camera.get("organization_id")
-    organization = indexed_organizations.get(org_id, {})
-
-    # The alert API stores one Detection row per bbox even when several boxes
-    # share the same image (each row carries `bbox` + the siblings in
-    # `others_bboxes`). We dedupe by `bucket_key` below to import one record
-    # per image, and `to_record` then re-assembles all boxes for that image
-    # from the retained row's bbox + others_bboxes.
-    #
-    # The alert API's /sequences/{id}/detections endpoint doesn't support
-    # offset pagination and caps `limit` at 100. When `detections_limit > 0`
-    # we fetch a small buffer above the requested count so the unique-image
-    # count stays close to what the caller asked for even when a few images
-    # carry multiple bboxes; `<= 0` means "no limit, fetch all the API will
-    # return" (matches the `--max-sequences 0` convention used elsewhere).
-    if detections_limit and detections_limit > 0:
-        fetch_limit = min(detections_limit + 10, 100)
-        unique_cap: Optional[int] = detections_limit
-    else:
-        fetch_limit = 100
-        unique_cap = None
-
+    fetch_limit, unique_cap = detection_fetch_limits(detections_limit)
     detections = alert_api_client.list_sequence_detections(
         api_endpoint=api_endpoint,
         sequence_id=sequence["id"],
@@ -211,6 +209,50 @@ def process_single_sequence_detections(
         limit=fetch_limit,
         desc=(detections_order_by == "desc"),
     )
+    return sequence_detection_records(
+        sequence, detections, indexed_cameras, indexed_organizations, unique_cap
+    )
+
+
+def detection_fetch_limits(detections_limit: int) -> Tuple[int, Optional[int]]:
+    """
+    How many detections to request for a sequence, and how many images to keep.
+
+    The alert API stores one Detection row per bbox even when several boxes
+    share the same image (each row carries `bbox` + the siblings in
+    `others_bboxes`), so rows are deduped by `bucket_key` afterwards (see
+    `sequence_detection_records`).
+
+    The alert API's /sequences/{id}/detections endpoint doesn't support
+    offset pagination and caps `limit` at 100. When `detections_limit > 0`
+    we fetch a small buffer above the requested count so the unique-image
+    count stays close to what the caller asked for even when a few images
+    carry multiple bboxes; `<= 0` means "no limit, fetch all the API will
+    return" (matches the `--max-sequences 0` convention used elsewhere).
+
+    Returns:
+        (limit to request, cap on unique images or None for no cap)
+    """
+    if detections_limit and detections_limit > 0:
+        return min(detections_limit + 10, 100), detections_limit
+    return 100, None
+
+
+def sequence_detection_records(
+    sequence: Dict[str, Any],
+    detections: List[Dict[str, Any]],
+    indexed_cameras: Dict[int, Dict[str, Any]],
+    indexed_organizations: Dict[int, Dict[str, Any]],
+    unique_cap: Optional[int],
+) -> List[Dict[str, Any]]:
+    """
+    Flattened records for a sequence's fetched detections, one per image.
+
+    Rows are deduped by `bucket_key`; `to_record` then re-assembles all boxes
+    for that image from the retained row's bbox + others_bboxes.
+    """
+    camera = indexed_cameras.get(sequence.get("camera_id"), {})
+    organization = indexed_organizations.get(camera.get("organization_id"), {})
 
     unique_detections: list[dict] = []
     seen_bucket_keys: set[str] = set()
@@ -234,6 +276,76 @@ def process_single_sequence_detections(
     ]
 
 
+def select_sequences(
+    sequences: List[Dict[str, Any]],
+    selected_sequence_list: Optional[List[int]],
+    max_sequences: Optional[int],
+    console: Console,
+    error_collector: ErrorCollector,
+) -> List[Dict[str, Any]]:
+    """
+    Apply the alert_api_id restriction and the max_sequences cap to the
+    listed sequences, and warn when the alert API sends no temporal scores.
+    """
+    # The raw alert sequences expose alert_api_id as the `id` field; the
+    # `alert_api_id` rename happens later in shared.py when records are
+    # formatted for the annotation API, so we cannot read it back here.
+    if selected_sequence_list:
+        pre_filter_count = len(sequences)
+        sequences = [
+            sequence
+            for sequence in sequences
+            if sequence.get("id") in selected_sequence_list
+        ]
+        filtered_out = pre_filter_count - len(sequences)
+        console.print(
+            f"[blue]🔍 Filtered sequences by alert_api_id[/] "
+            f"[dim]({filtered_out} skipped, {len(sequences)} remaining)[/]"
+        )
+
+    if (
+        max_sequences is not None
+        and max_sequences > 0
+        and len(sequences) > max_sequences
+    ):
+        sequences = sequences[:max_sequences]
+        console.print(
+            f"[blue]🔍 Applying max_sequences cap[/] "
+            f"[dim](processing first {max_sequences} sequences)[/]"
+        )
+
+    console.print(f"[green]✅ Found {len(sequences)} sequences[/]")
+
+    # Without this the two cases are indistinguishable: an alert API that
+    # predates temporal validation imports exactly like a day where nothing was
+    # scored — every sequence NULL, run reports success. Warn rather than fail:
+    # not every alert API deployment (e.g. CENIA) necessarily runs the feature,
+    # and a missing provenance field must not block ingestion.
+    if temporal_scores_unsupported(sequences):
+        message = (
+            "Alert API responses carry no `temporal_model_score` field at all "
+            f"({len(sequences)} sequences checked) — this deployment predates "
+            "temporal validation. Every sequence will import with a NULL score, "
+            "which is indistinguishable from 'never scored' downstream."
+        )
+        console.print(f"[yellow]⚠️  {message}[/]")
+        error_collector.add_error(message)
+    return sequences
+
+
+def print_date_range(dates: List[date], console: Console) -> None:
+    """Announce the dates about to be fetched."""
+    if len(dates) == 1:
+        console.print(f"[blue]📅 Processing [bold]1 day[/]: {dates[0]:%Y-%m-%d}[/]")
+    elif len(dates) <= 3:
+        date_list = ", ".join(d.strftime("%Y-%m-%d") for d in dates)
+        console.print(f"[blue]📅 Processing [bold]{len(dates)} days[/]: {date_list}[/]")
+    else:
+        console.print(
+            f"[blue]📅 Processing [bold]{len(dates)} days[/]: {dates[0]:%Y-%m-%d} to {dates[-1]:%Y-%m-%d}[/]"
+        )
+
+
 def fetch_all_sequences_within(
     date_from: date,
     date_end: date,
@@ -250,6 +362,7 @@ def fetch_all_sequences_within(
     error_collector: Optional[ErrorCollector] = None,
     organization: Optional[str] = None,
     risk_score: Optional[str] = None,
+    checkpoint: Optional[ImportCheckpoint] = None,
 ) -> List[Dict[str, Any]]:
     """
     Fetch all sequences and detections between date_from and date_end.
@@ -274,6 +387,8 @@ def fetch_all_sequences_within(
         suppress_logs: Whether to suppress log output during progress display
         console: Rich console for enhanced output (created if None)
         error_collector: Error collector for clean error reporting (created if None)
+        checkpoint: Optional journal; dates and sequences it holds are read
+            back instead of fetched, and what is fetched is journaled
 
     Returns:
         List of flattened detection record dictionaries
@@ -343,23 +458,21 @@ def fetch_all_sequences_within(
     # Prepare date range
     dates = get_dates_within(date_from=date_from, date_end=date_end)
 
-    # Better date range display
-    if len(dates) == 1:
-        console.print(f"[blue]📅 Processing [bold]1 day[/]: {dates[0]:%Y-%m-%d}[/]")
-    elif len(dates) <= 3:
-        date_list = ", ".join(d.strftime("%Y-%m-%d") for d in dates)
-        console.print(f"[blue]📅 Processing [bold]{len(dates)} days[/]: {date_list}[/]")
-    else:
+    print_date_range(dates, console)
+
+    sequences = []
+    if checkpoint is not None:
+        sequences, dates = checkpoint.split_dates(dates)
         console.print(
-            f"[blue]📅 Processing [bold]{len(dates)} days[/]: {dates[0]:%Y-%m-%d} to {dates[-1]:%Y-%m-%d}[/]"
+            f"[blue]📒 Checkpoint: {len(sequences)} sequences from journaled dates, "
+            f"{len(dates)} date(s) to fetch[/]"
         )
 
     # Fetch sequences for all dates using parallel processing
-    sequences = []
     with concurrent.futures.ProcessPoolExecutor() as executor:
         future_to_date = {
             executor.submit(
-                fetch_sequences_for_date,
+                fetch_date_listing,
                 api_endpoint,
                 mdate,
                 access_token,
@@ -380,58 +493,26 @@ def fetch_all_sequences_within(
                     "Processing dates", total=len(future_to_date)
                 )
                 for future in concurrent.futures.as_completed(future_to_date):
-                    sequences.extend(future.result())
+                    day_sequences, complete = future.result()
+                    sequences.extend(day_sequences)
+                    if checkpoint is not None and complete:
+                        checkpoint.record_listing(future_to_date[future], day_sequences)
                     progress_bar.advance(task)
 
-    # Optionally filter sequences by alert_api_id.
-    # The raw alert sequences expose this value as the `id` field; the
-    # `alert_api_id` rename happens later in shared.py when records are
-    # formatted for the annotation API, so we cannot read it back here.
-    if selected_sequence_list:
-        pre_filter_count = len(sequences)
-        sequences = [
-            sequence
-            for sequence in sequences
-            if sequence.get("id") in selected_sequence_list
-        ]
-        filtered_out = pre_filter_count - len(sequences)
-        console.print(
-            f"[blue]🔍 Filtered sequences by alert_api_id[/] "
-            f"[dim]({filtered_out} skipped, {len(sequences)} remaining)[/]"
-        )
-
-    # Optionally cap total sequences
-    if (
-        max_sequences is not None
-        and max_sequences > 0
-        and len(sequences) > max_sequences
-    ):
-        sequences = sequences[:max_sequences]
-        console.print(
-            f"[blue]🔍 Applying max_sequences cap[/] "
-            f"[dim](processing first {max_sequences} sequences)[/]"
-        )
-
-    console.print(f"[green]✅ Found {len(sequences)} sequences[/]")
-
-    # Without this the two cases are indistinguishable: an alert API that
-    # predates temporal validation imports exactly like a day where nothing was
-    # scored — every sequence NULL, run reports success. Warn rather than fail:
-    # not every alert API deployment (e.g. CENIA) necessarily runs the feature,
-    # and a missing provenance field must not block ingestion.
-    if temporal_scores_unsupported(sequences):
-        message = (
-            "Alert API responses carry no `temporal_model_score` field at all "
-            f"({len(sequences)} sequences checked) — this deployment predates "
-            "temporal validation. Every sequence will import with a NULL score, "
-            "which is indistinguishable from 'never scored' downstream."
-        )
-        console.print(f"[yellow]⚠️  {message}[/]")
-        error_collector.add_error(message)
+    sequences = select_sequences(
+        sequences, selected_sequence_list, max_sequences, console, error_collector
+    )
 
     # Now fetch detections and build flattened records using parallel processing
     records = []
     first_sequence_logged = False
+    selected_count = len(sequences)
+    if checkpoint is not None:
+        records, sequences = checkpoint.split_sequences(sequences)
+        console.print(
+            f"[blue]📒 Checkpoint: {selected_count - len(sequences)} sequences' "
+            f"detections journaled, {len(sequences)} to fetch[/]"
+        )
 
     # Create organization-aware processing message
     org_context = f" {organization}" if organization else ""
@@ -494,6 +575,8 @@ def fetch_all_sequences_within(
                             )
 
                         records.extend(sequence_records)
+                        if checkpoint is not None:
+                            checkpoint.record_fetch(sequence, sequence_records)
                         progress_bar.advance(task)
 
                     except Exception as e:
@@ -506,7 +589,7 @@ def fetch_all_sequences_within(
     # Show final results
     console.print("[green]✅ Processing complete[/]")
     console.print(
-        f"   • [bold]{len(records)}[/] detection records from [bold]{len(sequences)}[/] sequences"
+        f"   • [bold]{len(records)}[/] detection records from [bold]{selected_count}[/] sequences"
     )
 
     # Show errors if any occurred
@@ -11,7 +11,7 @@ import logging
 import os
 import time
 from collections import defaultdict
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, List, Any, Optional, Set, Tuple
 from urllib.parse import urlparse
 
 import requests
@@ -30,10 +30,15 @@ from app.clients.annotation_api import (
     get_auth_token,
     create_sequence,
     update_sequence_temporal_score,
+    update_sequence_temporal_scores,
     create_detection_from_bucket_key,
     create_detection_from_url,
+    create_detections_batch,
     list_detections,
+    lookup_detections,
+    lookup_sequences,
     skip_alert,
+    import_alert,
     AnnotationAPIError,
     ValidationError,
 )
@@ -425,9 +430,9 @@ def _find_existing_detection(
 ) -> Optional[dict]:
     """Find the detection with this alert_api_id in a sequence, or None.
 
-    The detections list endpoint has no alert_api_id filter, so page through
-    the sequence's detections (a sequence holds at most ~frames-limit rows)
-    and match client-side.
+    The server filters on alert_api_id, so this is one request. A server
+    predating that filter ignores it and returns the whole sequence, hence
+    the client-side match and the paging.
     """
     page = 1
     while True:
@@ -435,6 +440,7 @@ def _find_existing_detection(
             annotation_api_url,
             auth_token,
             sequence_id=sequence_id,
+            alert_api_id=alert_api_id,
             page=page,
             size=100,
         )
@@ -446,6 +452,62 @@ def _find_existing_detection(
         page += 1
 
 
+def _reuse_existing_detections(
+    annotation_api_url: str,
+    auth_token: str,
+    annotation_sequence_id: int,
+    sequence_records: List[dict],
+) -> Tuple[List[dict], List[dict]]:
+    """
+    Settle the records whose detection the sequence already holds.
+
+    One POST /detections/lookup answers for every record, instead of each
+    one posting, getting a 409 and looking itself up. A failed lookup (e.g.
+    a server predating the endpoint) settles nothing.
+
+    Returns ``(results, remaining)`` as `_post_detection_batch` does.
+    """
+    try:
+        stored = lookup_detections(
+            annotation_api_url,
+            auth_token,
+            annotation_sequence_id,
+            [record["detection_id"] for record in sequence_records],
+        )
+    except AnnotationAPIError as e:
+        logging.debug(
+            f"Detection lookup for sequence {annotation_sequence_id} failed: {e.message}"
+        )
+        return [], sequence_records
+
+    stored_ids = {detection["alert_api_id"]: detection["id"] for detection in stored}
+    results: List[dict] = []
+    remaining: List[dict] = []
+    for record in sequence_records:
+        if record["detection_id"] not in stored_ids:
+            remaining.append(record)
+            continue
+        detection_data = transform_detection_data(record, annotation_sequence_id)
+        logging.info(
+            f"Detection {record['detection_id']} already exists "
+            f"as annotation detection {stored_ids[record['detection_id']]} — reusing it"
+        )
+        results.append(
+            {
+                "detection_id": record["detection_id"],
+                "success": True,
+                "error": None,
+                "annotation_detection_id": stored_ids[record["detection_id"]],
+                "xyxyns": [
+                    pred["xyxyn"]
+                    for pred in detection_data["algo_predictions"]["predictions"]
+                ],
+                "recorded_at": record["detection_created_at"],
+            }
+        )
+    return results, remaining
+
+
 def _process_single_detection(
     record: dict,
     annotation_api_url: str,
@@ -585,10 +647,146 @@ def _process_single_detection(
     return result
 
 
+# Transient statuses worth another attempt: a batch item failing with one is
+# retried through the single-detection endpoints (which back off), and an
+# alert import is retried as a whole.
+RETRYABLE_STATUS_CODES = (502, 503, 504)
+
+
+def _detection_batch_item(
+    record: dict, annotation_sequence_id: Optional[int], force_url: bool
+) -> Tuple[dict, dict]:
+    """A /detections/batch item for a record, and its transformed data.
+
+    Raises:
+        ValueError: The record has no image source
+    """
+    source_key = None if force_url else record.get("detection_bucket_key")
+    source_url = record.get("detection_url")
+    detection_data = transform_detection_data(record, annotation_sequence_id)
+    if not (source_key or source_url):
+        raise ValueError(
+            "Detection record is missing both detection_bucket_key and detection_url"
+        )
+    item = {k: v for k, v in detection_data.items() if k != "sequence_id"}
+    if source_key:
+        item["source_key"] = source_key
+    else:
+        item["source_url"] = source_url
+    return item, detection_data
+
+
+def _post_detection_batch(
+    annotation_api_url: str,
+    auth_token: str,
+    annotation_sequence_id: int,
+    sequence_records: List[dict],
+    force_url: bool = False,
+) -> Tuple[List[dict], List[dict]]:
+    """
+    Create a sequence's detections with one POST /detections/batch.
+
+    Returns ``(results, remaining)``: results, shaped like
+    `_process_single_detection`'s, for every record settled here, and the
+    records left for the per-detection path. Those are the items that failed
+    with a transient status, or all of them when the batch request itself
+    failed (network or server error, a server predating the endpoint, or a
+    payload it rejected as a whole).
+    """
+    results: List[dict] = []
+    batched: List[Tuple[dict, dict, dict]] = []
+    items: List[dict] = []
+    for record in sequence_records:
+        result = {
+            "detection_id": record["detection_id"],
+            "success": False,
+            "error": None,
+            "annotation_detection_id": None,
+            "xyxyns": [],
+            "recorded_at": record["detection_created_at"],
+        }
+        try:
+            item, detection_data = _detection_batch_item(
+                record, annotation_sequence_id, force_url
+            )
+        except Exception as e:
+            result["error"] = (
+                f"Unexpected error processing detection {record['detection_id']}: {e}"
+            )
+            logging.error(result["error"])
+            results.append(result)
+            continue
+
+        items.append(item)
+        batched.append((record, result, detection_data))
+
+    if not items:
+        return results, []
+
+    try:
+        response = create_detections_batch(
+            annotation_api_url, auth_token, annotation_sequence_id, items
+        )
+    except AnnotationAPIError as e:
+        logging.warning(
+            f"⚠️ Batch create for sequence {annotation_sequence_id} failed "
+            f"({e.message}) — falling back to one request per detection"
+        )
+        return results, [record for record, _, _ in batched]
+
+    remaining: List[dict] = []
+    for (record, result, detection_data), outcome in zip(batched, response["results"]):
+        if outcome["status"] in ("created", "exists"):
+            if outcome["status"] == "exists":
+                logging.info(
+                    f"Detection {record['detection_id']} already exists "
+                    f"as annotation detection {outcome['detection']['id']} — reusing it"
+                )
+            result["success"] = True
+            result["annotation_detection_id"] = outcome["detection"]["id"]
+            result["xyxyns"] = [
+                pred["xyxyn"]
+                for pred in detection_data["algo_predictions"]["predictions"]
+            ]
+        elif outcome["status_code"] in RETRYABLE_STATUS_CODES:
+            remaining.append(record)
+            continue
+        else:
+            result["error"] = (
+                f"API error processing detection {record['detection_id']}: "
+                f"{outcome['error']}"
+            )
+            logging.error(result["error"])
+        results.append(result)
+    return results, remaining
+
+
 # Outcomes of a refresh attempt on an already-imported sequence.
 REFRESH_REFRESHED = "refreshed"
 REFRESH_FAILED = "failed"
 REFRESH_SKIPPED_UNKNOWN = "skipped_unknown"
+# The pre-flight lookup showed the stored values already match: no request.
+REFRESH_UNCHANGED = "unchanged"
+
+TEMPORAL_FIELDS = (
+    "temporal_model_score",
+    "temporal_model_version",
+    "temporal_api_version",
+)
+
+# Keys per POST /sequences/lookup (the server's ceiling).
+SEQUENCE_LOOKUP_CHUNK = 1000
+# Rows per PATCH /sequences/temporal-score/batch (the server's ceiling).
+TEMPORAL_REFRESH_CHUNK = 5000
+
+
+def _temporal_refresh_payload(sequence_data: dict) -> dict:
+    """The PATCH /sequences/temporal-score body for a sequence."""
+    return {
+        "source_api": sequence_data["source_api"],
+        "alert_api_id": sequence_data["alert_api_id"],
+        **{field: sequence_data.get(field) for field in TEMPORAL_FIELDS},
+    }
 
 
 def _refresh_temporal_score(
@@ -615,13 +813,15 @@ def _refresh_temporal_score(
         )
         return REFRESH_SKIPPED_UNKNOWN
 
-    payload = {
-        "source_api": sequence_data["source_api"],
-        "alert_api_id": sequence_data["alert_api_id"],
-        "temporal_model_score": sequence_data.get("temporal_model_score"),
-        "temporal_model_version": sequence_data.get("temporal_model_version"),
-        "temporal_api_version": sequence_data.get("temporal_api_version"),
-    }
+    return _patch_temporal_score(
+        annotation_api_url, auth_token, _temporal_refresh_payload(sequence_data)
+    )
+
+
+def _patch_temporal_score(
+    annotation_api_url: str, auth_token: str, payload: dict
+) -> str:
+    """One PATCH /sequences/temporal-score. Returns the outcome; never raises."""
     try:
         update_sequence_temporal_score(annotation_api_url, auth_token, payload)
         return REFRESH_REFRESHED
@@ -633,6 +833,151 @@ def _refresh_temporal_score(
         return REFRESH_FAILED
 
 
+def _already_exists_result(
+    alert_api_sequence_id: int, sequence_records: List[dict], refresh_status: str
+) -> Dict:
+    """The posting result of a lane that was already imported."""
+    return {
+        "success": False,
+        "skipped": True,
+        "skip_reason": "already exists",
+        "refresh_status": refresh_status,
+        "sequence_id": None,
+        "alert_api_sequence_id": alert_api_sequence_id,
+        "successful_detections": 0,
+        "failed_detections": 0,
+        "skipped_detections": len(sequence_records),
+        "total_detections": len(sequence_records),
+        "detection_results": [],
+    }
+
+
+def lookup_existing_lanes(
+    annotation_api_url: str,
+    auth_token: str,
+    alert_api_sequence_ids: List[int],
+    source_api: str = "pyronear_french",
+) -> Dict[int, dict]:
+    """
+    Pre-flight for a re-import: which lanes are already stored.
+
+    One POST /sequences/lookup per SEQUENCE_LOOKUP_CHUNK lanes, so the
+    lanes found here are settled without posting each one for a 409.
+
+    Returns:
+        The stored sequences (with their temporal columns) by alert
+        sequence id; empty when the server cannot answer (e.g. it predates
+        the endpoint), in which case every lane is posted as before
+    """
+    existing: Dict[int, dict] = {}
+    try:
+        for start in range(0, len(alert_api_sequence_ids), SEQUENCE_LOOKUP_CHUNK):
+            chunk = alert_api_sequence_ids[start : start + SEQUENCE_LOOKUP_CHUNK]
+            for stored in lookup_sequences(
+                annotation_api_url,
+                auth_token,
+                [
+                    {"source_api": source_api, "alert_api_id": alert_api_id}
+                    for alert_api_id in chunk
+                ],
+            ):
+                existing[stored["alert_api_id"]] = stored
+    except AnnotationAPIError as e:
+        logging.warning(
+            f"⚠️ Sequence lookup failed ({e.message}) — every lane will be posted"
+        )
+        return {}
+    return existing
+
+
+def _refresh_temporal_scores(
+    annotation_api_url: str, auth_token: str, payloads: List[dict]
+) -> Dict[int, str]:
+    """
+    Refresh many sequences' temporal columns, TEMPORAL_REFRESH_CHUNK at a time.
+
+    A chunk the batch endpoint cannot take (e.g. a server predating it) is
+    refreshed one sequence at a time instead, as is each row the batch
+    reports ``not_found``. Never raises.
+
+    Returns:
+        The refresh outcome by alert sequence id
+    """
+    outcomes: Dict[int, str] = {}
+    for start in range(0, len(payloads), TEMPORAL_REFRESH_CHUNK):
+        chunk = payloads[start : start + TEMPORAL_REFRESH_CHUNK]
+        try:
+            results = update_sequence_temporal_scores(
+                annotation_api_url, auth_token, chunk
+            )
+        except AnnotationAPIError as e:
+            logging.warning(
+                f"⚠️ Batch temporal refresh failed ({e.message}) — "
+                "refreshing one sequence at a time"
+            )
+            for payload in chunk:
+                outcomes[payload["alert_api_id"]] = _patch_temporal_score(
+                    annotation_api_url, auth_token, payload
+                )
+            continue
+        # Results come back in request order, so they pair with the chunk.
+        for payload, result in zip(chunk, results):
+            alert_api_id = result["alert_api_id"]
+            if result["status"] == "updated":
+                outcomes[alert_api_id] = REFRESH_REFRESHED
+            elif result["status"] == "not_found":
+                outcomes[alert_api_id] = _patch_temporal_score(
+                    annotation_api_url, auth_token, payload
+                )
+            elif alert_api_id not in outcomes:
+                logging.warning(
+                    f"Temporal score refresh failed for alert_api_id="
+                    f"{alert_api_id}: {result['status']}"
+                )
+                outcomes[alert_api_id] = REFRESH_FAILED
+    return outcomes
+
+
+def settle_existing_lanes(
+    annotation_api_url: str,
+    auth_token: str,
+    existing: Dict[int, dict],
+    grouped_records: Dict[int, List[dict]],
+    source_api: str = "pyronear_french",
+) -> List[Dict]:
+    """
+    Results for the lanes `lookup_existing_lanes` found stored.
+
+    A lane's temporal columns are refreshed only when they differ from this
+    run's values, and those refreshes go out in batches, so a backfill costs
+    a handful of requests rather than one per lane. As in
+    `_refresh_temporal_score`, a lane whose score this run could not
+    determine is left untouched. Never raises.
+    """
+    statuses: Dict[int, str] = {}
+    payloads: List[dict] = []
+    for alert_api_sequence_id, stored in existing.items():
+        first_record = grouped_records[alert_api_sequence_id][0]
+        sequence_data = transform_sequence_data(first_record, source_api)
+        if first_record.get("sequence_temporal_score_unknown"):
+            statuses[alert_api_sequence_id] = REFRESH_SKIPPED_UNKNOWN
+        elif all(
+            stored.get(field) == sequence_data.get(field) for field in TEMPORAL_FIELDS
+        ):
+            statuses[alert_api_sequence_id] = REFRESH_UNCHANGED
+        else:
+            payloads.append(_temporal_refresh_payload(sequence_data))
+    statuses.update(_refresh_temporal_scores(annotation_api_url, auth_token, payloads))
+    return [
+        _already_exists_result(
+            alert_api_sequence_id,
+            grouped_records[alert_api_sequence_id],
+            statuses[alert_api_sequence_id],
+        )
+        for alert_api_sequence_id in existing
+    ]
+
+
 def post_sequence_to_annotation_api(
     annotation_api_url: str,
     sequence_records: List[dict],
@@ -647,7 +992,8 @@ def post_sequence_to_annotation_api(
     Args:
         annotation_api_url: Base URL of annotation API
         sequence_records: List of detection records for a single sequence
-        max_detection_workers: Max workers for parallel detection creation
+        max_detection_workers: Max workers for the per-detection requests that
+            follow up on a batch (see `_post_detection_batch`)
         source_api: Source API enum value (pyronear_french, api_cenia, etc.)
 
     Returns:
@@ -678,41 +1024,60 @@ def post_sequence_to_annotation_api(
             refresh_status = _refresh_temporal_score(
                 annotation_api_url, auth_token, sequence_data, first_record
             )
-            return {
-                "success": False,
-                "skipped": True,
-                "skip_reason": "already exists",
-                "refresh_status": refresh_status,
-                "sequence_id": None,
-                "alert_api_sequence_id": first_record["sequence_id"],
-                "successful_detections": 0,
-                "failed_detections": 0,
-                "skipped_detections": len(sequence_records),
-                "total_detections": len(sequence_records),
-                "detection_results": [],
-            }
+            return _already_exists_result(
+                first_record["sequence_id"], sequence_records, refresh_status
+            )
         raise
 
-    # Create detections for this sequence using parallel processing
     successful_detections = 0
     failed_detections = 0
     detection_results: List[dict] = []
 
-    if len(sequence_records) == 1:
+    # Several detections go to the server in one batch request (one round
+    # trip and one commit instead of one per frame); whatever it leaves
+    # unsettled goes through the per-detection endpoints below.
+    remaining_records = sequence_records
+    if len(sequence_records) > 1:
+        batch_results, remaining_records = _post_detection_batch(
+            annotation_api_url,
+            auth_token,
+            annotation_sequence_id,
+            sequence_records,
+            force_url=force_url,
+        )
+        # A batch that failed as a whole may still have committed (e.g. a
+        # timeout after the server wrote it): reuse what is stored before
+        # posting the rest one by one.
+        if len(remaining_records) > 1:
+            reused, remaining_records = _reuse_existing_detections(
+                annotation_api_url,
+                auth_token,
+                annotation_sequence_id,
+                remaining_records,
+            )
+            batch_results += reused
+        for result in batch_results:
+            if result["success"]:
+                successful_detections += 1
+                detection_results.append(result)
+            else:
+                failed_detections += 1
+
+    if len(remaining_records) == 1:
         # Single detection - process directly to avoid thread overhead
         result = _process_single_detection(
-            sequence_records[0],
+            remaining_records[0],
             annotation_api_url,
             auth_token,
             annotation_sequence_id,
             force_url=force_url,
         )
         if result["success"]:
-            successful_detections = 1
+            successful_detections += 1
             detection_results.append(result)
         else:
-            failed_detections = 1
-    else:
+            failed_detections += 1
+    elif remaining_records:
         # Multiple detections - use parallel processing
         with concurrent.futures.ThreadPoolExecutor(
             max_workers=max_detection_workers
@@ -727,7 +1092,7 @@ def post_sequence_to_annotation_api(
                     annotation_sequence_id,
                     force_url=force_url,
                 ): record
-                for record in sequence_records
+                for record in remaining_records
             }
 
             # Collect results
@@ -757,6 +1122,318 @@ def post_sequence_to_annotation_api(
     }
 
 
+def build_alert_import(
+    alert_records: List[dict],
+    source_api: str = "pyronear_french",
+    force_url: bool = False,
+) -> Tuple[Dict[int, List[dict]], List[dict], Dict[int, List[dict]]]:
+    """
+    The POST /alerts/import lanes for one platform alert's records.
+
+    Returns ``(lanes_records, lanes, posted)``: the records of each lane by
+    alert sequence id, the request's lanes, and per lane the detection
+    results `settle_alert_import` completes once the server has answered.
+
+    Raises:
+        ValueError: A record has no image source
+    """
+    # object_split imports this module, so it cannot be imported at the top.
+    from .object_split import build_single_track_annotation
+
+    lanes_records = group_records_by_sequence(alert_records)
+    lanes: List[dict] = []
+    posted: Dict[int, List[dict]] = {}
+    for alert_api_sequence_id, records in lanes_records.items():
+        items: List[dict] = []
+        detection_results: List[dict] = []
+        for record in records:
+            item, detection_data = _detection_batch_item(record, None, force_url)
+            items.append(item)
+            detection_results.append(
+                {
+                    "detection_id": record["detection_id"],
+                    "success": True,
+                    "error": None,
+                    # The seed annotation references detections by their
+                    # alert API id; the server remaps it to the new row.
+                    "annotation_detection_id": record["detection_id"],
+                    "xyxyns": [
+                        pred["xyxyn"]
+                        for pred in detection_data["algo_predictions"]["predictions"]
+                    ],
+                    "recorded_at": record["detection_created_at"],
+                }
+            )
+        sequence_data = transform_sequence_data(records[0], source_api)
+        lanes.append(
+            {
+                # A JSON null is not the omitted form field it replaces.
+                "sequence": {k: v for k, v in sequence_data.items() if v is not None},
+                "detections": items,
+                "annotation": build_single_track_annotation(
+                    detection_results
+                ).model_dump(mode="json"),
+            }
+        )
+        posted[alert_api_sequence_id] = detection_results
+    return lanes_records, lanes, posted
+
+
+def settle_alert_import(
+    annotation_api_url: str,
+    auth_token: str,
+    response: dict,
+    lanes_records: Dict[int, List[dict]],
+    posted: Dict[int, List[dict]],
+    source_api: str = "pyronear_french",
+) -> Tuple[List[dict], Dict[int, List[dict]]]:
+    """
+    Per-lane results for a POST /alerts/import response.
+
+    Returns ``(results, remaining)`` as `_import_alert` does. When the alert
+    already existed, the stored lanes' temporal scores are refreshed together
+    in one batch request (see `_refresh_temporal_scores`), and, as on a
+    sequence 409, a lane whose score this run could not determine is left
+    untouched.
+    """
+    results: List[dict] = []
+    remaining: Dict[int, List[dict]] = {}
+    stored = {lane["alert_api_id"]: lane for lane in response["lanes"]}
+    refresh_statuses: Dict[int, str] = {}
+    if response["status"] == "exists":
+        payloads: List[dict] = []
+        for alert_api_sequence_id, records in lanes_records.items():
+            if alert_api_sequence_id not in stored:
+                continue
+            if records[0].get("sequence_temporal_score_unknown"):
+                refresh_statuses[alert_api_sequence_id] = REFRESH_SKIPPED_UNKNOWN
+            else:
+                payloads.append(
+                    _temporal_refresh_payload(
+                        transform_sequence_data(records[0], source_api)
+                    )
+                )
+        refresh_statuses.update(
+            _refresh_temporal_scores(annotation_api_url, auth_token, payloads)
+        )
+    for alert_api_sequence_id, records in lanes_records.items():
+        lane = stored.get(alert_api_sequence_id)
+        if lane is None:
+            # Only possible for "exists": the alert was imported before
+            # without this lane.
+            remaining[alert_api_sequence_id] = records
+        elif response["status"] == "exists":
+            results.append(
+                _already_exists_result(
+                    alert_api_sequence_id,
+                    records,
+                    refresh_statuses[alert_api_sequence_id],
+                )
+            )
+        else:
+            # JSON object keys are strings.
+            detection_ids = {int(k): v for k, v in lane["detection_ids"].items()}
+            detection_results = posted[alert_api_sequence_id]
+            for result in detection_results:
+                result["annotation_detection_id"] = detection_ids[
+                    result["detection_id"]
+                ]
+            results.append(
+                {
+                    "success": True,
+                    "sequence_id": lane["sequence_id"],
+                    "alert_api_sequence_id": alert_api_sequence_id,
+                    "successful_detections": len(records),
+                    "failed_detections": 0,
+                    "total_detections": len(records),
+                    "detection_results": detection_results,
+                    "annotation_id": lane["annotation_id"],
+                }
+            )
+    return results, remaining
+
+
+def _import_alert(
+    annotation_api_url: str,
+    auth_token: str,
+    alert_records: List[dict],
+    source_api: str = "pyronear_french",
+    force_url: bool = False,
+    max_retries: int = 3,
+    base_delay: float = 5.0,
+) -> Tuple[List[dict], Dict[int, List[dict]]]:
+    """
+    Import every lane of one platform alert with one POST /alerts/import.
+
+    The lanes, their detections and their single-track seed annotations
+    commit together or not at all, so a lane never has to be rolled back.
+
+    Returns ``(results, remaining)``: results, shaped like
+    `post_sequence_to_annotation_api`'s, for the lanes settled here — created
+    ones carry their ``annotation_id``, since the seed annotation is already
+    written — and, by alert sequence id, the lanes left for the per-lane path.
+    Those are every lane when the import itself failed (a payload the server
+    rejected, a server predating the endpoint, transient errors past
+    ``max_retries``), or the lanes an earlier import of the alert did not
+    store. Never raises.
+    """
+    platform_alert_id = alert_records[0]["platform_alert_id"]
+    try:
+        lanes_records, lanes, posted = build_alert_import(
+            alert_records, source_api, force_url
+        )
+    except Exception as e:
+        logging.warning(
+            f"⚠️ Could not build the import of alert {platform_alert_id} ({e}) "
+            "— falling back to one import per lane"
+        )
+        return [], group_records_by_sequence(alert_records)
+
+    for attempt in range(max_retries + 1):
+        try:
+            response = import_alert(
+                annotation_api_url, auth_token, source_api, platform_alert_id, lanes
+            )
+            break
+        except AnnotationAPIError as e:
+            if e.status_code in RETRYABLE_STATUS_CODES and attempt < max_retries:
+                delay = base_delay * (2**attempt)
+                logging.warning(
+                    f"⚠️ Alert {platform_alert_id} import got HTTP {e.status_code} "
+                    f"— retrying in {delay:.0f}s (attempt {attempt + 1}/{max_retries})"
+                )
+                time.sleep(delay)
+                continue
+            logging.warning(
+                f"⚠️ Alert {platform_alert_id} import failed ({e.message}) "
+                "— falling back to one import per lane"
+            )
+            return [], lanes_records
+
+    return settle_alert_import(
+        annotation_api_url, auth_token, response, lanes_records, posted, source_api
+    )
+
+
+def group_records_by_alert(
+    grouped_records: Dict[int, List[dict]],
+) -> Tuple[Dict[int, List[dict]], Dict[int, List[dict]]]:
+    """
+    Gather object-split lanes by their platform alert.
+
+    Args:
+        grouped_records: Records by alert sequence id (`group_records_by_sequence`)
+
+    Returns:
+        ``(alert_records, lone_lanes)``: the records of each alert by
+        platform alert id, and by alert sequence id the lanes whose records
+        carry no platform alert id
+    """
+    alert_records: Dict[int, List[dict]] = defaultdict(list)
+    lone_lanes: Dict[int, List[dict]] = {}
+    for alert_api_sequence_id, sequence_records in grouped_records.items():
+        platform_alert_id = sequence_records[0].get("platform_alert_id")
+        if platform_alert_id is None:
+            lone_lanes[alert_api_sequence_id] = sequence_records
+        else:
+            alert_records[platform_alert_id].extend(sequence_records)
+    return dict(alert_records), lone_lanes
+
+
+class PostingTally:
+    """
+    Running totals of posted lanes, reported as the summary returned by
+    `post_records_to_annotation_api`.
+
+    Not thread-safe: feed it from the thread collecting results.
+    """
+
+    def __init__(self) -> None:
+        self.successful_sequences = 0
+        self.failed_sequences = 0
+        self.skipped_sequences = 0
+        self.refreshed_sequences = 0
+        self.refresh_failures = 0
+        self.refresh_skipped = 0
+        self.successful_detections = 0
+        self.failed_detections = 0
+        self.skipped_detections = 0
+        self.successful_sequence_ids: List[int] = []
+        self.sequence_results: List[dict] = []
+
+    def add(self, alert_api_sequence_id: int, result: dict) -> None:
+        """Count a lane's posting result."""
+        self.sequence_results.append(result)
+        if result.get("skipped"):
+            self.skipped_sequences += 1
+            self.skipped_detections += result["skipped_detections"]
+            # Only the "already exists" paths set this key.
+            status = result.get("refresh_status")
+            if status == REFRESH_REFRESHED:
+                self.refreshed_sequences += 1
+            elif status == REFRESH_FAILED:
+                self.refresh_failures += 1
+            elif status == REFRESH_SKIPPED_UNKNOWN:
+                self.refresh_skipped += 1
+            reason = result.get("skip_reason", "already exists")
+            logging.warning(f"⚠️ Sequence {alert_api_sequence_id} skipped ({reason})")
+        else:
+            self.successful_sequences += 1
+            self.successful_detections += result["successful_detections"]
+            self.failed_detections += result["failed_detections"]
+            self.successful_sequence_ids.append(result["sequence_id"])
+            logging.info(
+                f"✅ Sequence {alert_api_sequence_id} -> {result['sequence_id']}: "
+                f"{result['successful_detections']}/{result['total_detections']} detections"
+            )
+
+    def fail(
+        self, alert_api_sequence_id: int, sequence_records: List[dict], exc: Exception
+    ) -> None:
+        """Count a lane whose posting raised."""
+        if isinstance(exc, ValidationError):
+            # Errors will still show since we set log level to ERROR
+            logging.error(
+                f"❌ Sequence {alert_api_sequence_id} validation failed: {exc.message}"
+            )
+            for field_error in exc.field_errors:
+                logging.error(f"  - {field_error['field']}: {field_error['message']}")
+        elif isinstance(exc, AnnotationAPIError):
+            logging.error(
+                f"❌ Sequence {alert_api_sequence_id} API error: {exc.message}"
+            )
+            if exc.status_code:
+                logging.error(f"HTTP Status: {exc.status_code}")
+        else:
+            logging.error(
+                f"❌ Sequence {alert_api_sequence_id} unexpected error: {exc}"
+            )
+        self.failed_sequences += 1
+        self.failed_detections += len(sequence_records)
+
+    def summary(
+        self, total_sequences: int, total_detections: int, auth_token: Optional[str]
+    ) -> Dict:
+        """The summary dict `post_records_to_annotation_api` returns."""
+        return {
+            "successful_sequences": self.successful_sequences,
+            "failed_sequences": self.failed_sequences,
+            "skipped_sequences": self.skipped_sequences,
+            "refreshed_sequences": self.refreshed_sequences,
+            "refresh_failures": self.refresh_failures,
+            "refresh_skipped": self.refresh_skipped,
+            "total_sequences": total_sequences,
+            "successful_detections": self.successful_detections,
+            "failed_detections": self.failed_detections,
+            "skipped_detections": self.skipped_detections,
+            "total_detections": total_detections,
+            "successful_sequence_ids": self.successful_sequence_ids,
+            "sequence_results": self.sequence_results,
+            # Annotation creation reuses this instead of logging in once per lane.
+            "auth_token": auth_token,
+        }
+
+
 def post_records_to_annotation_api(
     annotation_api_url: str,
     records: List[dict],
@@ -782,51 +1459,39 @@ def post_records_to_annotation_api(
     """
     if not records:
         logging.warning("No records to post")
-        return {
-            "successful_sequences": 0,
-            "failed_sequences": 0,
-            "skipped_sequences": 0,
-            "refreshed_sequences": 0,
-            "refresh_failures": 0,
-            "refresh_skipped": 0,
-            "total_sequences": 0,
-            "successful_detections": 0,
-            "failed_detections": 0,
-            "skipped_detections": 0,
-            "total_detections": 0,
-            "successful_sequence_ids": [],
-            "sequence_results": [],
-            # No token was minted on this path; both returns share a shape.
-            "auth_token": None,
-        }
+        # No token was minted on this path; both returns share a shape.
+        return PostingTally().summary(0, 0, None)
 
     # Resolve credentials and get a single auth token up-front to avoid repeated logins
     login, password = get_annotation_credentials(annotation_api_url)
     auth_token = get_auth_token(annotation_api_url, username=login, password=password)
 
-    # Group records by sequence
+    # Group records by sequence, and object-split lanes by their alert;
+    # lanes already stored are settled without posting them.
     grouped_records = group_records_by_sequence(records)
+    existing = lookup_existing_lanes(
+        annotation_api_url, auth_token, list(grouped_records), source_api
+    )
+    alert_records, lone_lanes = group_records_by_alert(
+        {
+            alert_api_sequence_id: sequence_records
+            for alert_api_sequence_id, sequence_records in grouped_records.items()
+            if alert_api_sequence_id not in existing
+        }
+    )
 
     logging.info(
-        f"Processing {len(grouped_records)} unique sequences with {len(records)} total detections using {max_workers} workers"
+        f"Processing {len(grouped_records)} unique sequences ({len(alert_records)} alerts) with {len(records)} total detections using {max_workers} workers"
     )
 
-    successful_sequences = 0
-    failed_sequences = 0
-    skipped_sequences = 0
-    refreshed_sequences = 0
-    refresh_failures = 0
-    refresh_skipped = 0
-    total_successful_detections = 0
-    total_failed_detections = 0
-    total_skipped_detections = 0
-    successful_sequence_ids = []
-    sequence_results = []
-
+    tally = PostingTally()
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all sequence posting tasks
-        future_to_sequence = {
-            executor.submit(
+        # Future -> (alert API sequence id, its records) for a lane post, or
+        # (platform alert id, None) for a whole-alert import.
+        pending: Dict[concurrent.futures.Future, Tuple[int, Optional[List[dict]]]] = {}
+
+        def submit_lane(alert_api_sequence_id: int, sequence_records: List[dict]):
+            future = executor.submit(
                 post_sequence_to_annotation_api,
                 annotation_api_url,
                 sequence_records,
@@ -834,9 +1499,23 @@ def post_records_to_annotation_api(
                 max_detection_workers=max_detection_workers,
                 source_api=source_api,
                 force_url=force_url,
-            ): (alert_api_sequence_id, sequence_records)
-            for alert_api_sequence_id, sequence_records in grouped_records.items()
-        }
+            )
+            pending[future] = (alert_api_sequence_id, sequence_records)
+
+        # An alert's lanes go in one atomic import; the lanes it leaves
+        # unsettled, and records outside any alert, are posted one by one.
+        for platform_alert_id, records_of_alert in alert_records.items():
+            future = executor.submit(
+                _import_alert,
+                annotation_api_url,
+                auth_token,
+                records_of_alert,
+                source_api=source_api,
+                force_url=force_url,
+            )
+            pending[future] = (platform_alert_id, None)
+        for alert_api_sequence_id, sequence_records in lone_lanes.items():
+            submit_lane(alert_api_sequence_id, sequence_records)
 
         # Collect results with progress tracking
         with LogSuppressor(suppress=suppress_logs):
@@ -849,87 +1528,41 @@ def post_records_to_annotation_api(
                 transient=True,
             ) as progress_bar:
                 task = progress_bar.add_task(
-                    "Processing sequences", total=len(future_to_sequence)
+                    "Processing sequences", total=len(grouped_records)
                 )
-                for future in concurrent.futures.as_completed(future_to_sequence):
-                    alert_api_sequence_id, sequence_records = future_to_sequence[future]
-                    try:
-                        result = future.result()
-                        sequence_results.append(result)
-
-                        if result.get("skipped"):
-                            skipped_sequences += 1
-                            total_skipped_detections += result["skipped_detections"]
-                            # Only the 409 branch sets this key.
-                            status = result.get("refresh_status")
-                            if status == REFRESH_REFRESHED:
-                                refreshed_sequences += 1
-                            elif status == REFRESH_FAILED:
-                                refresh_failures += 1
-                            elif status == REFRESH_SKIPPED_UNKNOWN:
-                                refresh_skipped += 1
-                            reason = result.get("skip_reason", "already exists")
-                            logging.warning(
-                                f"⚠️ Sequence {alert_api_sequence_id} skipped ({reason})"
-                            )
+                # Settled here, while the pool posts the new lanes.
+                for lane in settle_existing_lanes(
+                    annotation_api_url,
+                    auth_token,
+                    existing,
+                    grouped_records,
+                    source_api,
+                ):
+                    tally.add(lane["alert_api_sequence_id"], lane)
+                    progress_bar.advance(task)
+                while pending:
+                    done, _ = concurrent.futures.wait(
+                        pending, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        key, sequence_records = pending.pop(future)
+                        if sequence_records is None:
+                            lane_results, remaining = future.result()
+                            for (
+                                alert_api_sequence_id,
+                                lane_records,
+                            ) in remaining.items():
+                                submit_lane(alert_api_sequence_id, lane_records)
+                            for lane in lane_results:
+                                tally.add(lane["alert_api_sequence_id"], lane)
+                                progress_bar.advance(task)
+                            continue
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            tally.fail(key, sequence_records, e)
                         else:
-                            successful_sequences += 1
-                            total_successful_detections += result[
-                                "successful_detections"
-                            ]
-                            total_failed_detections += result["failed_detections"]
-                            successful_sequence_ids.append(result["sequence_id"])
-
-                            logging.info(
-                                f"✅ Sequence {alert_api_sequence_id} -> {result['sequence_id']}: "
-                                f"{result['successful_detections']}/{result['total_detections']} detections"
-                            )
-                        progress_bar.advance(task)
-
-                    except ValidationError as e:
-                        # Errors will still show since we set log level to ERROR
-                        logging.error(
-                            f"❌ Sequence {alert_api_sequence_id} validation failed: {e.message}"
-                        )
-                        if e.field_errors:
-                            for field_error in e.field_errors:
-                                logging.error(
-                                    f"  - {field_error['field']}: {field_error['message']}"
-                                )
-                        failed_sequences += 1
-                        total_failed_detections += len(sequence_records)
-                        progress_bar.advance(task)
-                    except AnnotationAPIError as e:
-                        logging.error(
-                            f"❌ Sequence {alert_api_sequence_id} API error: {e.message}"
-                        )
-                        if e.status_code:
-                            logging.error(f"HTTP Status: {e.status_code}")
-                        failed_sequences += 1
-                        total_failed_detections += len(sequence_records)
-                        progress_bar.advance(task)
-                    except Exception as e:
-                        logging.error(
-                            f"❌ Sequence {alert_api_sequence_id} unexpected error: {e}"
-                        )
-                        failed_sequences += 1
-                        total_failed_detections += len(sequence_records)
+                            tally.add(key, result)
                         progress_bar.advance(task)
 
-    return {
-        "successful_sequences": successful_sequences,
-        "failed_sequences": failed_sequences,
-        "skipped_sequences": skipped_sequences,
-        "refreshed_sequences": refreshed_sequences,
-        "refresh_failures": refresh_failures,
-        "refresh_skipped": refresh_skipped,
-        "total_sequences": len(grouped_records),
-        "successful_detections": total_successful_detections,
-        "failed_detections": total_failed_detections,
-        "skipped_detections": total_skipped_detections,
-        "total_detections": len(records),
-        "successful_sequence_ids": successful_sequence_ids,
-        "sequence_results": sequence_results,
-        # Annotation creation reuses this instead of logging in once per lane.
-        "auth_token": auth_token,
-    }
+    return tally.summary(len(grouped_records), len(records), auth_token)
@@ -0,0 +1,217 @@
+# Copyright (C) 2026, Pyronear.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
+
+import logging
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.dependencies import get_current_user
+from app.crud import SequenceAnnotationCRUD
+from app.db import get_session
+from app.models import (
+    Detection,
+    Sequence,
+    SequenceAnnotation,
+    SequenceAnnotationProcessingStage,
+    SourceApi,
+    User,
+)
+from app.schemas.alert_import import (
+    AlertImportLaneResult,
+    AlertImportRequest,
+    AlertImportResponse,
+)
+from app.schemas.annotation_validation import SequenceAnnotationData
+from app.schemas.sequence_annotations import SequenceAnnotationCreate
+from app.services.detection_ingest import (
+    delete_stored_images,
+    new_detection,
+    platform_source_bucket,
+    storage_failure,
+    store_detection_images,
+)
+
+router = APIRouter()
+logger = logging.getLogger("uvicorn.error")
+
+
+async def _stored_lanes(
+    session: AsyncSession, source_api: SourceApi, platform_alert_id: int
+) -> List[AlertImportLaneResult]:
+    """The alert's lanes already in the database, by sequence id."""
+    sequences = (
+        await session.execute(
+            select(Sequence.id, Sequence.alert_api_id)
+            .where(Sequence.source_api == source_api)
+            .where(Sequence.platform_alert_id == platform_alert_id)
+            .order_by(Sequence.id)
+        )
+    ).all()
+    if not sequences:
+        return []
+    sequence_ids = [row.id for row in sequences]
+    annotation_ids = dict(
+        (
+            await session.execute(
+                select(SequenceAnnotation.sequence_id, SequenceAnnotation.id).where(
+                    SequenceAnnotation.sequence_id.in_(sequence_ids)
+                )
+            )
+        ).all()
+    )
+    detection_ids: dict = {sequence_id: {} for sequence_id in sequence_ids}
+    for row in await session.execute(
+        select(Detection.sequence_id, Detection.alert_api_id, Detection.id).where(
+            Detection.sequence_id.in_(sequence_ids)
+        )
+    ):
+        detection_ids[row.sequence_id][row.alert_api_id] = row.id
+    return [
+        AlertImportLaneResult(
+            alert_api_id=row.alert_api_id,
+            sequence_id=row.id,
+            annotation_id=annotation_ids.get(row.id),
+            detection_ids=detection_ids[row.id],
+        )
+        for row in sequences
+    ]
+
+
+@router.post(
+    "/import",
+    status_code=status.HTTP_201_CREATED,
+    summary="Import every lane of one platform alert atomically",
+)
+async def import_alert(
+    payload: AlertImportRequest,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> AlertImportResponse:
+    """Create an alert's object-split lanes, their detections and their seed
+    annotations in one transaction.
+
+    Either everything commits or nothing does: if any image fails to store,
+    the transaction is rolled back, the images already stored are deleted,
+    and the request fails with that item's status code (a client error is
+    preferred over a transient one, since retrying cannot fix it).
+
+    Idempotent on (source_api, platform_alert_id): when the alert already
+    has lanes, nothing is written and the stored lanes come back with 200.
+    Concurrent imports of one alert are serialized on an advisory lock, so
+    the loser sees the winner's lanes rather than a unique-constraint 409.
+    """
+    await session.execute(
+        select(
+            func.pg_advisory_xact_lock(
+                func.hashtextextended(
+                    f"alert-import:{payload.source_api.name}:{payload.platform_alert_id}",
+                    0,
+                )
+            )
+        )
+    )
+    stored = await _stored_lanes(session, payload.source_api, payload.platform_alert_id)
+    if stored:
+        await session.rollback()
+        response.status_code = status.HTTP_200_OK
+        return AlertImportResponse(
+            status="exists",
+            source_api=payload.source_api,
+            platform_alert_id=payload.platform_alert_id,
+            lanes=stored,
+        )
+
+    try:
+        sequences = [Sequence(**lane.sequence.model_dump()) for lane in payload.lanes]
+        session.add_all(sequences)
+        await session.flush()
+        lane_detections = [
+            [new_detection(item, sequence.id) for item in lane.detections]
+            for lane, sequence in zip(payload.lanes, sequences)
+        ]
+        session.add_all([det for detections in lane_detections for det in detections])
+        await session.flush()
+    except Exception:
+        await session.rollback()
+        raise
+
+    jobs = [
+        (item, detection, platform_source_bucket(sequence.organisation_id))
+        for lane, sequence, detections in zip(payload.lanes, sequences, lane_detections)
+        for item, detection in zip(lane.detections, detections)
+    ]
+    outcomes = await store_detection_images(jobs)
+    stored_keys = [outcome for outcome in outcomes if isinstance(outcome, str)]
+    failures = [
+        (item, *storage_failure(outcome))
+        for (item, _, _), outcome in zip(jobs, outcomes)
+        if isinstance(outcome, BaseException)
+    ]
+    if failures:
+        await session.rollback()
+        delete_stored_images(stored_keys)
+        item, status_code, error = min(failures, key=lambda failure: failure[1] >= 500)
+        raise HTTPException(
+            status_code=status_code,
+            detail=(
+                f"Detection alert_api_id={item.alert_api_id}: {error} "
+                f"({len(failures)} of {len(jobs)} images failed; nothing imported)"
+            ),
+        )
+    for (_, detection, _), bucket_key in zip(jobs, outcomes):
+        detection.bucket_key = bucket_key
+
+    annotations = SequenceAnnotationCRUD(session)
+    lanes = []
+    try:
+        for lane, sequence, detections in zip(
+            payload.lanes, sequences, lane_detections
+        ):
+            detection_ids = {det.alert_api_id: det.id for det in detections}
+            seed = lane.annotation.model_dump()
+            for track in seed["sequences_bbox"]:
+                for bbox in track["bboxes"]:
+                    bbox["detection_id"] = detection_ids[bbox["detection_id"]]
+            annotation = annotations.build(
+                SequenceAnnotationCreate(
+                    sequence_id=sequence.id,
+                    has_missed_smoke=False,
+                    annotation=SequenceAnnotationData.model_validate(seed),
+                    processing_stage=SequenceAnnotationProcessingStage.READY_TO_ANNOTATE,
+                )
+            )
+            session.add(annotation)
+            lanes.append((sequence, annotation, detection_ids))
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        delete_stored_images(stored_keys)
+        raise
+
+    logger.info(
+        "Imported alert %s/%s: %d lane(s), %d detection(s)",
+        payload.source_api.value,
+        payload.platform_alert_id,
+        len(sequences),
+        len(jobs),
+    )
+    return AlertImportResponse(
+        status="created",
+        source_api=payload.source_api,
+        platform_alert_id=payload.platform_alert_id,
+        lanes=[
+            AlertImportLaneResult(
+                alert_api_id=sequence.alert_api_id,
+                sequence_id=sequence.id,
+                annotation_id=annotation.id,
+                detection_ids=detection_ids,
+            )
+            for sequence, annotation, detection_ids in lanes
+        ],
+    )
@@ -3,7 +3,7 @@
 import logging
 from datetime import datetime, UTC
 from enum import Enum
-from typing import Awaitable, Callable, Optional
+from typing import Awaitable, Callable, List, Optional, Tuple
 
 from fastapi import (
     APIRouter,
@@ -28,13 +28,25 @@ from app.crud import DetectionCRUD
 from app.db import get_session
 from app.models import Detection, Sequence
 from app.schemas.annotation_validation import AlgoPredictions
-from app.core.config import settings
 from app.schemas.detection import (
+    DetectionBatchCreate,
+    DetectionBatchItem,
+    DetectionBatchItemResult,
+    DetectionBatchResponse,
     DetectionCreateFromBucketKey,
     DetectionCreateFromUrl,
+    DetectionLookup,
+    DetectionLookupResponse,
     DetectionRead,
     DetectionUrl,
 )
+from app.services.detection_ingest import (
+    delete_stored_images,
+    new_detection,
+    platform_source_bucket,
+    store_detection_images,
+    storage_failure,
+)
 from app.services.storage import (
     copy_file_from_bucket,
     s3_service,
@@ -243,9 +255,7 @@ async def create_detection_from_bucket_key(
             detail=f"Sequence {payload.sequence_id} not found",
         )
 
-    source_bucket = (
-        f"{settings.PLATFORM_SERVER_NAME}-alert-api-{sequence.organisation_id}"
-    )
+    source_bucket = platform_source_bucket(sequence.organisation_id)
 
     detection = Detection(
         sequence_id=payload.sequence_id,
@@ -275,6 +285,157 @@ async def create_detection_from_bucket_key(
     )
 
 
+@router.post(
+    "/batch",
+    summary="Create a sequence's detections in one request",
+)
+async def create_detections_batch(
+    payload: DetectionBatchCreate,
+    detections: DetectionCRUD = Depends(get_detection_crud),
+    current_user: User = Depends(get_current_user),
+) -> DetectionBatchResponse:
+    """Create every detection of one sequence in a single transaction.
+
+    The bulk counterpart of /from-bucket-key and /from-url: all rows are
+    flushed together, the storage operations run concurrently (at most
+    DETECTION_BATCH_STORAGE_CONCURRENCY at once), and one commit keeps the
+    ones that stored. Results come back per item, in request order:
+
+    - ``created``: the new detection.
+    - ``exists``: the sequence already holds this alert_api_id; the stored
+      detection is returned untouched, so a re-import can reuse it.
+    - ``failed``: the storage operation failed (or the alert_api_id repeats
+      within the batch); its row is dropped before the commit and the item
+      carries the status code the single endpoints would have returned.
+
+    Only request-level problems (unknown sequence, invalid payload) fail the
+    whole request.
+    """
+    session = detections.session
+    sequence = await session.get(Sequence, payload.sequence_id)
+    if sequence is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Sequence {payload.sequence_id} not found",
+        )
+    source_bucket = platform_source_bucket(sequence.organisation_id)
+
+    existing = {
+        detection.alert_api_id: detection
+        for detection in (
+            await session.execute(
+                select(Detection).where(
+                    Detection.sequence_id == payload.sequence_id,
+                    Detection.alert_api_id.in_(
+                        {item.alert_api_id for item in payload.detections}
+                    ),
+                )
+            )
+        ).scalars()
+    }
+
+    results: List[Optional[DetectionBatchItemResult]] = [None] * len(payload.detections)
+    pending: List[Tuple[int, DetectionBatchItem, Detection]] = []
+    batched: set[int] = set()
+    for index, item in enumerate(payload.detections):
+        if item.alert_api_id in existing:
+            results[index] = DetectionBatchItemResult(
+                alert_api_id=item.alert_api_id,
+                status="exists",
+                detection=DetectionRead.model_validate(
+                    existing[item.alert_api_id], from_attributes=True
+                ),
+            )
+            continue
+        if item.alert_api_id in batched:
+            results[index] = DetectionBatchItemResult(
+                alert_api_id=item.alert_api_id,
+                status="failed",
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                error="alert_api_id repeated within the batch",
+            )
+            continue
+        detection = new_detection(item, payload.sequence_id)
+        pending.append((index, item, detection))
+        batched.add(item.alert_api_id)
+
+    # Ids first: they are part of the bucket keys the storage operations
+    # write. A concurrent insert of the same key fails the flush, which the
+    # IntegrityError handler answers with 409 like the single endpoints.
+    session.add_all([detection for _, _, detection in pending])
+    try:
+        await session.flush()
+    except Exception:
+        await session.rollback()
+        raise
+
+    outcomes = await store_detection_images(
+        (item, detection, source_bucket) for _, item, detection in pending
+    )
+
+    stored_keys: List[str] = []
+    for (index, item, detection), outcome in zip(pending, outcomes):
+        if isinstance(outcome, BaseException):
+            await session.delete(detection)
+            status_code, error = storage_failure(outcome)
+            results[index] = DetectionBatchItemResult(
+                alert_api_id=item.alert_api_id,
+                status="failed",
+                status_code=status_code,
+                error=error,
+            )
+            continue
+        detection.bucket_key = outcome
+        stored_keys.append(outcome)
+        results[index] = DetectionBatchItemResult(
+            alert_api_id=item.alert_api_id,
+            status="created",
+            detection=DetectionRead.model_validate(detection, from_attributes=True),
+        )
+
+    try:
+        await session.commit()
+    except Exception:
+        delete_stored_images(stored_keys)
+        raise
+
+    return DetectionBatchResponse(sequence_id=payload.sequence_id, results=results)
+
+
+@router.post(
+    "/lookup",
+    summary="Find a sequence's detections by alert_api_id",
+)
+async def lookup_detections(
+    payload: DetectionLookup,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> DetectionLookupResponse:
+    """Return the detections of ``sequence_id`` among ``alert_api_ids``.
+
+    One indexed query (uq_detection_sequence_alert_api_id) answers which
+    frames of a sequence are already stored, so a re-import can reuse them
+    without paging through the sequence's detections. An unknown sequence
+    simply holds none.
+    """
+    query = (
+        select(Detection)
+        .where(
+            Detection.sequence_id == payload.sequence_id,
+            Detection.alert_api_id.in_(set(payload.alert_api_ids)),
+        )
+        .order_by(asc(Detection.alert_api_id))
+    )
+    stored = (await session.execute(query)).scalars().all()
+    return DetectionLookupResponse(
+        sequence_id=payload.sequence_id,
+        detections=[
+            DetectionRead.model_validate(detection, from_attributes=True)
+            for detection in stored
+        ],
+    )
+
+
 @router.get("/{detection_id}")
 async def get_detection(
     detection_id: int = Path(..., ge=0),
@@ -303,6 +464,9 @@ async def get_detection_url(
 @router.get("/")
 async def list_detections(
     sequence_id: Optional[int] = Query(None, description="Filter by sequence ID"),
+    alert_api_id: Optional[List[int]] = Query(
+        None, description="Filter by alert API detection ID (repeatable)"
+    ),
     order_by: OrderByField = Query(
         OrderByField.created_at, description="Order by field"
     ),
@@ -317,6 +481,9 @@ async def list_detections(
     List detections with filtering, pagination and ordering.
 
     - **sequence_id**: Filter detections by sequence ID
+    - **alert_api_id**: Filter detections by alert API detection ID; repeat
+      it to match any of several (with sequence_id, served by the
+      uq_detection_sequence_alert_api_id index)
     - **order_by**: Order by created_at or recorded_at (default: created_at)
     - **order_direction**: asc or desc (default: desc)
     - **page**: Page number (default: 1)
@@ -328,6 +495,8 @@ async def list_detections(
     # Apply filtering
     if sequence_id is not None:
         query = query.where(Detection.sequence_id == sequence_id)
+    if alert_api_id:
+        query = query.where(Detection.alert_api_id.in_(alert_api_id))
 
     # Apply ordering
     order_field = getattr(Detection, order_by.value)
@@ -1,17 +1,35 @@
 # app/api/api_v1/endpoints/export.py
 
 from datetime import datetime
-from typing import Dict, List, Literal, Optional, Tuple
+from typing import AsyncIterator, Dict, List, Literal, NamedTuple, Optional, Tuple
+from typing import Sequence as Sequence_
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import ARRAY, String, and_, cast, func, or_, select, tuple_
+from sqlalchemy import (
+    ARRAY,
+    BigInteger,
+    Row,
+    Select,
+    String,
+    Text,
+    and_,
+    cast,
+    func,
+    or_,
+    select,
+    tuple_,
+)
+from sqlalchemy.ext.asyncio import AsyncResult
+from sqlalchemy.sql.elements import ColumnElement
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.dependencies import get_current_user
-from app.db import get_session
+from app.db import engine, get_session
 from app.services.alert_skip import alert_skip_exists_clause
 from app.models import (
+    AlertChange,
     Detection,
     DetectionAnnotation,
     FalsePositiveType,
@@ -84,6 +102,23 @@ class AlertExportPage(BaseModel):
     next_cursor: Optional[str] = None
 
 
+class AlertKey(BaseModel):
+    source_api: SourceApi
+    platform_alert_id: int
+
+
+class AlertChangesPage(BaseModel):
+    # Changed alerts that currently pass the export gate, in full.
+    items: List[AlertExportItem]
+    # Changed alerts that no longer export (reopened, skipped, a lane added
+    # or deleted): consumers holding an earlier copy should drop it.
+    withdrawn: List[AlertKey]
+    next_cursor: Optional[str] = None
+    # Pass as `since` on the next sync, once next_cursor is null. Fixed for
+    # the whole pull: it is the snapshot horizon of its first page.
+    sync_token: int
+
+
 def _parse_cursor(cursor: str) -> Tuple[SourceApi, int]:
     source_str, sep, id_str = cursor.partition(":")
     try:
@@ -97,6 +132,22 @@ def _parse_cursor(cursor: str) -> Tuple[SourceApi, int]:
         )
 
 
+def _parse_changes_cursor(cursor: str) -> Tuple[int, int, SourceApi, int]:
+    token, _, rest = cursor.partition(":")
+    xid, _, key = rest.partition(":")
+    try:
+        source_api, platform_alert_id = _parse_cursor(key)
+        return int(token), int(xid), source_api, platform_alert_id
+    except (ValueError, HTTPException):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=(
+                "Malformed cursor, expected "
+                "'<sync_token>:<change_xid>:<source_api>:<platform_alert_id>'"
+            ),
+        )
+
+
 def _smoke_lane_boxes(det_ann: Optional[DetectionAnnotation]) -> List[BoxExport]:
     """Boxes for a smoke lane frame come from its detection annotation."""
     if det_ann is None:
@@ -131,67 +182,179 @@ def _fp_lane_bboxes_by_detection(
     return by_detection
 
 
-@router.get(
-    "/alerts",
-    response_model=AlertExportPage,
-    summary="Export annotated alerts",
-    description=(
-        "Alert-centric export of finished annotation work for ML training. "
-        "Only alerts whose every lane is at stage annotated are returned; "
-        "unsure lanes are omitted. Keyset-paginated via cursor."
-    ),
-)
-async def export_alerts(
-    cursor: Optional[str] = Query(
-        None,
-        description="Resume token from a previous page's next_cursor",
-    ),
-    limit: int = Query(100, ge=1, le=500, description="Maximum alerts per page"),
-    source_api: Optional[SourceApi] = Query(None, description="Filter by source API"),
-    organisation_id: Optional[int] = Query(
-        None, description="Filter by organisation id"
-    ),
-    organisation_name: Optional[str] = Query(
-        None, description="Filter by organisation name exact match"
-    ),
-    camera_id: Optional[int] = Query(None, description="Filter by camera id"),
-    camera_name: Optional[str] = Query(
-        None, description="Filter by camera name exact match"
-    ),
-    recorded_at_gte: Optional[datetime] = Query(
-        None, description="Alert recorded_at greater or equal to this date"
-    ),
-    recorded_at_lte: Optional[datetime] = Query(
-        None, description="Alert recorded_at less or equal to this date"
-    ),
-    annotation_updated_gte: Optional[datetime] = Query(
-        None,
-        description=(
-            "Incremental-sync watermark: alerts whose last_annotated_at is "
-            "greater or equal to this date. Covers annotation work only — a "
-            "temporal-score refresh writes no annotation row, so scores "
-            "backfilled onto already-annotated alerts do NOT move this "
-            "watermark and need a full pull to appear."
-        ),
-    ),
-    smoke_types: Optional[List[SmokeType]] = Query(
-        None,
-        description="Keep alerts with at least one lane containing any of these smoke types",
-    ),
-    false_positive_types: Optional[List[FalsePositiveType]] = Query(
-        None,
-        description="Keep alerts with at least one lane containing any of these false positive types",
-    ),
-    session: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user),
-) -> AlertExportPage:
+class _AlertRuns:
+    """Reads a streamed result ordered by alert key one alert at a time.
+
+    Rows must carry ``source_api``/``platform_alert_id`` and come in the same
+    order as the page query, so taking the run that matches each page row in
+    turn consumes the whole stream. Only the current alert's rows are held.
+    """
+
+    def __init__(self, result: AsyncResult) -> None:
+        self._rows = result.__aiter__()
+        self._head: Optional[Row] = None
+        self._exhausted = False
+
+    async def take(self, key: Tuple[SourceApi, int]) -> List[Row]:
+        run: List[Row] = []
+        while True:
+            if self._head is None:
+                if self._exhausted:
+                    return run
+                try:
+                    self._head = await self._rows.__anext__()
+                except StopAsyncIteration:
+                    self._exhausted = True
+                    return run
+            if (self._head.source_api, self._head.platform_alert_id) != key:
+                return run
+            run.append(self._head)
+            self._head = None
+
+
+async def _hydrate_alerts(
+    session: AsyncSession, page_rows: Sequence_[Row]
+) -> AsyncIterator[AlertExportItem]:
+    """Yield the export item of each page row, in page order.
+
+    Lanes and frames are read through server-side cursors ordered like the
+    page query, so only one alert's rows are materialized at a time and the
+    first item is ready as soon as its rows arrive.
+    """
+    if not page_rows:
+        return
+    keys = [(row.source_api, row.platform_alert_id) for row in page_rows]
+    alert_key = (Sequence.source_api, Sequence.platform_alert_id)
+
+    lanes = _AlertRuns(
+        await session.stream(
+            select(*alert_key, Sequence, SequenceAnnotation)
+            .join(SequenceAnnotation, SequenceAnnotation.sequence_id == Sequence.id)
+            .where(tuple_(*alert_key).in_(keys))
+            .where(SequenceAnnotation.is_unsure.is_not(True))
+            .order_by(*alert_key, Sequence.id)
+        )
+    )
+    frames = _AlertRuns(
+        await session.stream(
+            select(*alert_key, Detection, DetectionAnnotation)
+            .join(Sequence, Sequence.id == Detection.sequence_id)
+            .join(SequenceAnnotation, SequenceAnnotation.sequence_id == Sequence.id)
+            .outerjoin(
+                DetectionAnnotation, DetectionAnnotation.detection_id == Detection.id
+            )
+            .where(tuple_(*alert_key).in_(keys))
+            .where(SequenceAnnotation.is_unsure.is_not(True))
+            .order_by(
+                *alert_key, Detection.sequence_id, Detection.recorded_at, Detection.id
+            )
+        )
+    )
+    bucket = s3_service.get_bucket(s3_service.resolve_bucket_name())
+
+    for row in page_rows:
+        key = (row.source_api, row.platform_alert_id)
+        # Both runs are taken even for a skipped alert, or the streams would
+        # stall on its rows.
+        lane_rows = await lanes.take(key)
+        dets_by_sequence: Dict[
+            int, List[Tuple[Detection, Optional[DetectionAnnotation]]]
+        ] = {}
+        for frame in await frames.take(key):
+            dets_by_sequence.setdefault(frame.Detection.sequence_id, []).append(
+                (frame.Detection, frame.DetectionAnnotation)
+            )
+        if not lane_rows:
+            continue
+        first_seq = lane_rows[0].Sequence
+
+        objects: List[ObjectExport] = []
+        for lane in lane_rows:
+            seq, seq_ann = lane.Sequence, lane.SequenceAnnotation
+            is_smoke_lane = bool(seq_ann.has_smoke)
+            fp_bboxes = {} if is_smoke_lane else _fp_lane_bboxes_by_detection(seq_ann)
+            lane_fp_types = [
+                FalsePositiveType(v) for v in (seq_ann.false_positive_types or [])
+            ]
+
+            lane_frames: List[FrameExport] = []
+            for det, det_ann in dets_by_sequence.get(seq.id, []):
+                if is_smoke_lane:
+                    boxes = _smoke_lane_boxes(det_ann)
+                else:
+                    boxes = [
+                        BoxExport(
+                            xyxyn=xyxyn,
+                            smoke_type=None,
+                            false_positive_types=lane_fp_types,
+                            origin="engine",
+                        )
+                        for xyxyn in fp_bboxes.get(det.id, [])
+                    ]
+                lane_frames.append(
+                    FrameExport(
+                        detection_id=det.id,
+                        recorded_at=det.recorded_at,
+                        bucket_key=det.bucket_key,
+                        image_url=(
+                            bucket.generate_presigned_url(det.bucket_key)
+                            if det.bucket_key
+                            else None
+                        ),
+                        boxes=boxes,
+                    )
+                )
+
+            objects.append(
+                ObjectExport(
+                    sequence_id=seq.id,
+                    record_kind="smoke" if is_smoke_lane else "false_positive",
+                    smoke_types=[SmokeType(v) for v in (seq_ann.smoke_types or [])],
+                    false_positive_types=lane_fp_types,
+                    frames=lane_frames,
+                )
+            )
+
+        yield AlertExportItem(
+            source_api=row.source_api,
+            platform_alert_id=row.platform_alert_id,
+            camera_id=first_seq.camera_id,
+            camera_name=first_seq.camera_name,
+            organisation_id=first_seq.organisation_id,
+            organisation_name=first_seq.organisation_name,
+            lat=first_seq.lat,
+            lon=first_seq.lon,
+            azimuth=first_seq.azimuth,
+            recorded_at=row.recorded_at,
+            last_annotated_at=row.last_annotated_at,
+            temporal_model_score=row.temporal_model_score,
+            temporal_model_version=row.temporal_model_version,
+            temporal_api_version=row.temporal_api_version,
+            objects=objects,
+        )
+
+
+class _ExportGate(NamedTuple):
+    """The exported-alert page query and the aggregates its filters need."""
+
+    stmt: Select
+    exported_lane: ColumnElement[bool]
+    alert_recorded_at: ColumnElement[datetime]
+    last_annotated_at: ColumnElement[datetime]
+
+
+def _export_gate(
+    keys: Optional[List[Tuple[SourceApi, int]]] = None,
+) -> _ExportGate:
+    """One row per exportable alert in cursor order, optionally only among
+    ``keys``."""
     # Per-lane "last annotated" moment: sequence annotation write or any
     # detection annotation write, whichever is later. updated_at is only set
     # on updates, so fall back to created_at for never-updated annotations.
     # Pre-aggregated join rather than a correlated subquery: watermark-filtered
     # (incremental) pulls aggregate every candidate group, so per-lane-row
     # subquery execution would dominate on large tables.
-    det_ann_agg = (
+    det_ann_query = (
         select(
             Detection.sequence_id.label("sequence_id"),
             func.max(
@@ -202,8 +365,14 @@ async def export_alerts(
         )
         .join(DetectionAnnotation, DetectionAnnotation.detection_id == Detection.id)
         .group_by(Detection.sequence_id)
-        .subquery()
     )
+    if keys is not None:
+        # Restricting the outer query alone would still aggregate every
+        # lane's detection annotations before the join.
+        det_ann_query = det_ann_query.join(
+            Sequence, Sequence.id == Detection.sequence_id
+        ).where(tuple_(Sequence.source_api, Sequence.platform_alert_id).in_(keys))
+    det_ann_agg = det_ann_query.subquery()
     lane_annotated_at = func.greatest(
         func.coalesce(SequenceAnnotation.updated_at, SequenceAnnotation.created_at),
         det_ann_agg.c.last_written_at,
@@ -251,20 +420,130 @@ async def export_alerts(
         .having(annotated_lanes == total_lanes)
         .having(exported_lanes > 0)
         .order_by(Sequence.source_api, Sequence.platform_alert_id)
-        .limit(limit)
     )
-
-    if cursor is not None:
-        cursor_source, cursor_id = _parse_cursor(cursor)
+    if keys is not None:
         stmt = stmt.where(
-            or_(
-                Sequence.source_api > cursor_source,
-                and_(
-                    Sequence.source_api == cursor_source,
-                    Sequence.platform_alert_id > cursor_id,
-                ),
-            )
+            tuple_(Sequence.source_api, Sequence.platform_alert_id).in_(keys)
+        )
+    return _ExportGate(stmt, exported_lane, alert_recorded_at, last_annotated_at)
+
+
+def _after_cursor(stmt: Select, after: Tuple[SourceApi, int]) -> Select:
+    cursor_source, cursor_id = after
+    return stmt.where(
+        or_(
+            Sequence.source_api > cursor_source,
+            and_(
+                Sequence.source_api == cursor_source,
+                Sequence.platform_alert_id > cursor_id,
+            ),
         )
+    )
+
+
+async def _stream_ndjson(
+    page_stmt: Select,
+    after: Optional[Tuple[SourceApi, int]],
+    limit: int,
+) -> AsyncIterator[str]:
+    """Walk the page query from ``after`` to the end, one alert per line.
+
+    Owns its session: the body streams after the endpoint has returned, by
+    which time the request's get_session dependency has already closed its
+    session, and a connection checked out through that one would never go
+    back to the pool.
+    """
+    session = AsyncSession(engine, expire_on_commit=False, autoflush=False)
+    try:
+        while True:
+            stmt = page_stmt if after is None else _after_cursor(page_stmt, after)
+            page_rows = (await session.execute(stmt)).all()
+            async for item in _hydrate_alerts(session, page_rows):
+                yield item.model_dump_json() + "\n"
+            if len(page_rows) < limit:
+                return
+            after = (page_rows[-1].source_api, page_rows[-1].platform_alert_id)
+    finally:
+        await session.close()
+
+
+@router.get(
+    "/alerts",
+    response_model=AlertExportPage,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+    summary="Export annotated alerts",
+    description=(
+        "Alert-centric export of finished annotation work for ML training. "
+        "Only alerts whose every lane is at stage annotated are returned; "
+        "unsure lanes are omitted. Keyset-paginated via cursor. "
+        "With format=ndjson the response streams every matching alert after "
+        "the cursor, one AlertExportItem per line, instead of a single page."
+    ),
+)
+async def export_alerts(
+    cursor: Optional[str] = Query(
+        None,
+        description="Resume token from a previous page's next_cursor",
+    ),
+    limit: int = Query(
+        100,
+        ge=1,
+        le=500,
+        description=(
+            "Maximum alerts per page. With format=ndjson, the number of "
+            "alerts gated per round trip while streaming"
+        ),
+    ),
+    export_format: Literal["json", "ndjson"] = Query(
+        "json",
+        alias="format",
+        description=(
+            "json returns one page; ndjson streams the whole result set from "
+            "the cursor on. A line's '<source_api>:<platform_alert_id>' is a "
+            "valid cursor to resume an interrupted stream."
+        ),
+    ),
+    source_api: Optional[SourceApi] = Query(None, description="Filter by source API"),
+    organisation_id: Optional[int] = Query(
+        None, description="Filter by organisation id"
+    ),
+    organisation_name: Optional[str] = Query(
+        None, description="Filter by organisation name exact match"
+    ),
+    camera_id: Optional[int] = Query(None, description="Filter by camera id"),
+    camera_name: Optional[str] = Query(
+        None, description="Filter by camera name exact match"
+    ),
+    recorded_at_gte: Optional[datetime] = Query(
+        None, description="Alert recorded_at greater or equal to this date"
+    ),
+    recorded_at_lte: Optional[datetime] = Query(
+        None, description="Alert recorded_at less or equal to this date"
+    ),
+    annotation_updated_gte: Optional[datetime] = Query(
+        None,
+        description=(
+            "Incremental-sync watermark: alerts whose last_annotated_at is "
+            "greater or equal to this date. Covers annotation work only — a "
+            "temporal-score refresh writes no annotation row, so scores "
+            "backfilled onto already-annotated alerts do NOT move this "
+            "watermark and need a full pull to appear. GET "
+            "/export/alerts/changes tracks those too."
+        ),
+    ),
+    smoke_types: Optional[List[SmokeType]] = Query(
+        None,
+        description="Keep alerts with at least one lane containing any of these smoke types",
+    ),
+    false_positive_types: Optional[List[FalsePositiveType]] = Query(
+        None,
+        description="Keep alerts with at least one lane containing any of these false positive types",
+    ),
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> AlertExportPage | StreamingResponse:
+    stmt, exported_lane, alert_recorded_at, last_annotated_at = _export_gate()
+    stmt = stmt.limit(limit)
 
     # Lane-row WHERE is equivalent to alert-level filtering only because all
     # lanes of an alert share camera/org/source by import construction; it
@@ -312,127 +591,113 @@ async def export_alerts(
             ).is_(True)
         )
 
-    page_rows = (await session.execute(stmt)).all()
-    if not page_rows:
-        return AlertExportPage(items=[], next_cursor=None)
-
-    keys = [(row.source_api, row.platform_alert_id) for row in page_rows]
-
-    lane_rows = (
-        await session.execute(
-            select(Sequence, SequenceAnnotation)
-            .join(SequenceAnnotation, SequenceAnnotation.sequence_id == Sequence.id)
-            .where(tuple_(Sequence.source_api, Sequence.platform_alert_id).in_(keys))
-            .where(SequenceAnnotation.is_unsure.is_not(True))
-            .order_by(Sequence.id)
+    after = _parse_cursor(cursor) if cursor is not None else None
+    if export_format == "ndjson":
+        return StreamingResponse(
+            _stream_ndjson(stmt, after, limit),
+            media_type="application/x-ndjson",
         )
-    ).all()
 
-    seq_ids = [seq.id for seq, _ in lane_rows]
-    det_rows = (
-        await session.execute(
-            select(Detection, DetectionAnnotation)
-            .outerjoin(
-                DetectionAnnotation, DetectionAnnotation.detection_id == Detection.id
-            )
-            .where(Detection.sequence_id.in_(seq_ids))
-            .order_by(Detection.sequence_id, Detection.recorded_at, Detection.id)
-        )
+    page_rows = (
+        await session.execute(stmt if after is None else _after_cursor(stmt, after))
     ).all()
+    items = [item async for item in _hydrate_alerts(session, page_rows)]
 
-    dets_by_sequence: Dict[
-        int, List[Tuple[Detection, Optional[DetectionAnnotation]]]
-    ] = {}
-    for det, det_ann in det_rows:
-        dets_by_sequence.setdefault(det.sequence_id, []).append((det, det_ann))
-
-    lanes_by_key: Dict[tuple, List[Tuple[Sequence, SequenceAnnotation]]] = {}
-    for seq, seq_ann in lane_rows:
-        lanes_by_key.setdefault((seq.source_api, seq.platform_alert_id), []).append(
-            (seq, seq_ann)
-        )
-
-    bucket = s3_service.get_bucket(s3_service.resolve_bucket_name())
+    # Advance the cursor from the page query, not the hydrated items: a row
+    # whose lanes vanished between the two statements is skipped from items
+    # but must still move the cursor forward.
+    next_cursor = None
+    if len(page_rows) == limit:
+        last_row = page_rows[-1]
+        next_cursor = f"{last_row.source_api.value}:{last_row.platform_alert_id}"
 
-    items: List[AlertExportItem] = []
-    for row in page_rows:
-        lanes = lanes_by_key.get((row.source_api, row.platform_alert_id), [])
-        if not lanes:
-            continue
-        first_seq = lanes[0][0]
+    return AlertExportPage(items=items, next_cursor=next_cursor)
 
-        objects: List[ObjectExport] = []
-        for seq, seq_ann in lanes:
-            is_smoke_lane = bool(seq_ann.has_smoke)
-            fp_bboxes = {} if is_smoke_lane else _fp_lane_bboxes_by_detection(seq_ann)
-            lane_fp_types = [
-                FalsePositiveType(v) for v in (seq_ann.false_positive_types or [])
-            ]
 
-            frames: List[FrameExport] = []
-            for det, det_ann in dets_by_sequence.get(seq.id, []):
-                if is_smoke_lane:
-                    boxes = _smoke_lane_boxes(det_ann)
-                else:
-                    boxes = [
-                        BoxExport(
-                            xyxyn=xyxyn,
-                            smoke_type=None,
-                            false_positive_types=lane_fp_types,
-                            origin="engine",
-                        )
-                        for xyxyn in fp_bboxes.get(det.id, [])
-                    ]
-                frames.append(
-                    FrameExport(
-                        detection_id=det.id,
-                        recorded_at=det.recorded_at,
-                        bucket_key=det.bucket_key,
-                        image_url=(
-                            bucket.generate_presigned_url(det.bucket_key)
-                            if det.bucket_key
-                            else None
-                        ),
-                        boxes=boxes,
+@router.get(
+    "/alerts/changes",
+    response_model=AlertChangesPage,
+    summary="Export alerts changed since a sync token",
+    description=(
+        "Incremental sync read from the alert change log: every alert whose "
+        "lanes, frames, annotations or skip state changed since `since`, "
+        "returned in full when it exports and listed under withdrawn when it "
+        "no longer does. Cost follows the number of changes, not the history. "
+        "Page with next_cursor; when it is null, keep sync_token for the next "
+        "run. Omit `since` for a first full sync."
+    ),
+)
+async def export_alert_changes(
+    since: int = Query(
+        0, ge=0, description="sync_token returned by the previous complete sync"
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Resume token from a previous page's next_cursor; overrides since",
+    ),
+    limit: int = Query(100, ge=1, le=500, description="Maximum changes per page"),
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> AlertChangesPage:
+    changes = select(
+        AlertChange.source_api, AlertChange.platform_alert_id, AlertChange.change_xid
+    )
+    if cursor is not None:
+        sync_token, xid, cursor_source, cursor_id = _parse_changes_cursor(cursor)
+        changes = changes.where(
+            tuple_(
+                AlertChange.change_xid,
+                AlertChange.source_api,
+                AlertChange.platform_alert_id,
+            )
+            > (xid, cursor_source, cursor_id)
+        )
+    else:
+        # Oldest transaction still running when this pull starts: anything it
+        # or a later transaction writes is >= the token, so the next sync
+        # sees it even if it commits after this pull has read past it.
+        sync_token = (
+            await session.execute(
+                select(
+                    cast(
+                        cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text),
+                        BigInteger,
                     )
                 )
-
-            objects.append(
-                ObjectExport(
-                    sequence_id=seq.id,
-                    record_kind="smoke" if is_smoke_lane else "false_positive",
-                    smoke_types=[SmokeType(v) for v in (seq_ann.smoke_types or [])],
-                    false_positive_types=lane_fp_types,
-                    frames=frames,
-                )
             )
+        ).scalar_one()
+        changes = changes.where(AlertChange.change_xid >= since)
 
-        items.append(
-            AlertExportItem(
-                source_api=row.source_api,
-                platform_alert_id=row.platform_alert_id,
-                camera_id=first_seq.camera_id,
-                camera_name=first_seq.camera_name,
-                organisation_id=first_seq.organisation_id,
-                organisation_name=first_seq.organisation_name,
-                lat=first_seq.lat,
-                lon=first_seq.lon,
-                azimuth=first_seq.azimuth,
-                recorded_at=row.recorded_at,
-                last_annotated_at=row.last_annotated_at,
-                temporal_model_score=row.temporal_model_score,
-                temporal_model_version=row.temporal_model_version,
-                temporal_api_version=row.temporal_api_version,
-                objects=objects,
-            )
+    changed = (
+        await session.execute(
+            changes.order_by(
+                AlertChange.change_xid,
+                AlertChange.source_api,
+                AlertChange.platform_alert_id,
+            ).limit(limit)
         )
+    ).all()
+
+    keys = [(row.source_api, row.platform_alert_id) for row in changed]
+    page_rows = (await session.execute(_export_gate(keys).stmt)).all() if keys else []
+    items = [item async for item in _hydrate_alerts(session, page_rows)]
+    exported = {(item.source_api, item.platform_alert_id) for item in items}
 
-    # Advance the cursor from the page query, not the hydrated items: a row
-    # whose lanes vanished between the two statements is skipped from items
-    # but must still move the cursor forward.
     next_cursor = None
-    if len(page_rows) == limit:
-        last_row = page_rows[-1]
-        next_cursor = f"{last_row.source_api.value}:{last_row.platform_alert_id}"
+    if len(changed) == limit:
+        last = changed[-1]
+        next_cursor = (
+            f"{sync_token}:{last.change_xid}:"
+            f"{last.source_api.value}:{last.platform_alert_id}"
+        )
 
-    return AlertExportPage(items=items, next_cursor=next_cursor)
+    return AlertChangesPage(
+        items=items,
+        withdrawn=[
+            AlertKey(source_api=source, platform_alert_id=alert_id)
+            for source, alert_id in keys
+            if (source, alert_id) not in exported
+        ],
+        next_cursor=next_cursor,
+        sync_token=sync_token,
+    )
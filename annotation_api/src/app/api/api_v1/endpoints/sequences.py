@@ -3,7 +3,7 @@
 import json
 from datetime import datetime, UTC
 from enum import Enum
-from typing import List, Literal, Optional
+from typing import List, Literal, Optional, Tuple
 
 from fastapi import (
     APIRouter,
@@ -29,7 +29,12 @@ from sqlalchemy import (
     or_,
     cast,
     tuple_,
+    update,
+    values,
+    column,
     ARRAY,
+    BigInteger,
+    Float,
     String,
 )
 from sqlalchemy.exc import IntegrityError
@@ -83,7 +88,13 @@ from app.schemas.sequence import (
     MaterializeFrameRequest,
     QueueOrderByField,
     SequenceCreate,
+    SequenceLookup,
+    SequenceLookupItem,
+    SequenceLookupResponse,
     SequenceRead,
+    SequenceTemporalScoreBatch,
+    SequenceTemporalScoreBatchResponse,
+    SequenceTemporalScoreResult,
     SequenceTemporalScoreUpdate,
 )
 from app.services.alert_identity import ALERT_ID_BASE, resolve_platform_alert_id
@@ -250,6 +261,119 @@ async def update_sequence_temporal_score(
     return existing
 
 
+@router.patch("/temporal-score/batch", status_code=status.HTTP_200_OK)
+async def update_sequence_temporal_scores(
+    payload: SequenceTemporalScoreBatch,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> SequenceTemporalScoreBatchResponse:
+    """Refresh many sequences' temporal-model columns at once.
+
+    The bulk counterpart of PATCH /temporal-score, with the same semantics
+    per row (all three values overwritten, None included), applied with one
+    UPDATE ... FROM (VALUES ...) and one commit. Results come back per row,
+    in request order: ``updated`` with the sequence id, ``not_found`` when
+    no sequence has that (source_api, alert_api_id), or ``duplicate`` for a
+    key already present earlier in the batch.
+    """
+    keys: set[Tuple[SourceApi, int]] = set()
+    rows = []
+    for update_row in payload.updates:
+        key = (update_row.source_api, update_row.alert_api_id)
+        if key in keys:
+            continue
+        keys.add(key)
+        rows.append(
+            (
+                update_row.source_api,
+                update_row.alert_api_id,
+                update_row.temporal_model_score,
+                update_row.temporal_model_version,
+                update_row.temporal_api_version,
+            )
+        )
+
+    refreshes = values(
+        column("source_api", Sequence.__table__.c.source_api.type),
+        column("alert_api_id", BigInteger),
+        column("temporal_model_score", Float),
+        column("temporal_model_version", String),
+        column("temporal_api_version", String),
+        name="refreshes",
+    ).data(rows)
+    updated = await session.execute(
+        update(Sequence)
+        .where(Sequence.source_api == refreshes.c.source_api)
+        .where(Sequence.alert_api_id == refreshes.c.alert_api_id)
+        .values(
+            temporal_model_score=refreshes.c.temporal_model_score,
+            temporal_model_version=refreshes.c.temporal_model_version,
+            temporal_api_version=refreshes.c.temporal_api_version,
+        )
+        .returning(Sequence.id, Sequence.source_api, Sequence.alert_api_id)
+    )
+    sequence_ids = {(row.source_api, row.alert_api_id): row.id for row in updated.all()}
+    await session.commit()
+
+    results: List[SequenceTemporalScoreResult] = []
+    seen: set[Tuple[SourceApi, int]] = set()
+    for update_row in payload.updates:
+        key = (update_row.source_api, update_row.alert_api_id)
+        if key in seen:
+            row_status = "duplicate"
+        else:
+            row_status = "updated" if key in sequence_ids else "not_found"
+            seen.add(key)
+        results.append(
+            SequenceTemporalScoreResult(
+                source_api=update_row.source_api,
+                alert_api_id=update_row.alert_api_id,
+                status=row_status,
+                sequence_id=sequence_ids.get(key) if row_status == "updated" else None,
+            )
+        )
+    return SequenceTemporalScoreBatchResponse(results=results)
+
+
+@router.post("/lookup", status_code=status.HTTP_200_OK)
+async def lookup_sequences(
+    payload: SequenceLookup,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> SequenceLookupResponse:
+    """Return the stored sequences among (source_api, alert_api_id) keys.
+
+    Lets a re-import work out up front which lanes to create and which
+    only need a temporal refresh, instead of posting each one to learn
+    from a 409. One indexed query (uq_sequence_alert_source) per source
+    API in the request.
+    """
+    alert_api_ids_by_source: dict[SourceApi, set[int]] = {}
+    for key in payload.sequences:
+        alert_api_ids_by_source.setdefault(key.source_api, set()).add(key.alert_api_id)
+
+    found: List[SequenceLookupItem] = []
+    for source_api, alert_api_ids in alert_api_ids_by_source.items():
+        stored = await session.execute(
+            select(
+                Sequence.id,
+                Sequence.source_api,
+                Sequence.alert_api_id,
+                Sequence.temporal_model_score,
+                Sequence.temporal_model_version,
+                Sequence.temporal_api_version,
+            )
+            .where(Sequence.source_api == source_api)
+            .where(Sequence.alert_api_id.in_(alert_api_ids))
+            .order_by(Sequence.alert_api_id)
+        )
+        found.extend(
+            SequenceLookupItem.model_validate(row, from_attributes=True)
+            for row in stored
+        )
+    return SequenceLookupResponse(sequences=found)
+
+
 @router.get("/")
 async def list_sequences(
     source_api: Optional[str] = Query(
@@ -6,6 +6,7 @@
 from fastapi import APIRouter
 
 from app.api.api_v1.endpoints import (
+    alerts,
     auto_annotate,
     cameras,
     detection_annotations,
@@ -35,6 +36,7 @@ api_router.include_router(
     tags=["detection annotations"],
 )
 api_router.include_router(sequences.router, prefix="/sequences", tags=["sequences"])
+api_router.include_router(alerts.router, prefix="/alerts", tags=["alerts"])
 api_router.include_router(
     sequence_annotations.router,
     prefix="/annotations/sequences",
@@ -7,7 +7,7 @@ using the requests library for HTTP communication.
 
 import json
 import threading
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 import requests
 from requests.adapters import HTTPAdapter, Retry
@@ -73,10 +73,15 @@ __all__ = [
     "get_sequence",
     "list_sequences",
     "delete_sequence",
+    "lookup_sequences",
+    "update_sequence_temporal_scores",
     "skip_alert",
+    "import_alert",
     "create_detection",
+    "create_detections_batch",
     "get_detection",
     "list_detections",
+    "lookup_detections",
     "get_detection_url",
     "delete_detection",
     "create_detection_annotation",
@@ -499,6 +504,106 @@ def skip_alert(
     return _handle_response(response, operation=operation)
 
 
+def update_sequence_temporal_scores(
+    base_url: str, auth_token: str, updates: List[Dict]
+) -> List[Dict]:
+    """
+    Refresh many sequences' temporal-model columns in one request.
+
+    Args:
+        base_url: Base URL of the annotation API
+        auth_token: JWT authentication token
+        updates: update_sequence_temporal_score payloads (at most 5000)
+
+    Returns:
+        One result per update, in request order, whose ``status`` is
+        ``updated`` (with ``sequence_id``), ``not_found`` or ``duplicate``
+
+    Raises:
+        ValidationError: If an update is invalid
+        AnnotationAPIError: For other API errors
+    """
+    url = f"{base_url.rstrip('/')}/api/v1/sequences/temporal-score/batch"
+    operation = f"refresh {len(updates)} temporal scores"
+    response = _make_request(
+        "PATCH", url, auth_token, operation=operation, json={"updates": updates}
+    )
+    return _handle_response(response, operation=operation)["results"]
+
+
+def lookup_sequences(base_url: str, auth_token: str, keys: List[Dict]) -> List[Dict]:
+    """
+    Find which sequences already exist, by natural key.
+
+    Args:
+        base_url: Base URL of the annotation API
+        auth_token: JWT authentication token
+        keys: Dictionaries with ``source_api`` and ``alert_api_id`` (at most
+            1000 per request)
+
+    Returns:
+        The stored sequences among them, each with its ``id`` and temporal
+        columns; absent keys have no sequence
+
+    Raises:
+        AnnotationAPIError: If the request fails
+    """
+    url = f"{base_url.rstrip('/')}/api/v1/sequences/lookup"
+    operation = f"look up {len(keys)} sequences"
+    response = _make_request(
+        "POST", url, auth_token, operation=operation, json={"sequences": keys}
+    )
+    return _handle_response(response, operation=operation)["sequences"]
+
+
+def import_alert(
+    base_url: str,
+    auth_token: str,
+    source_api: str,
+    platform_alert_id: int,
+    lanes: List[Dict],
+) -> Dict:
+    """
+    Import every object-split lane of one alert in a single transaction.
+
+    Each lane holds its ``sequence`` (create_sequence fields), its
+    ``detections`` (create_detections_batch items) and the seed
+    ``annotation`` it enters the queue with, whose bboxes reference the
+    detections by alert_api_id. Nothing is written unless everything is.
+
+    Args:
+        base_url: Base URL of the annotation API
+        auth_token: JWT authentication token
+        source_api: Source API of the alert (e.g., "pyronear_french")
+        platform_alert_id: Platform alert grouping id
+        lanes: The alert's lanes
+
+    Returns:
+        Dictionary whose ``status`` is ``created``, or ``exists`` when the
+        alert already had lanes (nothing was written); ``lanes`` lists the
+        stored lanes with their sequence, annotation and detection ids
+
+    Raises:
+        ValidationError: If the payload is invalid or an image is unusable
+        NotFoundError: If the server predates the endpoint
+        AnnotationAPIError: For other API errors
+    """
+    url = f"{base_url.rstrip('/')}/api/v1/alerts/import"
+    operation = f"import alert {source_api}/{platform_alert_id}"
+    response = _make_request(
+        "POST",
+        url,
+        auth_token,
+        operation=operation,
+        json={
+            "source_api": source_api,
+            "platform_alert_id": platform_alert_id,
+            "lanes": lanes,
+        },
+    )
+    return _handle_response(response, operation=operation)
+
+
 # -------------------- DETECTION OPERATIONS --------------------
 
 
@@ -643,6 +748,48 @@ def create_detection_from_bucket_key(
     return _handle_response(response, operation=operation)
 
 
+def create_detections_batch(
+    base_url: str,
+    auth_token: str,
+    sequence_id: int,
+    detections: List[Dict],
+) -> Dict:
+    """
+    Create a sequence's detections in one request.
+
+    Each item carries the create_detection_from_bucket_key/_from_url fields
+    (without sequence_id) plus exactly one of ``source_key`` or
+    ``source_url``. The server runs the storage operations concurrently and
+    commits all rows together.
+
+    Args:
+        base_url: Base URL of the annotation API
+        auth_token: JWT authentication token
+        sequence_id: Sequence ID in the annotation API
+        detections: Detection items, in the order results are wanted
+
+    Returns:
+        Dictionary with ``results``: one entry per item, in request order,
+        whose ``status`` is ``created``, ``exists`` (``detection`` holds the
+        stored row) or ``failed`` (``status_code`` and ``error`` say why)
+
+    Raises:
+        ValidationError: If an item is invalid
+        NotFoundError: If the sequence does not exist
+        AnnotationAPIError: For other API errors
+    """
+    url = f"{base_url.rstrip('/')}/api/v1/detections/batch"
+    operation = f"create {len(detections)} detections in sequence {sequence_id}"
+    response = _make_request(
+        "POST",
+        url,
+        auth_token,
+        operation=operation,
+        json={"sequence_id": sequence_id, "detections": detections},
+    )
+    return _handle_response(response, operation=operation)
+
+
 def get_detection(base_url: str, auth_token: str, detection_id: int) -> Dict:
     """
     Get a specific detection by ID.
@@ -674,6 +821,7 @@ def list_detections(base_url: str, auth_token: str, **params) -> Dict:
         auth_token: JWT authentication token
         **params: Query parameters for filtering and pagination:
             - sequence_id: Filter by sequence ID
+            - alert_api_id: Filter by alert API detection ID (a list matches any)
             - order_by: Order by field (created_at, recorded_at)
             - order_direction: Order direction (asc, desc)
             - page: Page number (default: 1)
@@ -696,6 +844,36 @@ def list_detections(base_url: str, auth_token: str, **params) -> Dict:
     return _handle_response(response, operation=operation)
 
 
+def lookup_detections(
+    base_url: str, auth_token: str, sequence_id: int, alert_api_ids: List[int]
+) -> List[Dict]:
+    """
+    Find which of these alert_api_ids a sequence already holds.
+
+    Args:
+        base_url: Base URL of the annotation API
+        auth_token: JWT authentication token
+        sequence_id: Sequence ID in the annotation API
+        alert_api_ids: Alert API detection IDs to look for
+
+    Returns:
+        The stored detections among them; absent IDs are not stored
+
+    Raises:
+        AnnotationAPIError: If the request fails
+    """
+    url = f"{base_url.rstrip('/')}/api/v1/detections/lookup"
+    operation = f"look up {len(alert_api_ids)} detections in sequence {sequence_id}"
+    response = _make_request(
+        "POST",
+        url,
+        auth_token,
+        operation=operation,
+        json={"sequence_id": sequence_id, "alert_api_ids": alert_api_ids},
+    )
+    return _handle_response(response, operation=operation)["detections"]
+
+
 def get_detection_url(base_url: str, auth_token: str, detection_id: int) -> str:
     """
     Get a temporary URL for accessing a detection's image.
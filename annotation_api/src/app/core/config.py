@@ -11,6 +11,13 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 __all__ = ["settings"]
 
 
+def available_cpus() -> int:
+    """CPUs this process may run on (its affinity mask where supported)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
 class Settings(BaseSettings):
     # State
     PROJECT_NAME: str = "pyro-annotator - Annotation API"
@@ -88,6 +95,20 @@ class Settings(BaseSettings):
     S3_PROXY_URL: str = os.environ.get("S3_PROXY_URL", "")
     S3_URL_EXPIRATION: int = int(os.environ.get("S3_URL_EXPIRATION") or 24 * 3600)
     S3_BUCKET_NAME: str = os.environ.get("S3_BUCKET_NAME", "annotation-api")
+    # Uploads carry Content-MD5, so S3 itself rejects a corrupted body. Set to
+    # true for S3-compatible backends that ignore that header: each upload is
+    # then read back with a HEAD and its ETag compared instead (one more round
+    # trip per image).
+    S3_VERIFY_UPLOADS_WITH_HEAD: bool = (
+        os.environ.get("S3_VERIFY_UPLOADS_WITH_HEAD", "false").lower() == "true"
+    )
+
+    # Storage operations (S3 copies / source downloads) one POST
+    # /detections/batch or /alerts/import request runs at once. Each holds a threadpool slot
+    # for its blocking boto3 work, so keep it well under the threadpool size.
+    DETECTION_BATCH_STORAGE_CONCURRENCY: int = int(
+        os.environ.get("DETECTION_BATCH_STORAGE_CONCURRENCY", "8")
+    )
 
     # Platform (used to derive source bucket name for server-side S3 copies)
     PLATFORM_SERVER_NAME: str = os.environ.get(
@@ -110,6 +131,28 @@ class Settings(BaseSettings):
     AUTOANNOTATE_CONF: float = float(os.environ.get("AUTOANNOTATE_CONF", "0.01"))
     AUTOANNOTATE_IOU: float = float(os.environ.get("AUTOANNOTATE_IOU", "0.0"))
     AUTOANNOTATE_IMGSZ: int = int(os.environ.get("AUTOANNOTATE_IMGSZ", "1024"))
+    # Frames per ONNX session run. Each frame is a 3x1024x1024 float32 tensor
+    # (~12MB), so this bounds the worker's peak inference memory too.
+    AUTOANNOTATE_BATCH_SIZE: int = int(os.environ.get("AUTOANNOTATE_BATCH_SIZE", "8"))
+    # Threads downloading and decoding a lane's frames ahead of inference.
+    AUTOANNOTATE_PREFETCH_WORKERS: int = int(
+        os.environ.get("AUTOANNOTATE_PREFETCH_WORKERS", "4")
+    )
+    # Inference processes in the queue worker (see app.services.inference_pool).
+    # Above 1, the worker also runs that many auto-annotate jobs at once. Each
+    # process holds its own copy of the model, so lower it on a tight host.
+    AUTOANNOTATE_INFERENCE_PROCESSES: int = int(
+        os.environ.get("AUTOANNOTATE_INFERENCE_PROCESSES") or available_cpus()
+    )
+    # onnxruntime thread pools per process. 0 for intra-op splits the
+    # available CPUs evenly across the inference processes, so K processes
+    # never run more than one compute thread per core between them.
+    AUTOANNOTATE_INTRA_OP_THREADS: int = int(
+        os.environ.get("AUTOANNOTATE_INTRA_OP_THREADS", "0")
+    )
+    AUTOANNOTATE_INTER_OP_THREADS: int = int(
+        os.environ.get("AUTOANNOTATE_INTER_OP_THREADS", "1")
+    )
     # Clustering thresholds for the gap-fill anchor (mirror the retired file-based auto-annotate script):
     # aggregated engine boxes are clustered into persistent objects, then only
     # sensitive-model predictions overlapping an object are kept.
@@ -58,12 +58,9 @@ class SequenceAnnotationCRUD(
         # Remove duplicates while preserving order
         return list(dict.fromkeys(all_types))
 
-    async def create(
-        self, payload: SequenceAnnotationCreate, user_id: int
-    ) -> SequenceAnnotation:
-        """Create sequence annotation and record user contribution."""
-        # Create database model with derived values
-        annotation = SequenceAnnotation(
+    def build(self, payload: SequenceAnnotationCreate) -> SequenceAnnotation:
+        """The unsaved annotation row for a payload, derived fields filled in."""
+        return SequenceAnnotation(
             sequence_id=payload.sequence_id,
             has_smoke=self._derive_has_smoke(payload.annotation),
             has_false_positives=self._derive_has_false_positives(payload.annotation),
@@ -75,6 +72,12 @@ class SequenceAnnotationCRUD(
             processing_stage=payload.processing_stage,
         )
 
+    async def create(
+        self, payload: SequenceAnnotationCreate, user_id: int
+    ) -> SequenceAnnotation:
+        """Create sequence annotation and record user contribution."""
+        annotation = self.build(payload)
+
         self.session.add(annotation)
         await self.session.flush()  # Flush to get the ID
 
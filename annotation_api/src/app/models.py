@@ -16,7 +16,9 @@ from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, SQLModel
 
 __all__ = [
+    "AlertChange",
     "AlertSkip",
+    "AutoPredictionCache",
     "Detection",
     "DetectionAnnotation",
     "Sequence",
@@ -421,6 +423,46 @@ class Detection(SQLModel, table=True):
     others_bboxes: Optional[dict] = Field(default=None, sa_column=Column(JSONB))
 
 
+class AutoPredictionCache(SQLModel, table=True):
+    """Raw auto-annotate detector output for one stored image under one model
+    configuration, so a photo is only ever inferred once per configuration.
+
+    Keyed by ``image_key`` (see ``prediction_cache.image_key``): the part of a
+    detection's content-derived bucket key that sibling lanes of a
+    multi-object alert share for the same photo. Rows are the detector's boxes
+    before the lane-specific anchor filter, so every lane can reuse them. Not
+    tied to detections by FK -- a row outliving its detections is just an
+    unused cache entry.
+    """
+
+    __tablename__ = "auto_prediction_cache"
+    __table_args__ = (
+        UniqueConstraint(
+            "image_key",
+            "model_name",
+            "model_version",
+            "conf",
+            "imgsz",
+            name="uq_auto_prediction_cache_key",
+        ),
+    )
+
+    id: int = Field(
+        default=None, primary_key=True, sa_column_kwargs={"autoincrement": True}
+    )
+    image_key: str
+    model_name: str
+    model_version: str
+    conf: float
+    imgsz: int
+    # [[x1n, y1n, x2n, y2n, conf], ...] as returned by SmokeDetector.predict.
+    predictions: list = Field(sa_column=Column(JSONB, nullable=False))
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(UTC),
+        sa_column=Column(DateTime(timezone=True)),
+    )
+
+
 class DetectionAnnotation(SQLModel, table=True):
     __tablename__ = "detections_annotations"
     __table_args__ = (
@@ -523,6 +565,25 @@ class AlertSkip(SQLModel, table=True):
     note: Optional[str] = Field(default=None)
 
 
+class AlertChange(SQLModel, table=True):
+    """Latest change to anything the alert export reads, one row per alert.
+
+    Written only by database triggers on sequences, detections, their
+    annotations and alert_skips (migration f8a9b0c1d2e3), so no write path can
+    bypass it. ``change_xid`` is the id of the last transaction that touched
+    the alert: a reader holding a snapshot's xmin as its sync token gets every
+    change committed after that snapshot by asking for ``change_xid >= token``.
+    """
+
+    __tablename__ = "alert_changes"
+    __table_args__ = (Index("ix_alert_change_xid", "change_xid"),)
+
+    source_api: SourceApi = Field(primary_key=True)
+    platform_alert_id: int = Field(sa_type=BigInteger, primary_key=True)
+    change_xid: int = Field(sa_type=BigInteger)
+    changed_at: datetime = Field(sa_column=Column(DateTime(timezone=True)))
+
+
 class DetectionAnnotationContribution(SQLModel, table=True):
     __tablename__ = "detection_annotation_contributions"
     __table_args__ = (
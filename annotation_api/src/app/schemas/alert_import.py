@@ -0,0 +1,102 @@
+# Copyright (C) 2026, Pyronear.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
+
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.models import SourceApi
+from app.schemas.annotation_validation import SequenceAnnotationData
+from app.schemas.detection import DetectionBatchItem
+from app.schemas.sequence import SequenceCreate
+
+__all__ = [
+    "AlertImportLane",
+    "AlertImportLaneResult",
+    "AlertImportRequest",
+    "AlertImportResponse",
+]
+
+
+class AlertImportLane(BaseModel):
+    """One object-split lane: its sequence, its detections, and the seed
+    annotation it enters the queue with (stored at ready_to_annotate).
+
+    The detections do not exist yet, so the seed's bboxes reference them by
+    alert_api_id in ``detection_id``; the server rewrites those to the
+    created detection ids.
+    """
+
+    sequence: SequenceCreate
+    detections: List[DetectionBatchItem] = Field(..., min_length=1, max_length=500)
+    annotation: SequenceAnnotationData
+
+    @model_validator(mode="after")
+    def _annotation_references_lane_detections(self) -> "AlertImportLane":
+        alert_api_ids = [item.alert_api_id for item in self.detections]
+        if len(set(alert_api_ids)) != len(alert_api_ids):
+            raise ValueError("detection alert_api_id values must be unique in a lane")
+        unknown = {
+            bbox.detection_id
+            for track in self.annotation.sequences_bbox
+            for bbox in track.bboxes
+        } - set(alert_api_ids)
+        if unknown:
+            raise ValueError(
+                f"annotation references detections not in the lane: {sorted(unknown)}"
+            )
+        return self
+
+
+class AlertImportRequest(BaseModel):
+    """Every lane of one platform alert, created in one transaction.
+
+    Idempotent on (source_api, platform_alert_id): once any lane of the alert
+    is stored, a repeat import writes nothing and answers with the stored
+    lanes. Each lane's sequence must carry the alert's source_api; its
+    platform_alert_id is filled in from the alert when omitted.
+    """
+
+    source_api: SourceApi
+    platform_alert_id: int
+    lanes: List[AlertImportLane] = Field(..., min_length=1, max_length=100)
+
+    @model_validator(mode="after")
+    def _lanes_belong_to_alert(self) -> "AlertImportRequest":
+        for lane in self.lanes:
+            sequence = lane.sequence
+            if sequence.source_api != self.source_api:
+                raise ValueError(
+                    f"lane alert_api_id={sequence.alert_api_id} has source_api "
+                    f"{sequence.source_api.value}, not {self.source_api.value}"
+                )
+            if sequence.platform_alert_id is None:
+                sequence.platform_alert_id = self.platform_alert_id
+            elif sequence.platform_alert_id != self.platform_alert_id:
+                raise ValueError(
+                    f"lane alert_api_id={sequence.alert_api_id} belongs to "
+                    f"platform alert {sequence.platform_alert_id}"
+                )
+        alert_api_ids = [lane.sequence.alert_api_id for lane in self.lanes]
+        if len(set(alert_api_ids)) != len(alert_api_ids):
+            raise ValueError("lane alert_api_id values must be unique")
+        return self
+
+
+class AlertImportLaneResult(BaseModel):
+    alert_api_id: int
+    sequence_id: int
+    annotation_id: Optional[int] = None
+    detection_ids: Dict[int, int] = Field(
+        default_factory=dict,
+        description="Detection id by its alert_api_id",
+    )
+
+
+class AlertImportResponse(BaseModel):
+    status: Literal["created", "exists"]
+    source_api: SourceApi
+    platform_alert_id: int
+    lanes: List[AlertImportLaneResult]
@@ -5,16 +5,22 @@
 
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from app.schemas.annotation_validation import AlgoPredictions
 
 __all__ = [
+    "DetectionBatchCreate",
+    "DetectionBatchItem",
+    "DetectionBatchItemResult",
+    "DetectionBatchResponse",
     "DetectionCreate",
     "DetectionCreateFromBucketKey",
     "DetectionCreateFromUrl",
+    "DetectionLookup",
+    "DetectionLookupResponse",
     "DetectionRead",
     "DetectionUrl",
     "DetectionWithUrl",
@@ -53,6 +59,39 @@ class DetectionCreateFromBucketKey(BaseModel):
     auto_predictions: Optional[AlgoPredictions] = None
 
 
+class DetectionBatchItem(BaseModel):
+    """One frame of a batch. The image comes from exactly one of
+    ``source_key`` (server-side copy from the platform bucket, as
+    /from-bucket-key) or ``source_url`` (server-side fetch, as /from-url)."""
+
+    source_key: Optional[str] = Field(
+        default=None, min_length=1, description="Object key within the source bucket"
+    )
+    source_url: Optional[str] = None
+    recorded_at: datetime
+    alert_api_id: int
+    algo_predictions: AlgoPredictions
+    others_bboxes: Optional[AlgoPredictions] = None
+    auto_predictions: Optional[AlgoPredictions] = None
+
+    @model_validator(mode="after")
+    def _exactly_one_source(self) -> "DetectionBatchItem":
+        if (self.source_key is None) == (self.source_url is None):
+            raise ValueError("exactly one of source_key or source_url must be set")
+        return self
+
+
+class DetectionBatchCreate(BaseModel):
+    """A sequence's detections, created in one request and one transaction.
+
+    Like DetectionAnnotationBulkRequest, the 500-item ceiling is a server
+    guard rather than a chunk size: a sequence holds one detection per frame.
+    """
+
+    sequence_id: int = Field(..., ge=1, description="Annotation API sequence id")
+    detections: List[DetectionBatchItem] = Field(..., min_length=1, max_length=500)
+
+
 class DetectionRead(BaseModel):
     id: int
     sequence_id: Optional[int]
@@ -65,6 +104,40 @@ class DetectionRead(BaseModel):
     created_at: datetime
 
 
+class DetectionBatchItemResult(BaseModel):
+    """Outcome for one batch item, in request order. ``exists`` carries the
+    detection already stored for this (sequence_id, alert_api_id);
+    ``failed`` carries the status code and detail the single-detection
+    endpoints would have answered with."""
+
+    alert_api_id: int
+    status: Literal["created", "exists", "failed"]
+    detection: Optional[DetectionRead] = None
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+
+
+class DetectionBatchResponse(BaseModel):
+    sequence_id: int
+    results: List[DetectionBatchItemResult]
+
+
+class DetectionLookup(BaseModel):
+    """Which of these alert_api_ids a sequence already holds. Same ceiling
+    as DetectionBatchCreate: a sequence holds one detection per frame."""
+
+    sequence_id: int = Field(..., ge=1, description="Annotation API sequence id")
+    alert_api_ids: List[int] = Field(..., min_length=1, max_length=500)
+
+
+class DetectionLookupResponse(BaseModel):
+    """The stored detections among the requested alert_api_ids; ids the
+    sequence does not hold are simply absent."""
+
+    sequence_id: int
+    detections: List[DetectionRead]
+
+
 class DetectionUrl(BaseModel):
     url: str = Field(..., description="temporary URL to access the media content")
 
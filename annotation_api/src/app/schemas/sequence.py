@@ -6,7 +6,7 @@
 
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional, Tuple
+from typing import List, Literal, Optional, Tuple
 
 from pydantic import BaseModel, Field, ConfigDict
 
@@ -142,6 +142,65 @@ class SequenceTemporalScoreUpdate(BaseModel):
     temporal_api_version: Optional[str] = Field(..., max_length=32)
 
 
+class SequenceTemporalScoreBatch(BaseModel):
+    """Many temporal-score refreshes, applied in one statement.
+
+    The ceiling bounds one VALUES list; a backfill sends its refreshes in
+    chunks of this size.
+    """
+
+    updates: List[SequenceTemporalScoreUpdate] = Field(
+        ..., min_length=1, max_length=5000
+    )
+
+
+class SequenceTemporalScoreResult(BaseModel):
+    """Outcome for one refresh, in request order. ``duplicate`` marks a key
+    already refreshed earlier in the same batch; that row is not applied."""
+
+    source_api: SourceApi
+    alert_api_id: int
+    status: Literal["updated", "not_found", "duplicate"]
+    sequence_id: Optional[int] = None
+
+
+class SequenceTemporalScoreBatchResponse(BaseModel):
+    results: List[SequenceTemporalScoreResult]
+
+
+class SequenceKey(BaseModel):
+    """A sequence's natural key, as the importer knows it."""
+
+    source_api: SourceApi
+    alert_api_id: int
+
+
+class SequenceLookup(BaseModel):
+    """Which of these sequences already exist.
+
+    The ceiling keeps one request to a bounded IN list; the importer sends
+    a long backfill in chunks of this size.
+    """
+
+    sequences: List[SequenceKey] = Field(..., min_length=1, max_length=1000)
+
+
+class SequenceLookupItem(SequenceKey):
+    """A stored sequence with the columns a re-import may refresh."""
+
+    id: int
+    temporal_model_score: Optional[float] = None
+    temporal_model_version: Optional[str] = None
+    temporal_api_version: Optional[str] = None
+
+
+class SequenceLookupResponse(BaseModel):
+    """The stored sequences among the requested keys; keys with no sequence
+    are simply absent."""
+
+    sequences: List[SequenceLookupItem]
+
+
 class SequenceRead(Azimuth):
     id: int
     source_api: SourceApi = Field(
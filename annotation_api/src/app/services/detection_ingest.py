@@ -0,0 +1,107 @@
+# Copyright (C) 2026, Pyronear.
+
+"""Storage side of creating many detections in one request.
+
+Shared by POST /detections/batch and POST /alerts/import: both flush their
+rows first (the ids are part of the bucket keys), then run every image's
+storage operation concurrently here, and commit once.
+"""
+
+import asyncio
+import logging
+from datetime import UTC, datetime
+from typing import Iterable, List, Tuple, Union
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.models import Detection
+from app.schemas.detection import DetectionBatchItem
+from app.services.storage import (
+    copy_file_from_bucket,
+    s3_service,
+    upload_file_from_url,
+)
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def platform_source_bucket(organisation_id: int) -> str:
+    """The platform bucket server-side copies read from.
+
+    Derived from PLATFORM_SERVER_NAME and the organisation of the (stored)
+    sequence, so a caller cannot pick which org bucket a copy reads.
+    """
+    return f"{settings.PLATFORM_SERVER_NAME}-alert-api-{organisation_id}"
+
+
+def new_detection(item: DetectionBatchItem, sequence_id: int) -> Detection:
+    """An unsaved detection for a batch item; bucket_key is set once stored."""
+    return Detection(
+        sequence_id=sequence_id,
+        alert_api_id=item.alert_api_id,
+        recorded_at=item.recorded_at,
+        bucket_key="",
+        algo_predictions=item.algo_predictions.model_dump(),
+        others_bboxes=item.others_bboxes.model_dump() if item.others_bboxes else None,
+        auto_predictions=item.auto_predictions.model_dump()
+        if item.auto_predictions
+        else None,
+        created_at=datetime.now(UTC),
+    )
+
+
+async def store_detection_images(
+    jobs: Iterable[Tuple[DetectionBatchItem, Detection, str]],
+) -> List[Union[str, BaseException]]:
+    """Store the image of each ``(item, flushed detection, source bucket)``.
+
+    At most DETECTION_BATCH_STORAGE_CONCURRENCY operations run at once; each
+    holds a threadpool slot for its blocking boto3 work. Returns, in job
+    order, the bucket key written or the exception raised (HTTPException for
+    the failures the single-detection endpoints map to a status code).
+    """
+    limit = asyncio.Semaphore(settings.DETECTION_BATCH_STORAGE_CONCURRENCY)
+
+    async def store(
+        item: DetectionBatchItem, detection: Detection, source_bucket: str
+    ) -> str:
+        async with limit:
+            if item.source_key is not None:
+                return await copy_file_from_bucket(
+                    source_bucket=source_bucket,
+                    source_key=item.source_key,
+                    sequence_id=detection.sequence_id,
+                    detection_id=detection.id,
+                    recorded_at=item.recorded_at,
+                )
+            return await upload_file_from_url(
+                source_url=item.source_url,
+                sequence_id=detection.sequence_id,
+                detection_id=detection.id,
+                recorded_at=item.recorded_at,
+            )
+
+    return await asyncio.gather(
+        *(store(*job) for job in jobs),
+        return_exceptions=True,
+    )
+
+
+def storage_failure(exc: BaseException) -> Tuple[int, str]:
+    """Status code and detail for a failed storage operation: the
+    HTTPException's own, else a logged 500."""
+    if isinstance(exc, HTTPException):
+        return exc.status_code, str(exc.detail)
+    logger.error("Detection storage operation failed", exc_info=exc)
+    return status.HTTP_500_INTERNAL_SERVER_ERROR, "Storage operation failed"
+
+
+def delete_stored_images(bucket_keys: Iterable[str]) -> None:
+    """Best-effort removal of objects whose rows did not commit."""
+    bucket = s3_service.get_bucket(s3_service.resolve_bucket_name())
+    for bucket_key in bucket_keys:
+        try:
+            bucket.delete_file(bucket_key)
+        except Exception:
+            logger.exception("Failed to clean up orphaned S3 object %s", bucket_key)
@@ -0,0 +1,111 @@
+# Copyright (C) 2026, Pyronear.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
+
+"""Multi-process auto-annotate inference.
+
+One procrastinate worker process runs one job's inference at a time on one
+model, which leaves most cores idle while a big import's backlog drains. With
+``AUTOANNOTATE_INFERENCE_PROCESSES`` > 1 the worker instead runs that many
+jobs at once and hands their batches to a pool of child processes, each
+owning its own ``SmokeDetector``.
+
+Only inference moves out: the jobs' DB sessions and S3 downloads stay in the
+worker process, so the connection budget (src/tests/test_pool_sizing.py) is
+unchanged. Each child's onnxruntime gets ``cpus / processes`` intra-op
+threads so the children do not oversubscribe the CPU between them.
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+from app.core.config import available_cpus, settings
+from app.services.smoke_detector import SmokeDetector
+
+logger = logging.getLogger(__name__)
+
+
+def inference_threads(processes: int) -> Tuple[int, int]:
+    """``(intra_op, inter_op)`` onnxruntime threads for one of ``processes``
+    inference processes sharing this host."""
+    intra = settings.AUTOANNOTATE_INTRA_OP_THREADS or max(
+        1, available_cpus() // max(1, processes)
+    )
+    return intra, settings.AUTOANNOTATE_INTER_OP_THREADS
+
+
+def build_detector(processes: int = 1) -> SmokeDetector:
+    """A detector configured from settings, sized as one of ``processes``."""
+    intra, inter = inference_threads(processes)
+    return SmokeDetector(
+        model_path=settings.AUTOANNOTATE_MODEL_PATH,
+        conf=settings.AUTOANNOTATE_CONF,
+        iou=settings.AUTOANNOTATE_IOU,
+        imgsz=settings.AUTOANNOTATE_IMGSZ,
+        max_batch_size=settings.AUTOANNOTATE_BATCH_SIZE,
+        intra_op_num_threads=intra,
+        inter_op_num_threads=inter,
+    )
+
+
+# The detector of a pool child, loaded once by the pool initializer.
+_process_detector: SmokeDetector | None = None
+
+
+def _init_process(processes: int) -> None:
+    global _process_detector
+    _process_detector = build_detector(processes)
+
+
+def _predict_batch(pil_imgs: List[Image.Image]) -> List[np.ndarray]:
+    assert _process_detector is not None, "inference pool child not initialized"
+    return _process_detector.predict_batch(pil_imgs)
+
+
+class InferencePool:
+    """``SmokeDetector.predict_batch`` served by child processes.
+
+    Exposes the same ``max_batch_size`` / ``predict_batch`` surface as the
+    detector, so the worker drives either one unchanged. ``predict_batch``
+    blocks until a child returns, like the detector it stands in for; the
+    worker already calls it from a thread.
+
+    Children are spawned rather than forked: the worker process runs an event
+    loop and boto3/prefetch threads, none of which survive a fork safely.
+    """
+
+    def __init__(self, processes: int) -> None:
+        self.processes = processes
+        self.max_batch_size = settings.AUTOANNOTATE_BATCH_SIZE
+        self._executor = self._start()
+
+    def _start(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_process,
+            initargs=(self.processes,),
+        )
+
+    def predict_batch(self, pil_imgs: Sequence[Image.Image]) -> List[np.ndarray]:
+        try:
+            return self._executor.submit(_predict_batch, list(pil_imgs)).result()
+        except BrokenProcessPool:
+            # A child died (e.g. OOM-killed). Replace the pool so later jobs
+            # run; this one fails and is retried by the stale-lane sweep.
+            logger.warning(
+                "inference pool broken; restarting %d processes", self.processes
+            )
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._start()
+            raise
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(cancel_futures=True)
@@ -0,0 +1,110 @@
+# Copyright (C) 2026, Pyronear.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
+
+"""Persistent auto-annotate prediction cache (see ``AutoPredictionCache``).
+
+Sibling lanes of a multi-object alert share their photos, and stale-lane
+retries (RETRY_STALE_AFTER) re-run whole lanes, so the worker looks frames up
+here first and only downloads and infers the misses. Entries are keyed on the
+photo (see ``image_key``) and on the model configuration that produced them;
+changing the model name, version, confidence threshold or input size simply
+starts a fresh set of entries.
+"""
+
+import posixpath
+import re
+from typing import Dict, Iterable
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.models import AutoPredictionCache
+
+
+# {YYYYMMDD_HHMMSS}_det{detection_id}_{hash}{ext}, see
+# storage._generate_detection_bucket_key.
+_DETECTION_KEY_NAME = re.compile(r"(\d{8}_\d{6})_det\d+_(.+)")
+
+
+def image_key(bucket_key: str) -> str:
+    """The photo a detection's ``bucket_key`` stores, as a cache key.
+
+    Each detection gets its own object, even when sibling lanes of an
+    imported alert share the capture, but its key's name is the capture
+    time, the detection id and a hash of the image (of its content, or of
+    the source object it was copied from). Dropping the detection id leaves
+    what the siblings have in common. The hash is short, so the capture time
+    stays in the key to keep unrelated photos apart. A key of another shape
+    is its own photo.
+    """
+    match = _DETECTION_KEY_NAME.fullmatch(posixpath.basename(bucket_key))
+    if match is None:
+        return bucket_key
+    return f"{match[1]}_{match[2]}"
+
+
+def _current_model_clause():
+    return (
+        (AutoPredictionCache.model_name == settings.AUTOANNOTATE_MODEL_NAME)
+        & (AutoPredictionCache.model_version == settings.AUTOANNOTATE_MODEL_VERSION)
+        & (AutoPredictionCache.conf == settings.AUTOANNOTATE_CONF)
+        & (AutoPredictionCache.imgsz == settings.AUTOANNOTATE_IMGSZ)
+    )
+
+
+async def load_cached_predictions(
+    session: AsyncSession, image_keys: Iterable[str]
+) -> Dict[str, np.ndarray]:
+    """Cached ``(N, 5)`` detector outputs for whichever of ``image_keys`` the
+    current model configuration has already seen.
+
+    Rebuilt as float32, the detector's output dtype, so a cached frame goes
+    through the anchor filter exactly as a freshly inferred one would.
+    """
+    keys = list(set(image_keys))
+    if not keys:
+        return {}
+    rows = await session.execute(
+        select(AutoPredictionCache.image_key, AutoPredictionCache.predictions).where(
+            AutoPredictionCache.image_key.in_(keys), _current_model_clause()
+        )
+    )
+    return {
+        key: np.array(preds, dtype=np.float32).reshape(-1, 5) for key, preds in rows
+    }
+
+
+async def store_predictions(
+    session: AsyncSession, predictions: Dict[str, np.ndarray]
+) -> None:
+    """Record fresh detector outputs, by image key, under the current model
+    configuration.
+
+    Added to the caller's transaction. A concurrent job caching the same
+    photo (siblings run in parallel) wins the race harmlessly: both computed
+    the same thing, so conflicts are ignored.
+    """
+    if not predictions:
+        return
+    await session.execute(
+        pg_insert(AutoPredictionCache)
+        .values(
+            [
+                {
+                    "image_key": key,
+                    "model_name": settings.AUTOANNOTATE_MODEL_NAME,
+                    "model_version": settings.AUTOANNOTATE_MODEL_VERSION,
+                    "conf": settings.AUTOANNOTATE_CONF,
+                    "imgsz": settings.AUTOANNOTATE_IMGSZ,
+                    "predictions": [[float(v) for v in row] for row in preds],
+                }
+                for key, preds in predictions.items()
+            ]
+        )
+        .on_conflict_do_nothing(constraint="uq_auto_prediction_cache_key")
+    )
@@ -5,8 +5,10 @@ auto-annotate script) — no file/label IO and no model download (the model is
 baked into the image and loaded from an explicit path).
 """
 
+import threading
+from io import BytesIO
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Sequence, Tuple
 
 import cv2
 import numpy as np
@@ -23,6 +25,21 @@ def xywh2xyxy(x: np.ndarray) -> np.ndarray:
     return y
 
 
+def _letterbox_geometry(
+    shape: Tuple[int, int], new_shape: Tuple[int, int]
+) -> Tuple[Tuple[int, int], int, int, int, int]:
+    """Resized ``(w, h)`` and the ``top, bottom, left, right`` padding that
+    letterboxes an image of ``shape`` ``(h, w)`` into ``new_shape``."""
+    r = min(new_shape[0] / shape[0], new_shape[1] / shape[1])
+    new_unpad = int(round(shape[1] * r)), int(round(shape[0] * r))
+    dw, dh = new_shape[1] - new_unpad[0], new_shape[0] - new_unpad[1]
+    dw /= 2
+    dh /= 2
+    top, bottom = int(round(dh - 0.1)), int(round(dh + 0.1))
+    left, right = int(round(dw - 0.1)), int(round(dw + 0.1))
+    return new_unpad, top, bottom, left, right
+
+
 def letterbox(
     im: np.ndarray, new_shape: tuple = (1024, 1024), color: tuple = (114, 114, 114)
 ) -> Tuple[np.ndarray, Tuple[int, int]]:
@@ -30,19 +47,65 @@ def letterbox(
     shape = im.shape[:2]
     if isinstance(new_shape, int):
         new_shape = (new_shape, new_shape)
-    r = min(new_shape[0] / shape[0], new_shape[1] / shape[1])
-    new_unpad = int(round(shape[1] * r)), int(round(shape[0] * r))
-    dw, dh = new_shape[1] - new_unpad[0], new_shape[0] - new_unpad[1]
-    dw /= 2
-    dh /= 2
+    new_unpad, top, bottom, left, right = _letterbox_geometry(shape, new_shape)
     if shape[::-1] != new_unpad:
         im = cv2.resize(im, new_unpad, interpolation=cv2.INTER_LINEAR)
-    top, bottom = int(round(dh - 0.1)), int(round(dh + 0.1))
-    left, right = int(round(dw - 0.1)), int(round(dw + 0.1))
     h, w = im.shape[:2]
-    im_b = np.zeros((h + top + bottom, w + left + right, 3)) + color
+    im_b = np.empty((h + top + bottom, w + left + right, 3), dtype=np.uint8)
+    im_b[...] = color
     im_b[top : top + h, left : left + w, :] = im
-    return im_b.astype("uint8"), (left, top)
+    return im_b, (left, top)
+
+
+def letterbox_into(
+    im: np.ndarray, out: np.ndarray, color: tuple = (114, 114, 114)
+) -> Tuple[int, int]:
+    """Letterbox ``im`` (HWC uint8) straight into ``out``, a ``(3, H, W)``
+    float32 slot of an NCHW batch, scaled to [0, 1].
+
+    Bit-identical to ``letterbox`` followed by the float32 cast, CHW transpose
+    and ``/ 255`` the model expects, but without materializing the padded
+    canvas or any full-resolution float copy: the border is filled in place
+    and the resized pixels are scaled directly into their window.
+    Returns the ``(left, top)`` padding.
+    """
+    shape = im.shape[:2]
+    new_unpad, top, bottom, left, right = _letterbox_geometry(shape, out.shape[1:])
+    if shape[::-1] != new_unpad:
+        im = cv2.resize(im, new_unpad, interpolation=cv2.INTER_LINEAR)
+    h, w = im.shape[:2]
+    scale = np.float32(255.0)
+    for channel, value in zip(out, color):
+        pad_value = np.float32(value) / scale
+        channel[:top] = pad_value
+        channel[top + h :] = pad_value
+        channel[top : top + h, :left] = pad_value
+        channel[top : top + h, left + w :] = pad_value
+    np.divide(
+        im.transpose((2, 0, 1)),
+        scale,
+        out=out[:, top : top + h, left : left + w],
+        dtype=np.float32,
+    )
+    return left, top
+
+
+def decode_image(image_bytes: bytes, imgsz: int) -> Image.Image:
+    """Decode an encoded frame as a loaded RGB image for inference.
+
+    A JPEG at least twice ``imgsz`` on its long side is decoded at a reduced
+    DCT scale (``Image.draft``) that still covers the letterboxed size, so
+    full-resolution pixels that the letterbox would throw away are never
+    materialized.
+    """
+    img = Image.open(BytesIO(image_bytes))
+    if img.format == "JPEG" and max(img.size) >= 2 * imgsz:
+        r = imgsz / max(img.size)
+        img.draft("RGB", (int(round(img.size[0] * r)), int(round(img.size[1] * r))))
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    img.load()
+    return img
 
 
 def box_iou(box1: np.ndarray, box2: np.ndarray, eps: float = 1e-7) -> np.ndarray:
@@ -55,17 +118,66 @@ def box_iou(box1: np.ndarray, box2: np.ndarray, eps: float = 1e-7) -> np.ndarray
     return inter / ((a2 - a1).prod(1) + (b2 - b1).prod(1)[:, None] - inter + eps)
 
 
+def _overlaps_higher_ranked(
+    xyxy: np.ndarray, overlap_thresh: float, chunk: int = 1024, eps: float = 1e-7
+) -> np.ndarray:
+    """For boxes in ascending rank order, whether each one has IoU above
+    ``overlap_thresh`` (>= 0) with any box ranked after it.
+
+    Sort-and-sweep on x: IoU > 0 needs a positive x-overlap, and two boxes
+    overlap in x iff the one starting later starts inside the other's span.
+    Sorting by x1 turns each box's partners into the contiguous run of boxes
+    starting within its span, so only x-overlapping pairs are ever scored:
+    ``O(N log N + K)`` for ``K`` such pairs instead of all ``N^2``. Pairs are
+    scored exactly as ``box_iou`` does (same operations, same order), a chunk
+    of boxes' runs at a time to bound memory.
+    """
+    n = len(xyxy)
+    area = (xyxy[:, 2:] - xyxy[:, :2]).prod(1)
+    order = np.argsort(xyxy[:, 0], kind="stable")
+    # End (exclusive) of each box's run: the first box starting at/after its x2.
+    ends = np.searchsorted(xyxy[order, 0], xyxy[order, 2], side="left")
+    counts = np.maximum(ends - np.arange(n) - 1, 0)
+    overlaps = np.zeros(n, dtype=bool)
+    for start in range(0, n, chunk):
+        run = counts[start : start + chunk]
+        total = int(run.sum())
+        if total == 0:
+            continue
+        first = np.repeat(np.arange(start, start + len(run)), run)
+        offset = np.arange(total) - np.repeat(np.cumsum(run) - run, run)
+        i, j = order[first], order[first + 1 + offset]
+        a, b = xyxy[i], xyxy[j]
+        inter = (
+            (np.minimum(a[:, 2:], b[:, 2:]) - np.maximum(a[:, :2], b[:, :2]))
+            .clip(0)
+            .prod(1)
+        )
+        iou = inter / (area[i] + area[j] - inter + eps)
+        hit = iou > overlap_thresh
+        # The lower-ranked box of an overlapping pair is the one that loses.
+        overlaps[np.minimum(i, j)[hit]] = True
+    return overlaps
+
+
 def nms(boxes: np.ndarray, overlapThresh: float = 0.0):
+    """Drop every box that overlaps (IoU > ``overlapThresh``) a more confident
+    one; returns the survivors in ascending confidence order.
+
+    Same result as the retired script's loop, which walked boxes from least
+    to most confident and removed one if it overlapped any box still kept.
+    Every box ranked above is still kept at that point, and a kept box below
+    already passed the test against this one, so a box survives iff it
+    overlaps nothing ranked above it -- which is what is computed here,
+    without the per-box Python loop or the ``N x N`` IoU matrix. (A negative
+    threshold, where every pair counts, keeps only the top box.)
+    """
     boxes = boxes[boxes[:, -1].argsort()]
     if len(boxes) == 0:
         return []
-    indices = np.arange(len(boxes))
-    rr = box_iou(boxes[:, :4], boxes[:, :4])
-    for i, _ in enumerate(boxes):
-        temp_indices = indices[indices != i]
-        if np.any(rr[i, temp_indices] > overlapThresh):
-            indices = indices[indices != i]
-    return boxes[indices]
+    if overlapThresh < 0:
+        return boxes[-1:]
+    return boxes[~_overlaps_higher_ranked(boxes[:, :4], overlapThresh)]
 
 
 def group_and_merge_boxes(
@@ -73,10 +185,15 @@ def group_and_merge_boxes(
 ) -> Tuple[np.ndarray, Dict[int, np.ndarray]]:
     """Cluster boxes into persistent object groups.
 
-    Preserved verbatim from the retired file-based auto-annotate script so
-    historical results stay reproducible. ``boxes`` is ``(N, >=5)`` with
-    confidence in the last column. Returns the representative boxes plus, per
-    group, the member boxes.
+    Reproduces the retired file-based auto-annotate script exactly so
+    historical results stay reproducible (src/tests/services/
+    test_smoke_detector.py checks it against the original on random inputs).
+    ``boxes`` is ``(N, >=5)`` with confidence in the last column. Returns the
+    representative boxes plus, per group, the member boxes.
+
+    Each main (NMS-surviving) box claims the boxes overlapping it; mains
+    sharing a claimed box are merged, transitively, with a union-find. A group
+    is represented by its lowest-index main, and groups are ordered by it.
     """
     if boxes.size == 0:
         return np.empty((0, boxes.shape[1]), dtype=boxes.dtype), {}
@@ -87,30 +204,27 @@ def group_and_merge_boxes(
 
     ious = box_iou(boxes[:, :4], main_bboxes[:, :4])
     X, Y = np.where(ious > threshold)
-    gp: Dict[int, List[int]] = {}
-    for main_index, bbox_index in zip(X, Y):
-        gp.setdefault(int(main_index), []).append(int(bbox_index))
 
-    items = [(k, set(v)) for k, v in gp.items()]
-    used = [False] * len(items)
-    merged = []
+    parent = list(range(len(main_bboxes)))
 
-    for i, (main_i, set_i) in enumerate(items):
-        if used[i]:
-            continue
-        current_set = set(set_i)
-        used[i] = True
-        changed = True
-        while changed:
-            changed = False
-            for j, (main_j, set_j) in enumerate(items):
-                if used[j]:
-                    continue
-                if current_set & set_j:
-                    current_set |= set_j
-                    used[j] = True
-                    changed = True
-        merged.append((main_i, sorted(current_set)))
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner: Dict[int, int] = {}
+    for main_index, bbox_index in zip(X.tolist(), Y.tolist()):
+        first = owner.setdefault(bbox_index, main_index)
+        a, b = find(first), find(main_index)
+        if a != b:
+            # The lower index stays root, so a group's root is its first main.
+            parent[max(a, b)] = min(a, b)
+
+    members: Dict[int, set] = {}
+    for main_index, bbox_index in zip(X.tolist(), Y.tolist()):
+        members.setdefault(find(main_index), set()).add(bbox_index)
+    merged = [(m, sorted(members[m])) for m in sorted(members)]
 
     final_main = np.stack([main_bboxes[m] for m, _ in merged], axis=0)
     groups = {i: boxes[idxs, :] for i, (_, idxs) in enumerate(merged)}
@@ -132,7 +246,18 @@ def keep_boxes_overlapping(preds: np.ndarray, anchor_boxes: np.ndarray) -> np.nd
 
 class SmokeDetector:
     """ONNX-only smoke detector. Loads the model once; ``predict`` returns
-    normalized ``(N, 5)`` boxes ``[x1n, y1n, x2n, y2n, conf]``."""
+    normalized ``(N, 5)`` boxes ``[x1n, y1n, x2n, y2n, conf]``.
+
+    ``predict_batch`` letterboxes several frames into one ``(B, 3, H, W)``
+    tensor and runs the session once per ``max_batch_size`` frames: on CPU the
+    per-call overhead of a 1024x1024 session run dominates a lane of
+    single-frame calls. A model exported with a fixed batch dimension caps
+    ``max_batch_size`` at that size.
+
+    The input tensor is a preallocated float32 buffer, reused across calls
+    (see ``_batch_buffer``), that frames are letterboxed straight into. Calls
+    from several threads take turns on it.
+    """
 
     def __init__(
         self,
@@ -141,6 +266,9 @@ class SmokeDetector:
         iou: float = 0.0,
         imgsz: int = 1024,
         max_bbox_size: float = 0.4,
+        max_batch_size: int = 8,
+        intra_op_num_threads: int = 0,
+        inter_op_num_threads: int = 0,
     ) -> None:
         self.imgsz = imgsz
         self.conf = conf
@@ -152,14 +280,34 @@ class SmokeDetector:
             if not candidates:
                 raise RuntimeError(f"No .onnx file found under {model_path}")
             onnx_file = str(candidates[0])
-        self.ort_session = onnxruntime.InferenceSession(onnx_file)
+        # 0 leaves the choice to onnxruntime (one intra-op thread per core).
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = intra_op_num_threads
+        options.inter_op_num_threads = inter_op_num_threads
+        self.ort_session = onnxruntime.InferenceSession(onnx_file, sess_options=options)
+        # Dynamic axes come back as strings (e.g. "batch"); only a concrete
+        # int is a hard limit.
+        batch_dim = self.ort_session.get_inputs()[0].shape[0]
+        if isinstance(batch_dim, int) and batch_dim > 0:
+            max_batch_size = min(max_batch_size, batch_dim)
+        self.max_batch_size = max(1, max_batch_size)
+        self._buffer: np.ndarray | None = None
+        self._buffer_lock = threading.Lock()
 
-    def _prep(self, pil_img: Image.Image) -> Tuple[np.ndarray, Tuple[int, int]]:
-        np_img, pad = letterbox(np.array(pil_img), self.imgsz)
-        np_img = np.expand_dims(np_img.astype("float32"), axis=0)
-        np_img = np.ascontiguousarray(np_img.transpose((0, 3, 1, 2)))
-        np_img /= 255.0
-        return np_img, pad
+    def _batch_buffer(self, size: int) -> np.ndarray:
+        """A ``(size, 3, imgsz, imgsz)`` float32 input tensor.
+
+        One ``max_batch_size`` buffer per detector, allocated on first use; a
+        smaller batch is a view of its leading frames (still C-contiguous).
+        Only valid under ``_buffer_lock``: the worker runs inference on the
+        shared default executor, and a buffer per thread would cost a full
+        batch tensor (~100 MB at 8x1024x1024) for every thread it ever used.
+        """
+        if self._buffer is None:
+            self._buffer = np.empty(
+                (self.max_batch_size, 3, self.imgsz, self.imgsz), dtype=np.float32
+            )
+        return self._buffer[:size]
 
     def _post(self, pred: np.ndarray, pad: Tuple[int, int]) -> np.ndarray:
         pred = pred[:, pred[-1, :] > self.conf]
@@ -184,6 +332,22 @@ class SmokeDetector:
         return pred
 
     def predict(self, pil_img: Image.Image) -> np.ndarray:
-        np_img, pad = self._prep(pil_img)
-        pred = self.ort_session.run(["output0"], {"images": np_img})[0][0]
-        return self._post(pred, pad)
+        return self.predict_batch([pil_img])[0]
+
+    def predict_batch(self, pil_imgs: Sequence[Image.Image]) -> List[np.ndarray]:
+        """Predict every frame of ``pil_imgs``, in order. Frames are run in
+        chunks of ``max_batch_size``; each result is what ``predict`` would
+        return for that frame alone."""
+        results: List[np.ndarray] = []
+        for start in range(0, len(pil_imgs), self.max_batch_size):
+            chunk = pil_imgs[start : start + self.max_batch_size]
+            # The session must not read the buffer while another call refills it.
+            with self._buffer_lock:
+                batch = self._batch_buffer(len(chunk))
+                pads = [
+                    letterbox_into(np.asarray(img), slot)
+                    for img, slot in zip(chunk, batch)
+                ]
+                preds = self.ort_session.run(["output0"], {"images": batch})[0]
+            results.extend(self._post(pred, pad) for pred, pad in zip(preds, pads))
+        return results
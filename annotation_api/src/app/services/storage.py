@@ -4,13 +4,16 @@
 # See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
 
 import asyncio
+import base64
 import hashlib
+import itertools
 import logging
 import os
 import threading
+from contextlib import contextmanager
 from datetime import datetime, UTC
 from mimetypes import guess_extension
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
 
 import boto3
 import httpx
@@ -37,6 +40,13 @@ __all__ = [
 
 logger = logging.getLogger("uvicorn.warning")
 
+# Part size of Content-MD5 uploads, boto3's default multipart chunk size.
+_MULTIPART_CHUNK_BYTES = 8 * 1024 * 1024
+
+
+def _b64_md5(digest: bytes) -> str:
+    return base64.b64encode(digest).decode()
+
 
 class S3Bucket:
     """S3 bucket manager
@@ -77,8 +87,21 @@ class S3Bucket:
             logger.warning(e)
             return False
 
-    def upload_file(self, bucket_key: str, file_binary: bytes) -> bool:
-        """Upload a file to bucket and return whether the upload succeeded"""
+    def upload_file(
+        self, bucket_key: str, file_binary: bytes, content_md5: Optional[str] = None
+    ) -> bool:
+        """Upload a file to bucket and return whether the upload succeeded.
+
+        With ``content_md5`` (hex digest of the body), a body that fits in one
+        part goes in a single PUT carrying it, which S3 rejects with BadDigest
+        on mismatch. Larger bodies still stream in parts, each sent with its
+        own Content-MD5, and the multipart upload is only completed once the
+        parts add up to ``content_md5``; unlike upload_fileobj, the parts go
+        one after the other.
+        """
+        if content_md5 is not None:
+            self._put_with_md5(bucket_key, file_binary, content_md5)
+            return True
         # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3.html#S3.Bucket.upload_fileobj
         self._s3.upload_fileobj(file_binary, self.name, bucket_key)
         return True
@@ -88,16 +111,90 @@ class S3Bucket:
         file_bytes: bytes,
         bucket_key: str,
         content_type: str = "application/octet-stream",
+        content_md5: Optional[str] = None,
     ) -> bool:
-        """Upload bytes to bucket with specified content type"""
+        """Upload bytes to bucket with specified content type (and Content-MD5,
+        see upload_file)"""
         from io import BytesIO
 
         file_obj = BytesIO(file_bytes)
+        if content_md5 is not None:
+            self._put_with_md5(bucket_key, file_obj, content_md5, content_type)
+            return True
         self._s3.upload_fileobj(
             file_obj, self.name, bucket_key, ExtraArgs={"ContentType": content_type}
         )
         return True
 
+    def _put_with_md5(
+        self,
+        bucket_key: str,
+        body: Any,
+        content_md5: str,
+        content_type: Optional[str] = None,
+    ) -> None:
+        extra = {"ContentType": content_type} if content_type else {}
+        first = body.read(_MULTIPART_CHUNK_BYTES)
+        following = body.read(_MULTIPART_CHUNK_BYTES)
+        if not following:
+            # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/put_object.html
+            self._s3.put_object(
+                Bucket=self.name,
+                Key=bucket_key,
+                Body=first,
+                ContentMD5=_b64_md5(bytes.fromhex(content_md5)),
+                **extra,
+            )
+            return
+        parts = itertools.chain(
+            (first, following), iter(lambda: body.read(_MULTIPART_CHUNK_BYTES), b"")
+        )
+        self._multipart_with_md5(bucket_key, parts, content_md5, extra)
+
+    def _multipart_with_md5(
+        self,
+        bucket_key: str,
+        parts: Iterable[bytes],
+        content_md5: str,
+        extra: Dict[str, str],
+    ) -> None:
+        """Multipart upload where S3 checks every part against its own
+        Content-MD5, and the parts together against ``content_md5``."""
+        # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/create_multipart_upload.html
+        upload_id = self._s3.create_multipart_upload(
+            Bucket=self.name, Key=bucket_key, **extra
+        )["UploadId"]
+        try:
+            whole = hashlib.md5()  # noqa: S324
+            completed = []
+            for number, part in enumerate(parts, start=1):
+                whole.update(part)
+                response = self._s3.upload_part(
+                    Bucket=self.name,
+                    Key=bucket_key,
+                    UploadId=upload_id,
+                    PartNumber=number,
+                    Body=part,
+                    ContentMD5=_b64_md5(hashlib.md5(part).digest()),  # noqa: S324
+                )
+                completed.append({"PartNumber": number, "ETag": response["ETag"]})
+            if whole.hexdigest() != content_md5:
+                raise ClientError(
+                    {"Error": {"Code": "BadDigest", "Message": "body changed"}},
+                    "CompleteMultipartUpload",
+                )
+            self._s3.complete_multipart_upload(
+                Bucket=self.name,
+                Key=bucket_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": completed},
+            )
+        except Exception:
+            self._s3.abort_multipart_upload(
+                Bucket=self.name, Key=bucket_key, UploadId=upload_id
+            )
+            raise
+
     def download_file(self, bucket_key: str) -> bytes:
         """Download a file from bucket and return its content as bytes"""
         from io import BytesIO
@@ -271,6 +368,72 @@ class S3Service:
         return settings.S3_BUCKET_NAME
 
 
+# Chunk size for hashing uploads, and how much of their head libmagic sees:
+# image signatures sit in the first bytes, and python-magic recommends 2048.
+_READ_CHUNK_BYTES = 1024 * 1024
+_SNIFF_BYTES = 2048
+
+
+def _digest_and_sniff(
+    chunks: Iterable[Union[bytes, memoryview]],
+) -> Tuple[str, str, str]:
+    """SHA256 and MD5 hex digests and the MIME type of a body, in one pass.
+
+    The type is sniffed from the leading bytes only, not the whole body.
+    """
+    sha = hashlib.sha256()
+    md5 = hashlib.md5()  # noqa: S324
+    head = b""
+    for chunk in chunks:
+        if len(head) < _SNIFF_BYTES:
+            head += bytes(chunk[: _SNIFF_BYTES - len(head)])
+        sha.update(chunk)
+        md5.update(chunk)
+    return sha.hexdigest(), md5.hexdigest(), magic.from_buffer(head, mime=True)
+
+
+@contextmanager
+def _bad_digest_is_corruption() -> Iterator[None]:
+    """Map S3's rejection of a Content-MD5 upload (the body it received does
+    not match the MD5 we sent) to the upload-corruption error."""
+    try:
+        yield
+    except ClientError as exc:
+        if exc.response.get("Error", {}).get("Code") in ("BadDigest", "InvalidDigest"):
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Data was corrupted during upload",
+            ) from exc
+        raise
+
+
+def _verify_upload_etag(bucket: Any, bucket_key: str, md5_hash: str) -> None:
+    """S3_VERIFY_UPLOADS_WITH_HEAD path: read the object back and compare its
+    ETag to the body's MD5, deleting it on mismatch."""
+    # Data integrity check when metadata is available
+    if not hasattr(bucket, "get_file_metadata"):
+        return
+    try:
+        file_meta = bucket.get_file_metadata(bucket_key)
+    except Exception as exc:  # pragma: no cover
+        logging.warning("Could not retrieve file metadata for %s: %s", bucket_key, exc)
+        return
+    etag = file_meta.get("ETag") or file_meta.get("etag")
+    if etag is not None and md5_hash != etag.replace('"', ""):
+        # Delete the corrupted upload if supported
+        if hasattr(bucket, "delete_file"):
+            try:
+                bucket.delete_file(bucket_key)
+            except Exception as exc:  # pragma: no cover
+                logging.warning(
+                    "Failed to delete corrupted file %s: %s", bucket_key, exc
+                )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Data was corrupted during upload",
+        )
+
+
 async def upload_file(
     file: UploadFile,
     sequence_id: Optional[int] = None,
@@ -278,14 +441,12 @@ async def upload_file(
     recorded_at: Optional[datetime] = None,
 ) -> str:
     """Upload a file to S3 storage and return the bucket key"""
-    # Concatenate the first 8 chars of SHA256 hash to avoid system interaction issues
-    sha_hash = hashlib.sha256(file.file.read()).hexdigest()
-    await file.seek(0)
-    # Use MD5 to verify upload
-    md5_hash = hashlib.md5(file.file.read()).hexdigest()  # noqa: S324
-    await file.seek(0)
+    # The SHA256 prefix goes in the key, so the body is hashed before upload.
+    sha_hash, md5_hash, content_type = _digest_and_sniff(
+        iter(lambda: file.file.read(_READ_CHUNK_BYTES), b"")
+    )
     # guess_extension will return None if this fails
-    extension = guess_extension(magic.from_buffer(file.file.read(), mime=True)) or ""
+    extension = guess_extension(content_type) or ""
 
     # Generate organized bucket key
     bucket_key = _generate_detection_bucket_key(
@@ -296,13 +457,23 @@ async def upload_file(
         extension=extension,
     )
 
-    # Reset byte position of the file
+    # Reset byte position of the file; the bucket then streams it from the
+    # spooled upload in parts instead of reading it whole.
     await file.seek(0)
     bucket_name = s3_service.resolve_bucket_name()
     bucket = s3_service.get_bucket(bucket_name)
 
     # Upload the file
-    if not bucket.upload_file(bucket_key, file.file):  # type: ignore[arg-type]
+    # S3 checks the body against its Content-MD5 unless verification is
+    # configured to happen by HEAD after the upload instead.
+    content_md5 = None if settings.S3_VERIFY_UPLOADS_WITH_HEAD else md5_hash
+    with _bad_digest_is_corruption():
+        uploaded = bucket.upload_file(
+            bucket_key,
+            file.file,  # type: ignore[arg-type]
+            content_md5=content_md5,
+        )
+    if not uploaded:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed upload",
@@ -313,34 +484,8 @@ async def upload_file(
         bucket_key,
     )
 
-    # Data integrity check when metadata is available
-    if hasattr(bucket, "get_file_metadata"):
-        try:
-            file_meta = bucket.get_file_metadata(bucket_key)  # type: ignore[attr-defined]
-        except Exception as exc:  # pragma: no cover
-            logging.warning(
-                "Could not retrieve file metadata for %s: %s",
-                bucket_key,
-                exc,
-            )
-        else:
-            # Original behavior with ETag and MD5
-            etag = file_meta.get("ETag") or file_meta.get("etag")
-            if etag is not None and md5_hash != etag.replace('"', ""):
-                # Delete the corrupted upload if supported
-                if hasattr(bucket, "delete_file"):
-                    try:
-                        bucket.delete_file(bucket_key)  # type: ignore[attr-defined]
-                    except Exception as exc:  # pragma: no cover
-                        logging.warning(
-                            "Failed to delete corrupted file %s: %s",
-                            bucket_key,
-                            exc,
-                        )
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Data was corrupted during upload",
-                )
+    if settings.S3_VERIFY_UPLOADS_WITH_HEAD:
+        _verify_upload_etag(bucket, bucket_key, md5_hash)
 
     return bucket_key
 
@@ -382,9 +527,10 @@ def _store_downloaded_image(
     round trip. Run it in a thread — on the event loop it serialized every
     other request behind it.
     """
-    sha_hash = hashlib.sha256(image_bytes).hexdigest()
-    md5_hash = hashlib.md5(image_bytes).hexdigest()  # noqa: S324
-    content_type = magic.from_buffer(image_bytes, mime=True)
+    view = memoryview(image_bytes)
+    sha_hash, md5_hash, content_type = _digest_and_sniff(
+        view[i : i + _READ_CHUNK_BYTES] for i in range(0, len(view), _READ_CHUNK_BYTES)
+    )
     extension = guess_extension(content_type) or ""
 
     bucket_key = _generate_detection_bucket_key(
@@ -398,33 +544,23 @@ def _store_downloaded_image(
     bucket_name = s3_service.resolve_bucket_name()
     bucket = s3_service.get_bucket(bucket_name)
 
-    if not bucket.upload_file_bytes(
-        image_bytes, bucket_key, content_type or "application/octet-stream"
-    ):
+    content_md5 = None if settings.S3_VERIFY_UPLOADS_WITH_HEAD else md5_hash
+    with _bad_digest_is_corruption():
+        uploaded = bucket.upload_file_bytes(
+            image_bytes,
+            bucket_key,
+            content_type or "application/octet-stream",
+            content_md5=content_md5,
+        )
+    if not uploaded:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed upload",
         )
     logging.info("File uploaded to bucket %s with key %s.", bucket_name, bucket_key)
 
-    # Data integrity check
-    try:
-        file_meta = bucket.get_file_metadata(bucket_key)
-    except Exception as exc:
-        logging.warning("Could not retrieve file metadata for %s: %s", bucket_key, exc)
-    else:
-        etag = file_meta.get("ETag") or file_meta.get("etag")
-        if etag is not None and md5_hash != etag.replace('"', ""):
-            try:
-                bucket.delete_file(bucket_key)
-            except Exception as exc:
-                logging.warning(
-                    "Failed to delete corrupted file %s: %s", bucket_key, exc
-                )
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Data was corrupted during upload",
-            )
+    if settings.S3_VERIFY_UPLOADS_WITH_HEAD:
+        _verify_upload_etag(bucket, bucket_key, md5_hash)
 
     return bucket_key
 
@@ -10,15 +10,20 @@ false positives that don't line up with any confirmed object. The result is
 read-only reference; the human ground truth is seeded from it at submit.
 """
 
+import asyncio
 import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import UTC, datetime
-from io import BytesIO
-from typing import Sequence
+from typing import Any, AsyncIterator, List, Sequence, Tuple
 
 import numpy as np
 from PIL import Image
 from procrastinate import App, PsycopgConnector
-from sqlalchemy import select
+from sqlalchemy import Integer, column, select, update, values
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
@@ -27,8 +32,15 @@ from app.models import Detection
 from app.models import Sequence as SequenceModel
 from app.services.auto_annotate_scheduling import schedule_pending_auto_annotate
 from app.services.group_assignment import assign_ungrouped_sequences
+from app.services.inference_pool import InferencePool, build_detector
+from app.services.prediction_cache import (
+    image_key,
+    load_cached_predictions,
+    store_predictions,
+)
 from app.services.smoke_detector import (
     SmokeDetector,
+    decode_image,
     group_and_merge_boxes,
     keep_boxes_overlapping,
 )
@@ -36,24 +48,28 @@ from app.services.storage import s3_service
 
 logger = logging.getLogger(__name__)
 
-app = App(connector=PsycopgConnector(conninfo=settings.procrastinate_dsn))
+# With several inference processes, run as many jobs at once to keep them fed
+# (see app.services.inference_pool). An explicit --concurrency still wins.
+app = App(
+    connector=PsycopgConnector(conninfo=settings.procrastinate_dsn),
+    worker_defaults={"concurrency": max(1, settings.AUTOANNOTATE_INFERENCE_PROCESSES)},
+)
 
-_detector: SmokeDetector | None = None
+_detector: SmokeDetector | InferencePool | None = None
 
 
-def get_detector() -> SmokeDetector:
+def get_detector() -> SmokeDetector | InferencePool:
+    """The worker's detector, loaded on first use: in-process, or a pool of
+    child processes when AUTOANNOTATE_INFERENCE_PROCESSES > 1. Both expose
+    ``max_batch_size`` and a blocking ``predict_batch``."""
     global _detector
     if _detector is None:
-        _detector = SmokeDetector(
-            model_path=settings.AUTOANNOTATE_MODEL_PATH,
-            conf=settings.AUTOANNOTATE_CONF,
-            iou=settings.AUTOANNOTATE_IOU,
-            imgsz=settings.AUTOANNOTATE_IMGSZ,
-        )
+        processes = settings.AUTOANNOTATE_INFERENCE_PROCESSES
+        _detector = InferencePool(processes) if processes > 1 else build_detector()
     return _detector
 
 
-def engine_seed_boxes(detections: Sequence[Detection]) -> np.ndarray:
+def engine_seed_boxes(detections: Sequence[Any]) -> np.ndarray:
     """Aggregate every detection's engine (algo_predictions) boxes into a single
     ``(N, 5)`` ``[x1, y1, x2, y2, conf]`` array — the anchor that localizes the
     sequence's real objects."""
@@ -65,20 +81,97 @@ def engine_seed_boxes(detections: Sequence[Detection]) -> np.ndarray:
     return np.array(rows, dtype=np.float64) if rows else np.zeros((0, 5))
 
 
+@dataclass
+class LaneTimings:
+    """Where a lane's time went. ``download``/``decode`` are summed over the
+    prefetch threads, so together they can exceed the wall-clock ``total``."""
+
+    download: float = 0.0
+    decode: float = 0.0
+    inference: float = 0.0
+    total: float = 0.0
+    cache_hits: int = 0
+
+
+def fetch_frame(bucket_name: str, bucket_key: str) -> Tuple[Image.Image, float, float]:
+    """Download and fully decode one frame; returns it with the download and
+    decode durations. Runs on a prefetch thread (each thread gets its own
+    boto3 client from ``s3_service``); PIL releases the GIL while decoding,
+    and large JPEGs are decoded at reduced scale (see ``decode_image``)."""
+    started = time.perf_counter()
+    image_bytes = s3_service.get_bucket(bucket_name).download_file(bucket_key)
+    downloaded = time.perf_counter()
+    img = decode_image(image_bytes, settings.AUTOANNOTATE_IMGSZ)
+    return img, downloaded - started, time.perf_counter() - downloaded
+
+
+async def prefetched_batches(
+    detections: Sequence[Any], batch_size: int, timings: LaneTimings
+) -> AsyncIterator[List[Tuple[Any, Image.Image]]]:
+    """Yield ``(detection, image)`` batches in lane order while the next
+    frames download and decode on a bounded thread pool.
+
+    At most two batches are in flight, so the following batch is fetched
+    while the consumer runs inference on the current one, and memory stays
+    bounded whatever the lane length. A frame that fails to download or
+    decode is logged and left out of its batch.
+    """
+    loop = asyncio.get_running_loop()
+    bucket_name = s3_service.resolve_bucket_name()
+    pending = iter(detections)
+    inflight: deque = deque()
+    with ThreadPoolExecutor(
+        max_workers=settings.AUTOANNOTATE_PREFETCH_WORKERS,
+        thread_name_prefix="auto-annotate-fetch",
+    ) as pool:
+
+        def refill() -> None:
+            while len(inflight) < 2 * batch_size:
+                det = next(pending, None)
+                if det is None:
+                    return
+                inflight.append(
+                    (
+                        det,
+                        loop.run_in_executor(
+                            pool, fetch_frame, bucket_name, det.bucket_key
+                        ),
+                    )
+                )
+
+        refill()
+        while inflight:
+            frames = []
+            while inflight and len(frames) < batch_size:
+                det, future = inflight.popleft()
+                refill()
+                try:
+                    img, download_s, decode_s = await future
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("auto-annotate detection %s failed: %s", det.id, exc)
+                    continue
+                timings.download += download_s
+                timings.decode += decode_s
+                frames.append((det, img))
+            if frames:
+                yield frames
+
+
 @app.task(name="auto_annotate_sequence")
 async def auto_annotate_sequence(sequence_id: int) -> None:
     detector = get_detector()
-    bucket = s3_service.get_bucket(s3_service.resolve_bucket_name())
+    timings = LaneTimings()
+    started = time.perf_counter()
     async with AsyncSession(engine) as session:
+        # Only the columns the job reads: the auto_predictions/others_bboxes
+        # blobs are never needed here, so they are not fetched or decoded.
         detections = (
-            (
-                await session.execute(
-                    select(Detection).where(Detection.sequence_id == sequence_id)
-                )
+            await session.execute(
+                select(
+                    Detection.id, Detection.bucket_key, Detection.algo_predictions
+                ).where(Detection.sequence_id == sequence_id)
             )
-            .scalars()
-            .all()
-        )
+        ).all()
 
         # Aggregate engine predictions across the sequence and cluster them into
         # persistent objects. Every member box of every group is an anchor: a
@@ -94,29 +187,74 @@ async def auto_annotate_sequence(sequence_id: int) -> None:
             else np.zeros((0, 4))
         )
 
-        annotated = 0
-        for det in detections:
+        # Frames already inferred under this model configuration (a sibling
+        # lane sharing the photo, or an earlier run of this lane) come from
+        # the cache; only the rest are downloaded and inferred, once per photo.
+        # Siblings store a shared photo under keys of their own, so frames are
+        # matched by image_key rather than by bucket_key.
+        photos = {det.id: image_key(det.bucket_key) for det in detections}
+        preds_by_photo = await load_cached_predictions(session, photos.values())
+        timings.cache_hits = len(preds_by_photo)
+        misses = list(
+            {
+                photos[det.id]: det
+                for det in detections
+                if photos[det.id] not in preds_by_photo
+            }.values()
+        )
+
+        fresh: dict = {}
+        # Download/decode runs ahead on a thread pool while inference (one
+        # session run per batch, see SmokeDetector.predict_batch) runs in
+        # another thread, so neither blocks the event loop and S3 latency
+        # overlaps compute.
+        async for frames in prefetched_batches(
+            misses, detector.max_batch_size, timings
+        ):
+            inference_started = time.perf_counter()
             try:
-                image_bytes = bucket.download_file(det.bucket_key)
-                preds = detector.predict(Image.open(BytesIO(image_bytes)))
+                batch_preds = await asyncio.to_thread(
+                    detector.predict_batch, [img for _, img in frames]
+                )
             except Exception as exc:  # noqa: BLE001
-                logger.warning("auto-annotate detection %s failed: %s", det.id, exc)
+                logger.warning(
+                    "auto-annotate detections %s failed: %s",
+                    [det.id for det, _ in frames],
+                    exc,
+                )
                 continue
-            # Keep only predictions overlapping an engine-confirmed object; write
-            # them (immutable, whole-replace -> re-running is idempotent).
+            finally:
+                timings.inference += time.perf_counter() - inference_started
+            for (det, _), preds in zip(frames, batch_preds):
+                fresh[photos[det.id]] = preds
+        await store_predictions(session, fresh)
+        preds_by_photo.update(fresh)
+
+        auto_predictions = []
+        for det in detections:
+            preds = preds_by_photo.get(photos[det.id])
+            if preds is None:
+                continue
+            # Keep only predictions overlapping an engine-confirmed object;
+            # write them (immutable, whole-replace -> re-running is
+            # idempotent).
             kept = keep_boxes_overlapping(preds, anchor)
-            det.auto_predictions = {
-                "predictions": [
+            auto_predictions.append(
+                (
+                    det.id,
                     {
-                        "xyxyn": [float(x1), float(y1), float(x2), float(y2)],
-                        "confidence": float(conf),
-                        "class_name": "smoke",
-                    }
-                    for (x1, y1, x2, y2, conf) in kept
-                ]
-            }
-            session.add(det)
-            annotated += 1
+                        "predictions": [
+                            {
+                                "xyxyn": [float(x1), float(y1), float(x2), float(y2)],
+                                "confidence": float(conf),
+                                "class_name": "smoke",
+                            }
+                            for (x1, y1, x2, y2, conf) in kept
+                        ]
+                    },
+                )
+            )
+        annotated = len(auto_predictions)
         # Total failure (e.g. S3 outage): fail the job instead of stamping —
         # a stamped lane with no reference layer would surface in the queue
         # and never be revisited. The sweep re-enqueues stale stamped lanes
@@ -126,19 +264,42 @@ async def auto_annotate_sequence(sequence_id: int) -> None:
                 f"auto-annotate sequence {sequence_id}: all "
                 f"{len(detections)} detections failed; not stamping"
             )
-        # Completion marker: the localization queue only surfaces lanes whose
-        # reference layer exists (spec: smoke-localization entry point).
-        sequence = await session.get(SequenceModel, sequence_id)
-        if sequence is not None:
-            sequence.auto_annotated_at = datetime.now(UTC)
-            session.add(sequence)
+        if auto_predictions:
+            # The whole lane in one UPDATE ... FROM (VALUES ...) rather than
+            # one UPDATE per detection.
+            rows = values(
+                column("id", Integer),
+                column("auto_predictions", JSONB),
+                name="lane_predictions",
+            ).data(auto_predictions)
+            await session.execute(
+                update(Detection)
+                .where(Detection.id == rows.c.id)
+                .values(auto_predictions=rows.c.auto_predictions)
+            )
+        # Completion marker, committed with the predictions: the localization
+        # queue only surfaces lanes whose reference layer exists (spec:
+        # smoke-localization entry point).
+        await session.execute(
+            update(SequenceModel)
+            .where(SequenceModel.id == sequence_id)
+            .values(auto_annotated_at=datetime.now(UTC))
+        )
         await session.commit()
+    timings.total = time.perf_counter() - started
     logger.info(
-        "auto-annotated sequence %s (%d/%d detections, %d anchor boxes)",
+        "auto-annotated sequence %s (%d/%d detections, %d anchor boxes, "
+        "%d cached photos) in %.2fs (download %.2fs, decode %.2fs, "
+        "inference %.2fs)",
         sequence_id,
         annotated,
         len(detections),
         anchor.shape[0],
+        timings.cache_hits,
+        timings.total,
+        timings.download,
+        timings.decode,
+        timings.inference,
     )
 
 
@@ -0,0 +1,45 @@
+"""Add auto_prediction_cache table
+
+Revision ID: e7f8a9b0c1d2
+Revises: d6e7f8a9b0c1
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "e7f8a9b0c1d2"
+down_revision = "d6e7f8a9b0c1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "auto_prediction_cache",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("image_key", sa.String(), nullable=False),
+        sa.Column("model_name", sa.String(), nullable=False),
+        sa.Column("model_version", sa.String(), nullable=False),
+        sa.Column("conf", sa.Float(), nullable=False),
+        sa.Column("imgsz", sa.Integer(), nullable=False),
+        sa.Column(
+            "predictions", postgresql.JSONB(astext_type=sa.Text()), nullable=False
+        ),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "image_key",
+            "model_name",
+            "model_version",
+            "conf",
+            "imgsz",
+            name="uq_auto_prediction_cache_key",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("auto_prediction_cache")
@@ -0,0 +1,163 @@
+"""Add alert_changes log and the triggers that feed it
+
+Revision ID: f8a9b0c1d2e3
+Revises: e7f8a9b0c1d2
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "f8a9b0c1d2e3"
+down_revision = "e7f8a9b0c1d2"
+branch_labels = None
+depends_on = None
+
+# Every table the alert export reads from, with the statements that can change
+# what it returns. Sequence/detection UPDATEs are narrowed to exported columns
+# so worker bookkeeping (auto_annotated_at, auto_predictions, ...) stays out.
+TRIGGERS = {
+    "sequences": (
+        "INSERT OR DELETE OR UPDATE OF source_api, platform_alert_id, camera_id, "
+        "camera_name, organisation_id, organisation_name, lat, lon, azimuth, "
+        "recorded_at, temporal_model_score, temporal_model_version, "
+        "temporal_api_version"
+    ),
+    "detections": "INSERT OR DELETE OR UPDATE OF sequence_id, recorded_at, bucket_key",
+    "sequences_annotations": "INSERT OR DELETE OR UPDATE",
+    "detections_annotations": "INSERT OR DELETE OR UPDATE",
+    "alert_skips": "INSERT OR DELETE OR UPDATE",
+}
+
+# One statement each: asyncpg runs a single command per execute.
+FUNCTIONS = (
+    # anyenum rather than sourceapi: a typed parameter would pin the enum, and
+    # metadata.drop_all (test/dev resets) could no longer drop it.
+    """
+CREATE OR REPLACE FUNCTION record_alert_change(p_source_api anyenum, p_platform_alert_id bigint)
+RETURNS void LANGUAGE sql AS $$
+    INSERT INTO alert_changes (source_api, platform_alert_id, change_xid, changed_at)
+    VALUES (p_source_api, p_platform_alert_id, pg_current_xact_id()::text::bigint, now())
+    ON CONFLICT (source_api, platform_alert_id) DO UPDATE
+        SET change_xid = EXCLUDED.change_xid, changed_at = EXCLUDED.changed_at
+        -- A bulk statement touches the same alert many times: write it once.
+        WHERE alert_changes.change_xid <> EXCLUDED.change_xid
+$$
+""",
+    """
+CREATE OR REPLACE FUNCTION alert_change_from_sequences() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        PERFORM record_alert_change(OLD.source_api, OLD.platform_alert_id);
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        PERFORM record_alert_change(NEW.source_api, NEW.platform_alert_id);
+    END IF;
+    RETURN NULL;
+END $$
+""",
+    """
+CREATE OR REPLACE FUNCTION alert_change_from_detections() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    -- Cascading deletes may already have removed the sequence; its own
+    -- DELETE trigger records the alert then.
+    PERFORM record_alert_change(s.source_api, s.platform_alert_id)
+    FROM sequences s
+    WHERE s.id IN (
+        CASE WHEN TG_OP <> 'INSERT' THEN OLD.sequence_id END,
+        CASE WHEN TG_OP <> 'DELETE' THEN NEW.sequence_id END
+    );
+    RETURN NULL;
+END $$
+""",
+    """
+CREATE OR REPLACE FUNCTION alert_change_from_sequences_annotations() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM record_alert_change(s.source_api, s.platform_alert_id)
+    FROM sequences s
+    WHERE s.id IN (
+        CASE WHEN TG_OP <> 'INSERT' THEN OLD.sequence_id END,
+        CASE WHEN TG_OP <> 'DELETE' THEN NEW.sequence_id END
+    );
+    RETURN NULL;
+END $$
+""",
+    """
+CREATE OR REPLACE FUNCTION alert_change_from_detections_annotations() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM record_alert_change(s.source_api, s.platform_alert_id)
+    FROM detections d JOIN sequences s ON s.id = d.sequence_id
+    WHERE d.id IN (
+        CASE WHEN TG_OP <> 'INSERT' THEN OLD.detection_id END,
+        CASE WHEN TG_OP <> 'DELETE' THEN NEW.detection_id END
+    );
+    RETURN NULL;
+END $$
+""",
+    """
+CREATE OR REPLACE FUNCTION alert_change_from_alert_skips() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        PERFORM record_alert_change(OLD.source_api, OLD.platform_alert_id);
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        PERFORM record_alert_change(NEW.source_api, NEW.platform_alert_id);
+    END IF;
+    RETURN NULL;
+END $$
+""",
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "alert_changes",
+        sa.Column(
+            "source_api",
+            postgresql.ENUM(
+                "PYRONEAR_FRENCH_API",
+                "ALERT_WILDFIRE",
+                "CENIA",
+                name="sourceapi",
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("platform_alert_id", sa.BigInteger(), nullable=False),
+        sa.Column("change_xid", sa.BigInteger(), nullable=False),
+        sa.Column("changed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("source_api", "platform_alert_id"),
+    )
+    op.create_index("ix_alert_change_xid", "alert_changes", ["change_xid"])
+
+    # Seed every existing alert at this migration's transaction, so a sync
+    # starting from token 0 sees the whole history once.
+    op.execute(
+        "INSERT INTO alert_changes (source_api, platform_alert_id, change_xid, changed_at) "
+        "SELECT DISTINCT source_api, platform_alert_id, "
+        "pg_current_xact_id()::text::bigint, now() FROM sequences"
+    )
+
+    for function in FUNCTIONS:
+        op.execute(function)
+    for table, events in TRIGGERS.items():
+        op.execute(
+            f"CREATE TRIGGER {table}_alert_change AFTER {events} ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION alert_change_from_{table}()"
+        )
+
+
+def downgrade() -> None:
+    for table in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_alert_change ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS alert_change_from_{table}()")
+    op.execute("DROP FUNCTION IF EXISTS record_alert_change(anyenum, bigint)")
+    op.drop_index("ix_alert_change_xid", table_name="alert_changes")
+    op.drop_table("alert_changes")
@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta, UTC
+
+import pytest
+from httpx import AsyncClient
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Detection, Sequence, SequenceAnnotation
+from app.services.storage import s3_service
+
+now = datetime.now(UTC)
+PLATFORM_ALERT_ID = 4710
+
+
+def _source_url(key: str, content: bytes | None = None) -> str:
+    """A URL the API can fetch; the object is only written when content is
+    given, so a missing key makes the server-side download fail."""
+    bucket = s3_service.get_bucket(s3_service.resolve_bucket_name())
+    if content is not None:
+        bucket.upload_file_bytes(content, key, "image/jpeg")
+    return bucket._s3.generate_presigned_url(
+        "get_object", Params={"Bucket": bucket.name, "Key": key}, ExpiresIn=3600
+    )
+
+
+def _lane(alert_api_id: int, detection_ids, source_url: str) -> dict:
+    box = [0.1, 0.1, 0.2, 0.2]
+    return {
+        "sequence": {
+            "source_api": "pyronear_french",
+            "alert_api_id": alert_api_id,
+            "recorded_at": (now - timedelta(hours=1)).isoformat(),
+            "last_seen_at": now.isoformat(),
+            "camera_name": "cam-01",
+            "camera_id": 7,
+            "lat": 44.0,
+            "lon": 5.0,
+            "organisation_name": "org",
+            "organisation_id": 1,
+        },
+        "detections": [
+            {
+                "alert_api_id": detection_id,
+                "recorded_at": (now - timedelta(minutes=detection_id)).isoformat(),
+                "algo_predictions": {
+                    "predictions": [
+                        {"xyxyn": box, "confidence": 0.9, "class_name": "smoke"}
+                    ]
+                },
+                "source_url": source_url,
+            }
+            for detection_id in detection_ids
+        ],
+        "annotation": {
+            "sequences_bbox": [
+                {
+                    "is_smoke": True,
+                    "false_positive_types": [],
+                    "bboxes": [
+                        {"detection_id": detection_id, "xyxyn": box}
+                        for detection_id in detection_ids
+                    ],
+                }
+            ]
+        },
+    }
+
+
+def _alert(*lanes) -> dict:
+    return {
+        "source_api": "pyronear_french",
+        "platform_alert_id": PLATFORM_ALERT_ID,
+        "lanes": list(lanes),
+    }
+
+
+@pytest.mark.asyncio
+async def test_import_alert_creates_every_lane(
+    authenticated_client: AsyncClient, async_session: AsyncSession, mock_img: bytes
+):
+    source_url = _source_url("alert-import-source.jpg", mock_img)
+    payload = _alert(
+        _lane(PLATFORM_ALERT_ID, [11, 12], source_url),
+        _lane(1_000_000_000 + PLATFORM_ALERT_ID * 1000 + 1, [13], source_url),
+    )
+
+    response = await authenticated_client.post("/alerts/import", json=payload)
+    assert response.status_code == 201, response.text
+    body = response.json()
+    assert body["status"] == "created"
+    assert [lane["alert_api_id"] for lane in body["lanes"]] == [
+        PLATFORM_ALERT_ID,
+        1_000_000_000 + PLATFORM_ALERT_ID * 1000 + 1,
+    ]
+
+    sequences = (await async_session.exec(select(Sequence).order_by(Sequence.id))).all()
+    assert [s.platform_alert_id for s in sequences] == [PLATFORM_ALERT_ID] * 2
+
+    first = body["lanes"][0]
+    annotation = await async_session.get(SequenceAnnotation, first["annotation_id"])
+    assert annotation.processing_stage == "ready_to_annotate"
+    assert annotation.has_smoke is True
+    # Seed boxes referenced alert_api_ids; they now point at the created rows.
+    assert sorted(
+        bbox["detection_id"]
+        for bbox in annotation.annotation["sequences_bbox"][0]["bboxes"]
+    ) == sorted(first["detection_ids"].values())
+
+    detections = (await async_session.exec(select(Detection))).all()
+    assert len(detections) == 3
+    assert all(d.bucket_key.startswith("detections/sequence_") for d in detections)
+
+    # Idempotent: a repeat writes nothing and answers with the stored lanes.
+    again = await authenticated_client.post("/alerts/import", json=payload)
+    assert again.status_code == 200, again.text
+    assert again.json()["status"] == "exists"
+    assert again.json()["lanes"] == body["lanes"]
+    assert len((await async_session.exec(select(Detection))).all()) == 3
+
+
+@pytest.mark.asyncio
+async def test_import_alert_is_all_or_nothing(
+    authenticated_client: AsyncClient, async_session: AsyncSession, mock_img: bytes
+):
+    source_url = _source_url("alert-import-partial.jpg", mock_img)
+    missing_url = _source_url("alert-import-missing.jpg")
+    bucket = s3_service.get_bucket(s3_service.resolve_bucket_name())
+
+    def stored_objects() -> int:
+        return bucket._s3.list_objects_v2(Bucket=bucket.name, Prefix="detections/").get(
+            "KeyCount", 0
+        )
+
+    before = stored_objects()
+    response = await authenticated_client.post(
+        "/alerts/import",
+        json=_alert(
+            _lane(PLATFORM_ALERT_ID, [21, 22], source_url),
+            _lane(PLATFORM_ALERT_ID + 1, [23], missing_url),
+        ),
+    )
+    assert response.status_code == 422, response.text
+    assert "alert_api_id=23" in response.json()["detail"]
+
+    assert (await async_session.exec(select(Sequence))).all() == []
+    assert (await async_session.exec(select(Detection))).all() == []
+    assert stored_objects() == before
+
+
+@pytest.mark.asyncio
+async def test_import_alert_rejects_inconsistent_payloads(
+    authenticated_client: AsyncClient, async_session: AsyncSession
+):
+    url = "http://example.invalid/1.jpg"
+
+    dangling = _lane(PLATFORM_ALERT_ID, [31], url)
+    dangling["annotation"]["sequences_bbox"][0]["bboxes"][0]["detection_id"] = 99
+    response = await authenticated_client.post("/alerts/import", json=_alert(dangling))
+    assert response.status_code == 422
+
+    foreign = _lane(PLATFORM_ALERT_ID, [31], url)
+    foreign["sequence"]["platform_alert_id"] = PLATFORM_ALERT_ID + 1
+    response = await authenticated_client.post("/alerts/import", json=_alert(foreign))
+    assert response.status_code == 422
+
+    assert (await async_session.exec(select(Sequence))).all() == []
@@ -686,3 +686,166 @@ async def test_concurrent_duplicate_alert_api_id_admits_one(
         f"expected exactly one winner, got {len(created)}: "
         f"{[(r.status_code, r.text) for r in responses]}"
     )
+
+
+def _batch_item(alert_api_id: int, **source) -> dict:
+    return {
+        "alert_api_id": alert_api_id,
+        "recorded_at": (now - timedelta(days=2)).isoformat(),
+        "algo_predictions": {
+            "predictions": [
+                {
+                    "xyxyn": [0.1, 0.1, 0.2, 0.2],
+                    "confidence": 0.9,
+                    "class_name": "smoke",
+                }
+            ]
+        },
+        **source,
+    }
+
+
+@pytest.mark.asyncio
+async def test_create_detections_batch(
+    authenticated_client: AsyncClient, sequence_session: AsyncSession, mock_img: bytes
+):
+    source_url = _reachable_source_url(mock_img, "batch-source.jpg")
+    first = await authenticated_client.post(
+        "/detections/batch",
+        json={
+            "sequence_id": 1,
+            "detections": [_batch_item(7001, source_url=source_url)],
+        },
+    )
+    assert first.status_code == 200, first.text
+    existing_id = first.json()["results"][0]["detection"]["id"]
+
+    response = await authenticated_client.post(
+        "/detections/batch",
+        json={
+            "sequence_id": 1,
+            "detections": [
+                _batch_item(7002, source_url=source_url),
+                _batch_item(7001, source_url=source_url),
+                _batch_item(7003, source_url=source_url),
+            ],
+        },
+    )
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    assert [(r["alert_api_id"], r["status"]) for r in results] == [
+        (7002, "created"),
+        (7001, "exists"),
+        (7003, "created"),
+    ]
+    assert results[1]["detection"]["id"] == existing_id
+    created = [results[0]["detection"], results[2]["detection"]]
+    assert all(d["bucket_key"].startswith("detections/sequence_1/") for d in created)
+    assert len({d["bucket_key"] for d in created}) == 2
+
+    listing = await authenticated_client.get("/detections/", params={"sequence_id": 1})
+    assert sorted(d["alert_api_id"] for d in listing.json()["items"]) == [
+        7001,
+        7002,
+        7003,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_create_detections_batch_reports_item_failures(
+    authenticated_client: AsyncClient, sequence_session: AsyncSession, mock_img: bytes
+):
+    """A failed storage operation fails its item only; the rest commit."""
+    source_url = _reachable_source_url(mock_img, "batch-partial-source.jpg")
+    bucket = s3_service.get_bucket(s3_service.resolve_bucket_name())
+    missing_url = bucket._s3.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": bucket.name, "Key": "batch-missing-source.jpg"},
+        ExpiresIn=3600,
+    )
+
+    response = await authenticated_client.post(
+        "/detections/batch",
+        json={
+            "sequence_id": 1,
+            "detections": [
+                _batch_item(7101, source_url=source_url),
+                _batch_item(7102, source_url=missing_url),
+                _batch_item(7101, source_url=source_url),
+            ],
+        },
+    )
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    assert results[0]["status"] == "created"
+    assert results[1]["status"] == "failed"
+    assert results[1]["status_code"] == 422
+    assert results[1]["detection"] is None
+    assert results[2]["status"] == "failed"
+    assert results[2]["status_code"] == 422
+
+    listing = await authenticated_client.get("/detections/", params={"sequence_id": 1})
+    assert [d["alert_api_id"] for d in listing.json()["items"]] == [7101]
+
+
+@pytest.mark.asyncio
+async def test_create_detections_batch_rejects_bad_requests(
+    authenticated_client: AsyncClient, sequence_session: AsyncSession
+):
+    unknown = await authenticated_client.post(
+        "/detections/batch",
+        json={
+            "sequence_id": 999,
+            "detections": [_batch_item(1, source_url="http://example.invalid/1.jpg")],
+        },
+    )
+    assert unknown.status_code == 404
+
+    for source in (
+        {},
+        {"source_url": "http://example.invalid/1.jpg", "source_key": "a/1.jpg"},
+    ):
+        ambiguous = await authenticated_client.post(
+            "/detections/batch",
+            json={"sequence_id": 1, "detections": [_batch_item(1, **source)]},
+        )
+        assert ambiguous.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_lookup_detections_by_alert_api_id(
+    authenticated_client: AsyncClient, sequence_session: AsyncSession, mock_img: bytes
+):
+    source_url = _reachable_source_url(mock_img, "lookup-source.jpg")
+    created = await authenticated_client.post(
+        "/detections/batch",
+        json={
+            "sequence_id": 1,
+            "detections": [
+                _batch_item(7101, source_url=source_url),
+                _batch_item(7102, source_url=source_url),
+            ],
+        },
+    )
+    assert created.status_code == 200, created.text
+    ids = {r["alert_api_id"]: r["detection"]["id"] for r in created.json()["results"]}
+
+    response = await authenticated_client.post(
+        "/detections/lookup",
+        json={"sequence_id": 1, "alert_api_ids": [7102, 7199, 7101]},
+    )
+    assert response.status_code == 200, response.text
+    assert [(d["alert_api_id"], d["id"]) for d in response.json()["detections"]] == [
+        (7101, ids[7101]),
+        (7102, ids[7102]),
+    ]
+
+    other_sequence = await authenticated_client.post(
+        "/detections/lookup", json={"sequence_id": 2, "alert_api_ids": [7101]}
+    )
+    assert other_sequence.json()["detections"] == []
+
+    listing = await authenticated_client.get(
+        "/detections/", params={"sequence_id": 1, "alert_api_id": [7102, 7199]}
+    )
+    assert [d["id"] for d in listing.json()["items"]] == [ids[7102]]
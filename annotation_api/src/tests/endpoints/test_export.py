@@ -11,6 +11,8 @@ from PIL import Image
 from sqlalchemy import delete, update
 
 from app import models
+from app.db import engine, get_session
+from app.main import app
 from app.services import storage as storage_module
 
 now = datetime.now(UTC)
@@ -22,7 +24,7 @@ class DummyBucket:
     def __init__(self) -> None:
         self._files: Dict[str, bytes] = {}
 
-    def upload_file(self, key: str, file_obj) -> bool:
+    def upload_file(self, key: str, file_obj, content_md5=None) -> bool:
         pos = file_obj.tell()
         data = file_obj.read()
         file_obj.seek(pos)
@@ -1081,3 +1083,214 @@ async def test_export_alerts_excludes_skipped_alerts(
 
     resp = await authenticated_client.get("/export/alerts")
     assert [i["platform_alert_id"] for i in resp.json()["items"]] == [7701, 7702]
+
+
+def _ndjson_items(resp) -> List[dict]:
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in resp.text.splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_export_alerts_ndjson_streams_past_page_limit(
+    authenticated_client: AsyncClient,
+    sequence_session,
+    detection_session,
+    dummy_bucket,
+):
+    """ndjson streams every alert, one per line, identical to the paged JSON
+    items; limit only sizes the round trips. Lanes and frames of a
+    multi-lane alert stay with their own alert across round-trip edges."""
+    await seed_minimal_fp_alert(authenticated_client, platform_alert_id=7801)
+    lane_ids = []
+    for alert_api_id in (7802, 7803):
+        seq_id = await create_lane(
+            authenticated_client, platform_alert_id=7802, alert_api_id=alert_api_id
+        )
+        det_ids = [
+            await create_frame(
+                authenticated_client,
+                sequence_id=seq_id,
+                alert_api_id=i,
+                recorded_at=now - timedelta(minutes=i),
+            )
+            for i in (1, 2)
+        ]
+        await annotate_lane(
+            authenticated_client,
+            sequence_id=seq_id,
+            detection_ids=det_ids,
+            is_smoke=False,
+            false_positive_types=["antenna"],
+        )
+        lane_ids.append(seq_id)
+    await seed_minimal_fp_alert(authenticated_client, platform_alert_id=7804)
+
+    paged = []
+    cursor = None
+    while True:
+        params = {"limit": 1} if cursor is None else {"limit": 1, "cursor": cursor}
+        body = (await authenticated_client.get("/export/alerts", params=params)).json()
+        paged.extend(body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    streamed = _ndjson_items(
+        await authenticated_client.get(
+            "/export/alerts", params={"format": "ndjson", "limit": 1}
+        )
+    )
+    assert [i["platform_alert_id"] for i in streamed] == [7801, 7802, 7804]
+    assert streamed == paged
+    multi = streamed[1]
+    assert [o["sequence_id"] for o in multi["objects"]] == lane_ids
+    assert all(len(o["frames"]) == 2 for o in multi["objects"])
+
+
+@pytest.mark.asyncio
+async def test_export_alerts_ndjson_cursor_and_filters(
+    authenticated_client: AsyncClient,
+    sequence_session,
+    detection_session,
+    dummy_bucket,
+):
+    """A cursor resumes the stream strictly after it, filters apply as in
+    JSON mode, and an empty result is an empty body."""
+    for pid in (7811, 7812, 7813):
+        await seed_minimal_fp_alert(authenticated_client, platform_alert_id=pid)
+
+    resp = await authenticated_client.get(
+        "/export/alerts",
+        params={"format": "ndjson", "cursor": "pyronear_french:7811"},
+    )
+    assert [i["platform_alert_id"] for i in _ndjson_items(resp)] == [7812, 7813]
+
+    resp = await authenticated_client.get(
+        "/export/alerts", params={"format": "ndjson", "camera_id": 999}
+    )
+    assert _ndjson_items(resp) == []
+
+    resp = await authenticated_client.get(
+        "/export/alerts", params={"format": "ndjson", "cursor": "nonsense"}
+    )
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_export_alerts_ndjson_returns_its_connection_to_the_pool(
+    authenticated_client: AsyncClient,
+    sequence_session,
+    detection_session,
+    dummy_bucket,
+):
+    """Through the real get_session, not the conftest override: the stream
+    runs after the dependency has closed its session, so it must release the
+    connection it reads with itself."""
+    await seed_minimal_fp_alert(authenticated_client, platform_alert_id=7821)
+    app.dependency_overrides.pop(get_session)
+    pool = engine.sync_engine.pool
+    checked_out = pool.checkedout()
+
+    for export_format in ("json", "ndjson", "ndjson"):
+        resp = await authenticated_client.get(
+            "/export/alerts", params={"format": export_format}
+        )
+        assert resp.status_code == 200, resp.text
+        assert pool.checkedout() == checked_out, export_format
+    assert [i["platform_alert_id"] for i in _ndjson_items(resp)] == [7821]
+
+
+async def _pull_changes(client: AsyncClient, since: int, limit: int = 100):
+    """Run one complete incremental sync; returns exported ids, withdrawn ids
+    and the token for the next sync."""
+    items, withdrawn = [], []
+    params = {"since": since, "limit": limit}
+    while True:
+        resp = await client.get("/export/alerts/changes", params=params)
+        assert resp.status_code == 200, resp.text
+        body = resp.json()
+        items.extend(i["platform_alert_id"] for i in body["items"])
+        withdrawn.extend(k["platform_alert_id"] for k in body["withdrawn"])
+        if body["next_cursor"] is None:
+            return items, withdrawn, body["sync_token"]
+        params = {"cursor": body["next_cursor"], "limit": limit}
+
+
+@pytest.mark.asyncio
+async def test_export_alert_changes_since_token(
+    authenticated_client: AsyncClient,
+    sequence_session,
+    detection_session,
+    dummy_bucket,
+    async_session,
+):
+    """A full sync returns every exportable alert; the next one, from its
+    token, returns only alerts changed since, with alerts that stopped
+    exporting listed as withdrawn. Paging does not change the result."""
+    await seed_minimal_fp_alert(authenticated_client, platform_alert_id=7901)
+
+    items, _, token = await _pull_changes(authenticated_client, since=0)
+    assert 7901 in items
+    assert await _pull_changes(authenticated_client, since=token) == ([], [], token)
+
+    await seed_minimal_fp_alert(authenticated_client, platform_alert_id=7902)
+    async_session.add(
+        models.AlertSkip(
+            source_api=models.SourceApi("pyronear_french"), platform_alert_id=7901
+        )
+    )
+    await async_session.commit()
+
+    for limit in (100, 1):
+        items, withdrawn, _ = await _pull_changes(
+            authenticated_client, since=token, limit=limit
+        )
+        assert items == [7902]
+        assert withdrawn == [7901]
+
+
+@pytest.mark.asyncio
+async def test_export_alert_changes_tracks_exported_columns_only(
+    authenticated_client: AsyncClient,
+    sequence_session,
+    detection_session,
+    dummy_bucket,
+    async_session,
+):
+    """A temporal-score refresh (no annotation write) is a change; worker
+    bookkeeping on the same lane is not."""
+    seq_id = await seed_minimal_fp_alert(authenticated_client, platform_alert_id=7911)
+    _, _, token = await _pull_changes(authenticated_client, since=0)
+
+    await async_session.execute(
+        update(models.Sequence)
+        .where(models.Sequence.id == seq_id)
+        .values(auto_annotated_at=datetime.now(UTC))
+    )
+    await async_session.commit()
+    assert (await _pull_changes(authenticated_client, since=token))[:2] == ([], [])
+
+    await async_session.execute(
+        update(models.Sequence)
+        .where(models.Sequence.id == seq_id)
+        .values(temporal_model_score=0.7)
+    )
+    await async_session.commit()
+    resp = await authenticated_client.get(
+        "/export/alerts/changes", params={"since": token}
+    )
+    body = resp.json()
+    assert [i["platform_alert_id"] for i in body["items"]] == [7911]
+    assert body["items"][0]["temporal_model_score"] == 0.7
+
+
+@pytest.mark.asyncio
+async def test_export_alert_changes_malformed_cursor_422(
+    authenticated_client: AsyncClient,
+):
+    for bad in ("nonsense", "1:2", "1:x:pyronear_french:3", "1:2:mars_api:3"):
+        resp = await authenticated_client.get(
+            "/export/alerts/changes", params={"cursor": bad}
+        )
+        assert resp.status_code == 422, bad
@@ -2469,6 +2469,90 @@ async def test_patch_temporal_score_requires_all_three_fields(
     assert response.status_code == 422
 
 
+@pytest.mark.asyncio
+async def test_patch_temporal_scores_batch_reports_each_row(
+    authenticated_client: AsyncClient,
+):
+    first = await _create_scored_sequence(authenticated_client, "420", score="0.87")
+    second = await _create_scored_sequence(authenticated_client, "421")
+    # Synthetic sibling ids are BIGINTs beyond the int32 range.
+    sibling = await _create_scored_sequence(authenticated_client, str(2**31 + 421))
+
+    def row(alert_api_id, score):
+        return {
+            "source_api": "pyronear_french",
+            "alert_api_id": alert_api_id,
+            "temporal_model_score": score,
+            "temporal_model_version": "0.2.0" if score is not None else None,
+            "temporal_api_version": "0.3.1" if score is not None else None,
+        }
+
+    response = await authenticated_client.patch(
+        "/sequences/temporal-score/batch",
+        json={
+            "updates": [
+                row(421, 0.5),
+                row(999999997, 0.5),
+                row(2**31 + 421, 0.7),
+                # The sibling-reset case: explicit NULL clears the score.
+                row(420, None),
+                row(421, 0.9),
+            ]
+        },
+    )
+    assert response.status_code == 200
+    assert [
+        (r["alert_api_id"], r["status"], r["sequence_id"])
+        for r in response.json()["results"]
+    ] == [
+        (421, "updated", second["id"]),
+        (999999997, "not_found", None),
+        (2**31 + 421, "updated", sibling["id"]),
+        (420, "updated", first["id"]),
+        (421, "duplicate", None),
+    ]
+
+    fetched = await authenticated_client.get(f"/sequences/{second['id']}")
+    assert fetched.json()["temporal_model_score"] == 0.5
+    assert fetched.json()["temporal_model_version"] == "0.2.0"
+    fetched = await authenticated_client.get(f"/sequences/{sibling['id']}")
+    assert fetched.json()["temporal_model_score"] == 0.7
+    fetched = await authenticated_client.get(f"/sequences/{first['id']}")
+    assert fetched.json()["temporal_model_score"] is None
+    assert fetched.json()["temporal_model_version"] is None
+
+
+@pytest.mark.asyncio
+async def test_lookup_sequences_returns_stored_keys_with_temporal_columns(
+    authenticated_client: AsyncClient,
+):
+    scored = await _create_scored_sequence(authenticated_client, "410", score="0.42")
+    unscored = await _create_scored_sequence(authenticated_client, "411")
+
+    response = await authenticated_client.post(
+        "/sequences/lookup",
+        json={
+            "sequences": [
+                {"source_api": "pyronear_french", "alert_api_id": 411},
+                {"source_api": "pyronear_french", "alert_api_id": 410},
+                {"source_api": "pyronear_french", "alert_api_id": 999999998},
+                # Same alert_api_id, other source: not the same sequence.
+                {"source_api": "api_cenia", "alert_api_id": 410},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    found = response.json()["sequences"]
+    assert [(s["alert_api_id"], s["id"]) for s in found] == [
+        (410, scored["id"]),
+        (411, unscored["id"]),
+    ]
+    assert found[0]["source_api"] == "pyronear_french"
+    assert found[0]["temporal_model_score"] == 0.42
+    assert found[0]["temporal_model_version"] == "0.1.0"
+    assert found[1]["temporal_model_score"] is None
+
+
 @pytest.mark.asyncio
 async def test_patch_temporal_score_is_scoped_to_source_api(
     authenticated_client: AsyncClient,
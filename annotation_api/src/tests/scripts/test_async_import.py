@@ -0,0 +1,315 @@
+import asyncio
+import json
+from datetime import date
+
+import httpx
+import pytest
+from rich.console import Console
+
+import scripts.data_transfer.ingestion.alert_api.async_import as async_import
+import scripts.data_transfer.ingestion.alert_api.shared as shared
+
+from factories import make_record
+
+BOX = [0.1, 0.1, 0.2, 0.2, 0.9]
+
+
+class TestBudget:
+    def test_bounded_map_keeps_order_and_cap(self):
+        in_flight = 0
+        peak = 0
+
+        async def slow_double(n):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01 * (n % 3))
+            in_flight -= 1
+            return 2 * n
+
+        results = asyncio.run(async_import.bounded_map(slow_double, range(10), 3))
+        assert results == [2 * n for n in range(10)]
+        assert peak == 3
+
+    def test_host_budget_caps_requests_in_flight(self):
+        in_flight = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json={"path": request.url.path})
+
+        async def run():
+            budget = async_import.HostBudget(
+                "http://alert.test", 2, transport=httpx.MockTransport(handler)
+            )
+            try:
+                return await asyncio.gather(
+                    *(budget.get_json(f"/item/{i}", "token") for i in range(6))
+                )
+            finally:
+                await budget.aclose()
+
+        assert [r["path"] for r in asyncio.run(run())] == [
+            f"/item/{i}" for i in range(6)
+        ]
+        assert peak == 2
+
+    def test_get_json_retries_rate_limited_requests(self):
+        calls = 0
+
+        def handler(request):
+            nonlocal calls
+            calls += 1
+            if calls < 3:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return httpx.Response(200, json={"ok": True})
+
+        async def run():
+            budget = async_import.HostBudget(
+                "http://alert.test", 1, transport=httpx.MockTransport(handler)
+            )
+            try:
+                return await budget.get_json("/item", "token")
+            finally:
+                await budget.aclose()
+
+        assert asyncio.run(run()) == {"ok": True}
+        assert calls == 3
+
+    def test_get_json_raises_once_retries_are_spent(self):
+        async def run():
+            budget = async_import.HostBudget(
+                "http://alert.test",
+                1,
+                transport=httpx.MockTransport(lambda request: httpx.Response(503)),
+                max_retries=1,
+                retry_base_delay=0,
+            )
+            try:
+                await budget.get_json("/item", "token")
+            finally:
+                await budget.aclose()
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(run())
+
+    def test_rate_limit_spaces_request_starts(self):
+        starts = []
+
+        async def handler(request):
+            starts.append(asyncio.get_running_loop().time())
+            return httpx.Response(200, json={})
+
+        async def run():
+            budget = async_import.HostBudget(
+                "http://alert.test",
+                4,
+                transport=httpx.MockTransport(handler),
+                rate_limit=50,
+            )
+            try:
+                await asyncio.gather(
+                    *(budget.get_json(f"/item/{i}", "token") for i in range(4))
+                )
+            finally:
+                await budget.aclose()
+
+        asyncio.run(run())
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+        assert min(gaps) >= 0.015
+
+
+def _alert_api(request):
+    path = request.url.path
+    if path == "/api/v1/cameras/":
+        return httpx.Response(
+            200, json=[{"id": 7, "name": "cam-01", "organization_id": 1}]
+        )
+    if path == "/api/v1/organizations/":
+        return httpx.Response(200, json=[{"id": 1, "name": "org"}])
+    if path == "/api/v1/sequences/all/fromdate":
+        day = request.url.params["from_date"]
+        sid = 100 if day == "2026-07-01" else 200
+        return httpx.Response(
+            200,
+            json=[
+                {
+                    "id": sid + i,
+                    "camera_id": 7,
+                    "started_at": f"{day}T10:00:00",
+                    "last_seen_at": f"{day}T10:30:00",
+                    "temporal_model_score": None,
+                }
+                for i in range(2)
+            ],
+        )
+    sid = int(path.split("/")[4])
+    # Two rows share an image: records are one per bucket key.
+    return httpx.Response(
+        200,
+        json=[
+            {
+                "id": sid * 10 + i,
+                "created_at": "2026-07-01T10:00:00",
+                "bucket_key": f"{sid}-{min(i, 1)}.jpg",
+                "bbox": "[(0.1,0.1,0.2,0.2,0.9)]",
+            }
+            for i in range(3)
+        ],
+    )
+
+
+class TestFetch:
+    def test_fetch_matches_the_threaded_records(self):
+        records = async_import.fetch_all_sequences_within(
+            date_from=date(2026, 7, 1),
+            date_end=date(2026, 7, 2),
+            detections_limit=30,
+            detections_order_by="asc",
+            api_endpoint="http://alert.test",
+            access_token="token",
+            access_token_admin="admin",
+            concurrency=4,
+            selected_sequence_list=[100, 101, 200],
+            console=Console(quiet=True),
+            transport=httpx.MockTransport(_alert_api),
+        )
+
+        assert [r["sequence_id"] for r in records] == [100, 100, 101, 101, 200, 200]
+        assert records[0]["detection_bucket_key"] == "100-0.jpg"
+        assert records[0]["organization_name"] == "org"
+        assert records[0]["detection_bboxes"] == [[0.1, 0.1, 0.2, 0.2, 0.9]]
+
+    def test_long_listing_pages_are_fetched_concurrently(self, monkeypatch):
+        monkeypatch.setattr(async_import, "PAGE_SIZE", 2)
+        monkeypatch.setattr(async_import, "PAGE_READAHEAD", 3)
+        in_flight = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            offset = int(request.url.params["offset"])
+            # Seven sequences: pages of 2, 2, 2, then 1.
+            return httpx.Response(
+                200, json=[{"id": i} for i in range(offset, min(offset + 2, 7))]
+            )
+
+        async def run():
+            budget = async_import.HostBudget(
+                "http://alert.test", 8, transport=httpx.MockTransport(handler)
+            )
+            try:
+                return await async_import._sequences_for_date(
+                    budget, "token", date(2026, 7, 1), None
+                )
+            finally:
+                await budget.aclose()
+
+        sequences, complete = asyncio.run(run())
+        assert complete
+        assert [s["id"] for s in sequences] == list(range(7))
+        assert peak == 3
+
+
+class TestPost:
+    def _records(self):
+        records = [
+            make_record(1, "2026-07-01T10:00:00", [BOX], sid=47105),
+            make_record(2, "2026-07-01T10:01:00", [BOX], sid=1047105001),
+            # Not object-split: posted on its own.
+            make_record(3, "2026-07-01T10:00:00", [BOX], sid=555),
+        ]
+        for record in records[:2]:
+            record["platform_alert_id"] = 47105
+        return records
+
+    def test_alert_imports_and_lone_lanes(self, monkeypatch):
+        monkeypatch.setattr(
+            shared, "get_auth_token", lambda url, username, password: "token"
+        )
+        lone = []
+
+        def post_lane(url, sequence_records, token, **kwargs):
+            lone.append((sequence_records[0]["sequence_id"], kwargs))
+            return {
+                "success": True,
+                "sequence_id": 77,
+                "successful_detections": 1,
+                "failed_detections": 0,
+                "total_detections": 1,
+                "detection_results": [],
+            }
+
+        monkeypatch.setattr(shared, "post_sequence_to_annotation_api", post_lane)
+
+        def annotation_api(request):
+            if request.url.path == "/api/v1/sequences/lookup":
+                return httpx.Response(200, json={"sequences": []})
+            assert request.url.path == "/api/v1/alerts/import"
+            lanes = json.loads(request.content)["lanes"]
+            return httpx.Response(
+                201,
+                json={
+                    "status": "created",
+                    "lanes": [
+                        {
+                            "alert_api_id": lane["sequence"]["alert_api_id"],
+                            "sequence_id": 90 + i,
+                            "annotation_id": 80 + i,
+                            "detection_ids": {
+                                str(d["alert_api_id"]): 500 + d["alert_api_id"]
+                                for d in lane["detections"]
+                            },
+                        }
+                        for i, lane in enumerate(lanes)
+                    ],
+                },
+            )
+
+        result = async_import.post_records_to_annotation_api(
+            "http://annotation.test",
+            self._records(),
+            concurrency=2,
+            transport=httpx.MockTransport(annotation_api),
+        )
+
+        assert result["successful_sequences"] == 3
+        assert sorted(result["successful_sequence_ids"]) == [77, 90, 91]
+        assert [sid for sid, _ in lone] == [555]
+        # The synchronous lane path runs sequentially inside its slot.
+        assert lone[0][1]["max_detection_workers"] == 1
+        annotated = [r for r in result["sequence_results"] if r.get("annotation_id")]
+        assert len(annotated) == 2
+
+    def test_failed_import_falls_back_per_lane(self, monkeypatch):
+        monkeypatch.setattr(
+            shared, "get_auth_token", lambda url, username, password: "token"
+        )
+        posted = []
+
+        def post_lane(url, sequence_records, token, **kwargs):
+            posted.append(sequence_records[0]["sequence_id"])
+            raise shared.AnnotationAPIError("boom", status_code=500)
+
+        monkeypatch.setattr(shared, "post_sequence_to_annotation_api", post_lane)
+
+        result = async_import.post_records_to_annotation_api(
+            "http://annotation.test",
+            self._records(),
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(404, json={"detail": "Not Found"})
+            ),
+        )
+
+        assert sorted(posted) == [555, 47105, 1047105001]
+        assert result["failed_sequences"] == 3
+        assert result["failed_detections"] == 3
@@ -1,6 +1,10 @@
+import hashlib
 import json
+import threading
 from pathlib import Path
 
+import pytest
+
 from scripts.data_transfer.export.export_alerts import (
     ExportStats,
     frame_rel_path,
@@ -235,3 +239,162 @@ def test_run_export_frame_without_url_is_counted_not_downloaded(tmp_path):
         for line in (tmp_path / "manifest.jsonl").read_text().splitlines()
     ]
     assert lines[0]["objects"][0]["frames"][1]["image_path"] is None
+
+
+def test_run_export_parquet_dataset_partitions_and_roundtrips(tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow.dataset as ds
+
+    pages = two_page_export()
+    pages[1]["items"][0]["recorded_at"] = "2026-08-03T09:00:00+00:00"
+
+    stats = run_export(
+        fake_pages(pages), make_download([]), tmp_path, 2, output_format="parquet"
+    )
+    assert stats.alerts == 2
+    assert not (tmp_path / "manifest.jsonl").exists()
+    assert not (tmp_path / "alerts.parquet.tmp").exists()
+    assert sorted(
+        p.relative_to(tmp_path).as_posix()
+        for p in (tmp_path / "alerts.parquet").rglob("*.parquet")
+    ) == [
+        "alerts.parquet/source_api=pyronear_french/month=2026-07/part-0.parquet",
+        "alerts.parquet/source_api=pyronear_french/month=2026-08/part-0.parquet",
+    ]
+
+    dataset = ds.dataset(tmp_path / "alerts.parquet", partitioning="hive")
+    rows = sorted(dataset.to_table().to_pylist(), key=lambda r: r["platform_alert_id"])
+    assert [(r["source_api"], r["month"]) for r in rows] == [
+        ("pyronear_french", "2026-07"),
+        ("pyronear_french", "2026-08"),
+    ]
+    frame = rows[0]["objects"][0]["frames"][0]
+    assert frame["image_path"] == "images/pyronear_french/1234/10.jpg"
+    assert frame["boxes"][0]["xyxyn"] == [0.1, 0.1, 0.2, 0.2]
+    assert frame["recorded_at"].isoformat() == "2026-07-01T10:00:00+00:00"
+
+    filtered = dataset.to_table(filter=ds.field("month") == "2026-08")
+    assert filtered.column("platform_alert_id").to_pylist() == [5678]
+
+
+def test_run_export_parquet_rerun_replaces_dataset(tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow.dataset as ds
+
+    run_export(fake_pages(two_page_export()), make_download([]), tmp_path, 2, "parquet")
+    run_export(
+        fake_pages([two_page_export()[0]]), make_download([]), tmp_path, 2, "parquet"
+    )
+    dataset = ds.dataset(tmp_path / "alerts.parquet", partitioning="hive")
+    assert dataset.to_table().column("platform_alert_id").to_pylist() == [1234]
+
+
+def test_parquet_rows_are_grouped_per_partition_not_per_page(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    from scripts.data_transfer.export import parquet_dataset
+
+    monkeypatch.setattr(parquet_dataset, "ROW_GROUP_ROWS", 3)
+    template = to_manifest_item(two_page_export()[0]["items"][0], materialized=set())
+    writer = parquet_dataset.ParquetDatasetWriter(tmp_path)
+    # Every page touches both months, as pages ordered by alert key do.
+    for page in range(4):
+        items = []
+        for month in ("07", "08"):
+            item = dict(template, recorded_at=f"2026-{month}-01T10:00:00")
+            item["platform_alert_id"] = page * 10 + int(month)
+            items.append(item)
+        writer.write_page(items)
+    writer.commit()
+
+    for month in ("07", "08"):
+        metadata = pq.ParquetFile(
+            tmp_path
+            / "alerts.parquet"
+            / "source_api=pyronear_french"
+            / f"month=2026-{month}"
+            / "part-0.parquet"
+        ).metadata
+        assert metadata.num_rows == 4
+        assert [
+            metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)
+        ] == [3, 1]
+
+
+def test_run_export_fetches_next_page_while_downloading(tmp_path):
+    pages = two_page_export()
+    walk = fake_pages(pages)
+    second_page_requested = threading.Event()
+
+    def fetch_page(cursor):
+        if cursor is not None:
+            second_page_requested.set()
+        return walk(cursor)
+
+    def download(url, dest: Path):
+        # Page one's images only finish once page two has been asked for.
+        if url.endswith(("/10", "/11")) and not second_page_requested.wait(5):
+            raise RuntimeError("next page was not prefetched")
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(b"jpg")
+
+    stats = run_export(fetch_page, download, tmp_path, max_workers=2)
+    assert stats == ExportStats(alerts=2, downloaded=3, skipped=0, failed=0)
+
+
+def read_manifest(output_dir: Path):
+    return [
+        json.loads(line)
+        for line in (output_dir / "manifest.jsonl").read_text().splitlines()
+    ]
+
+
+def test_run_export_records_checksums_in_manifest(tmp_path):
+    run_export(fake_pages(two_page_export()), make_download([]), tmp_path, 2)
+    frame = read_manifest(tmp_path)[0]["objects"][0]["frames"][0]
+    assert frame["image_bytes"] == 3
+    assert frame["image_sha256"] == hashlib.sha256(b"jpg").hexdigest()
+    assert len((tmp_path / "image_checksums.jsonl").read_text().splitlines()) == 3
+
+
+def test_run_export_redownloads_truncated_image(tmp_path):
+    run_export(fake_pages(two_page_export()), make_download([]), tmp_path, 2)
+    (tmp_path / "images/pyronear_french/1234/11.jpg").write_bytes(b"j")
+
+    calls: list[str] = []
+    stats = run_export(fake_pages(two_page_export()), make_download(calls), tmp_path, 2)
+    assert calls == ["https://s3/11"]
+    assert (stats.corrupt, stats.downloaded, stats.skipped) == (1, 1, 2)
+
+
+def test_run_export_verify_rehashes_existing_images(tmp_path):
+    run_export(fake_pages(two_page_export()), make_download([]), tmp_path, 2)
+    # Same size, different bytes: only a hash notices.
+    (tmp_path / "images/pyronear_french/1234/11.jpg").write_bytes(b"JPG")
+
+    calls: list[str] = []
+    stats = run_export(fake_pages(two_page_export()), make_download(calls), tmp_path, 2)
+    assert calls == [] and stats.skipped == 3
+
+    stats = run_export(
+        fake_pages(two_page_export()), make_download(calls), tmp_path, 2, verify=True
+    )
+    assert calls == ["https://s3/11"]
+    assert stats.corrupt == 1 and stats.downloaded == 1
+
+
+def test_run_export_checks_images_without_a_record(tmp_path):
+    # Files from an export that predates image_checksums.jsonl.
+    complete = tmp_path / "images/pyronear_french/1234/10.jpg"
+    truncated = tmp_path / "images/pyronear_french/1234/11.jpg"
+    complete.parent.mkdir(parents=True)
+    complete.write_bytes(b"\xff\xd8...\xff\xd9")
+    truncated.write_bytes(b"\xff\xd8...")
+
+    calls: list[str] = []
+    stats = run_export(fake_pages(two_page_export()), make_download(calls), tmp_path, 2)
+    assert calls == ["https://s3/11", "https://s3/20"]
+    assert (stats.skipped, stats.corrupt) == (1, 1)
+    frame = read_manifest(tmp_path)[0]["objects"][0]["frames"][0]
+    assert frame["image_sha256"] == hashlib.sha256(complete.read_bytes()).hexdigest()
@@ -0,0 +1,63 @@
+from datetime import date
+
+from scripts.data_transfer.ingestion.alert_api.checkpoint import (
+    LANE_EXISTS,
+    LANE_IMPORTED,
+    ImportCheckpoint,
+    checkpoint_scope,
+)
+
+TODAY = date(2024, 1, 10)
+SCOPE = checkpoint_scope("https://alert.test/", 30, "extreme", "http://annot.test")
+
+
+def _sequence(sequence_id, last_seen_at="2024-01-05T12:00:00"):
+    return {"id": sequence_id, "last_seen_at": last_seen_at}
+
+
+def test_settled_listings_are_read_back(tmp_path):
+    path = str(tmp_path / "journal.sqlite")
+    checkpoint = ImportCheckpoint(path, SCOPE, today=TODAY)
+    checkpoint.record_listing(date(2024, 1, 5), [_sequence(1)])
+    # A day in progress can still gain sequences.
+    checkpoint.record_listing(TODAY, [_sequence(2)])
+    checkpoint.close()
+
+    resumed = ImportCheckpoint(path, SCOPE, today=TODAY)
+    cached, pending = resumed.split_dates([date(2024, 1, 5), TODAY])
+    assert cached == [_sequence(1)]
+    assert pending == [TODAY]
+
+
+def test_records_of_settled_sequences_are_read_back(tmp_path):
+    checkpoint = ImportCheckpoint(str(tmp_path / "j.sqlite"), SCOPE, today=TODAY)
+    settled, ongoing = _sequence(1), _sequence(2, "2024-01-10T08:00:00")
+    checkpoint.record_fetch(settled, [{"sequence_id": 1, "detection_id": 7}])
+    checkpoint.record_fetch(ongoing, [{"sequence_id": 2, "detection_id": 8}])
+
+    cached, pending = checkpoint.split_sequences([settled, ongoing])
+    assert cached == [{"sequence_id": 1, "detection_id": 7}]
+    assert pending == [ongoing]
+
+
+def test_records_are_not_kept_when_disabled(tmp_path):
+    checkpoint = ImportCheckpoint(
+        str(tmp_path / "j.sqlite"), SCOPE, today=TODAY, keep_records=False
+    )
+    checkpoint.record_fetch(_sequence(1), [{"sequence_id": 1}])
+    assert checkpoint.split_sequences([_sequence(1)]) == ([], [_sequence(1)])
+
+
+def test_lanes_are_scoped_to_run_options(tmp_path):
+    path = str(tmp_path / "j.sqlite")
+    checkpoint = ImportCheckpoint(path, SCOPE, today=TODAY)
+    checkpoint.record_lanes([1, 2], LANE_IMPORTED)
+    checkpoint.record_lanes([3], LANE_EXISTS)
+    assert checkpoint.completed_lanes() == {1, 2, 3}
+
+    other = ImportCheckpoint(
+        path,
+        checkpoint_scope("https://alert.test", 30, "extreme", "http://other.test"),
+        today=TODAY,
+    )
+    assert other.completed_lanes() == set()
@@ -0,0 +1,113 @@
+from PIL import Image
+
+from scripts.data_transfer.export.render_overlays import (
+    FULL_H,
+    FULL_W,
+    FrameCache,
+    load_fingerprints,
+    plan_sheets,
+    render_sheets,
+    save_fingerprints,
+    split_stale,
+    write_index,
+)
+
+
+def make_lane(sequence_id: int, kind: str, image_path: str | None):
+    return {
+        "sequence_id": sequence_id,
+        "record_kind": kind,
+        "smoke_types": ["wildfire"] if kind == "smoke" else [],
+        "false_positive_types": [] if kind == "smoke" else ["antenna"],
+        "frames": [
+            {
+                "detection_id": sequence_id * 10,
+                "recorded_at": "2026-07-01T10:00:00",
+                "image_path": image_path,
+                "boxes": [{"xyxyn": [0.1, 0.1, 0.2, 0.2]}],
+            }
+        ],
+    }
+
+
+def make_item(alert_id: int, objects):
+    return {
+        "platform_alert_id": alert_id,
+        "camera_name": "cam 1",
+        "organisation_name": "org",
+        "recorded_at": "2026-07-01T10:00:00",
+        "objects": objects,
+    }
+
+
+def test_parallel_render_indexes_in_plan_order(tmp_path):
+    frame = tmp_path / "images" / "frame.jpg"
+    frame.parent.mkdir()
+    Image.new("RGB", (64, 36), (90, 90, 90)).save(frame)
+    items = [
+        make_item(
+            1,
+            [
+                make_lane(11, "smoke", "images/frame.jpg"),
+                make_lane(12, "false_positive", "images/frame.jpg"),
+            ],
+        ),
+        # Nothing to draw: planned, but neither written nor indexed.
+        make_item(2, [make_lane(21, "smoke", None)]),
+        make_item(3, [make_lane(31, "smoke", "images/frame.jpg")]),
+    ]
+    out_dir = tmp_path / "overlays"
+
+    jobs = plan_sheets(items, out_dir, "both", 0)
+    rows = render_sheets(tmp_path, jobs, workers=2)
+
+    assert [row["sheet"] for row in rows] == [
+        "smoke/alert1_seq11_cam-1.png",
+        "smoke/alert3_seq31_cam-1.png",
+        "false_positive/alert1_seq12_cam-1.png",
+        "multi_object/alert1_cam-1_2objects.png",
+    ]
+    assert all((out_dir / row["sheet"]).exists() for row in rows)
+    assert rows == render_sheets(tmp_path, jobs, workers=1)
+    assert write_index(out_dir, rows).read_text().count("\n") == len(rows) + 1
+
+
+def test_frame_cache_decodes_full_resolution_only_for_crops(tmp_path):
+    for name in ("a.jpg", "b.jpg"):
+        Image.new("RGB", (1280, 720), (90, 90, 90)).save(tmp_path / name)
+    cache = FrameCache(tmp_path, maxsize=1)
+
+    cell_only = cache.get("a.jpg", need_full=False)
+    assert cell_only.cell.size == (FULL_W, FULL_H)
+    assert cell_only.full is None
+    assert cache.get("a.jpg", need_full=False) is cell_only
+
+    # Crops need full resolution: the cached cell-only decode is upgraded.
+    upgraded = cache.get("a.jpg", need_full=True)
+    assert upgraded.full.size == (1280, 720)
+    assert cache.get("a.jpg", need_full=True) is upgraded
+
+    cache.get("b.jpg", need_full=False)
+    assert cache.get("a.jpg", need_full=True) is not upgraded
+
+
+def test_only_sheets_with_changed_inputs_are_stale(tmp_path):
+    for name in ("a.jpg", "b.jpg"):
+        Image.new("RGB", (64, 36)).save(tmp_path / name)
+    items = [
+        make_item(1, [make_lane(11, "smoke", "a.jpg")]),
+        make_item(2, [make_lane(21, "smoke", "b.jpg")]),
+    ]
+    out_dir = tmp_path / "overlays"
+    jobs = plan_sheets(items, out_dir, "objects", 0)
+    stale, fingerprints = split_stale(tmp_path, jobs, {})
+    assert len(stale) == 2
+    render_sheets(tmp_path, stale, workers=1)
+    save_fingerprints(out_dir, fingerprints)
+
+    items[1]["objects"][0]["frames"][0]["boxes"].append({"xyxyn": [0.5] * 4})
+    jobs = plan_sheets(items, out_dir, "objects", 0)
+    stale, _ = split_stale(tmp_path, jobs, load_fingerprints(out_dir))
+    assert [row["sheet"] for _item, _lanes, _path, row in stale] == [
+        "smoke/alert2_seq21_cam-1.png"
+    ]
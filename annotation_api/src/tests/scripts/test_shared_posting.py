@@ -13,6 +13,22 @@ def _patch_clients(monkeypatch, created_ids):
         return {"id": 500 + len(created_ids)}
 
     monkeypatch.setattr(shared, "create_detection_from_bucket_key", fake_create)
+    # Servers without /detections/batch (nor /detections/lookup): everything
+    # takes the per-detection path.
+    monkeypatch.setattr(shared, "create_detections_batch", _batch_unavailable)
+    monkeypatch.setattr(shared, "lookup_detections", _lookup_unavailable)
+
+
+def _batch_unavailable(url, token, sequence_id, detections):
+    raise shared.AnnotationAPIError("Not found during batch create", status_code=404)
+
+
+def _lookup_unavailable(url, token, sequence_id, alert_api_ids):
+    raise shared.AnnotationAPIError("Not found during lookup", status_code=404)
+
+
+def _nothing_stored(url, token, keys):
+    return []
 
 
 class TestDetectionResultsPlumbing:
@@ -49,6 +65,302 @@ class TestDetectionResultsPlumbing:
         assert result["detection_results"] == []
 
 
+class TestDetectionBatch:
+    def _records(self, count):
+        return [
+            make_record(i, f"2026-07-01T10:0{i}:00", [BOX]) for i in range(1, count + 1)
+        ]
+
+    def test_sequence_posts_one_batch(self, monkeypatch):
+        monkeypatch.setattr(
+            shared, "create_sequence", lambda url, token, data: {"id": 99}
+        )
+
+        def single_create(url, token, detection_data, source_key):
+            raise AssertionError("no per-detection request expected")
+
+        monkeypatch.setattr(shared, "create_detection_from_bucket_key", single_create)
+        batches = []
+
+        def fake_batch(url, token, sequence_id, detections):
+            batches.append((sequence_id, detections))
+            return {
+                "sequence_id": sequence_id,
+                "results": [
+                    {
+                        "alert_api_id": item["alert_api_id"],
+                        "status": "exists" if i == 0 else "created",
+                        "detection": {"id": 600 + i},
+                    }
+                    for i, item in enumerate(detections)
+                ],
+            }
+
+        monkeypatch.setattr(shared, "create_detections_batch", fake_batch)
+        result = shared.post_sequence_to_annotation_api(
+            "http://annotation.test", self._records(3), "token"
+        )
+
+        assert len(batches) == 1
+        sequence_id, items = batches[0]
+        assert sequence_id == 99
+        assert [item["alert_api_id"] for item in items] == [1, 2, 3]
+        assert items[0]["source_key"] == "key/1.jpg"
+        assert "sequence_id" not in items[0]
+        assert result["successful_detections"] == 3
+        assert [r["annotation_detection_id"] for r in result["detection_results"]] == [
+            600,
+            601,
+            602,
+        ]
+        assert result["detection_results"][0]["xyxyns"] == [[0.1, 0.1, 0.2, 0.2]]
+
+    def test_transient_item_failures_retry_per_detection(self, monkeypatch):
+        monkeypatch.setattr(
+            shared, "create_sequence", lambda url, token, data: {"id": 99}
+        )
+        singles = []
+
+        def single_create(url, token, detection_data, source_key):
+            singles.append(detection_data["alert_api_id"])
+            return {"id": 700}
+
+        monkeypatch.setattr(shared, "create_detection_from_bucket_key", single_create)
+
+        def fake_batch(url, token, sequence_id, detections):
+            return {
+                "sequence_id": sequence_id,
+                "results": [
+                    {"alert_api_id": 1, "status": "created", "detection": {"id": 601}},
+                    {
+                        "alert_api_id": 2,
+                        "status": "failed",
+                        "status_code": 502,
+                        "error": "S3 copy failed",
+                    },
+                    {
+                        "alert_api_id": 3,
+                        "status": "failed",
+                        "status_code": 422,
+                        "error": "Source object not found",
+                    },
+                ],
+            }
+
+        monkeypatch.setattr(shared, "create_detections_batch", fake_batch)
+        result = shared.post_sequence_to_annotation_api(
+            "http://annotation.test", self._records(3), "token"
+        )
+
+        assert singles == [2]
+        assert result["successful_detections"] == 2
+        assert result["failed_detections"] == 1
+        assert sorted(
+            r["annotation_detection_id"] for r in result["detection_results"]
+        ) == [
+            601,
+            700,
+        ]
+
+    def test_failed_batch_request_falls_back_per_detection(self, monkeypatch):
+        created = []
+        _patch_clients(monkeypatch, created)
+        result = shared.post_sequence_to_annotation_api(
+            "http://annotation.test", self._records(3), "token"
+        )
+        assert sorted(created) == [1, 2, 3]
+        assert result["successful_detections"] == 3
+
+    def test_failed_batch_reuses_stored_detections(self, monkeypatch):
+        # The batch timed out after the server committed part of it: one
+        # lookup settles the stored frames, only the rest are posted.
+        created = []
+        _patch_clients(monkeypatch, created)
+        lookups = []
+
+        def fake_lookup(url, token, sequence_id, alert_api_ids):
+            lookups.append((sequence_id, alert_api_ids))
+            return [{"id": 801, "alert_api_id": 1}, {"id": 803, "alert_api_id": 3}]
+
+        monkeypatch.setattr(shared, "lookup_detections", fake_lookup)
+        result = shared.post_sequence_to_annotation_api(
+            "http://annotation.test", self._records(3), "token"
+        )
+
+        assert lookups == [(99, [1, 2, 3])]
+        assert created == [2]
+        assert result["successful_detections"] == 3
+        assert sorted(
+            r["annotation_detection_id"] for r in result["detection_results"]
+        ) == [501, 801, 803]
+
+
+class TestAlertImport:
+    def _alert_records(self):
+        # Two object-split lanes of platform alert 47105.
+        return [
+            make_record(1, "2026-07-01T10:00:00", [BOX], sid=47105),
+            make_record(2, "2026-07-01T10:01:00", [BOX], sid=47105),
+            make_record(3, "2026-07-01T10:00:00", [BOX], sid=1047105001),
+        ]
+
+    def _post(self, monkeypatch, records, fake_import):
+        monkeypatch.setattr(
+            shared, "get_auth_token", lambda url, username, password: "token"
+        )
+        monkeypatch.setattr(shared, "import_alert", fake_import)
+        monkeypatch.setattr(shared, "lookup_sequences", _nothing_stored)
+        for record in records:
+            record["platform_alert_id"] = 47105
+        return shared.post_records_to_annotation_api(
+            "http://annotation.test", records, max_workers=1, max_detection_workers=1
+        )
+
+    def test_alert_lanes_import_in_one_request(self, monkeypatch):
+        def single_sequence(url, token, data):
+            raise AssertionError("no per-lane request expected")
+
+        monkeypatch.setattr(shared, "create_sequence", single_sequence)
+        imports = []
+
+        def fake_import(url, token, source_api, platform_alert_id, lanes):
+            imports.append((platform_alert_id, lanes))
+            return {
+                "status": "created",
+                "lanes": [
+                    {
+                        "alert_api_id": lane["sequence"]["alert_api_id"],
+                        "sequence_id": 90 + i,
+                        "annotation_id": 80 + i,
+                        "detection_ids": {
+                            str(item["alert_api_id"]): 500 + item["alert_api_id"]
+                            for item in lane["detections"]
+                        },
+                    }
+                    for i, lane in enumerate(lanes)
+                ],
+            }
+
+        result = self._post(monkeypatch, self._alert_records(), fake_import)
+
+        assert len(imports) == 1
+        platform_alert_id, lanes = imports[0]
+        assert platform_alert_id == 47105
+        assert [lane["sequence"]["alert_api_id"] for lane in lanes] == [
+            47105,
+            1047105001,
+        ]
+        # The seed annotation references detections by their alert API id.
+        bboxes = lanes[0]["annotation"]["sequences_bbox"][0]["bboxes"]
+        assert sorted(bbox["detection_id"] for bbox in bboxes) == [1, 2]
+        assert result["successful_sequences"] == 2
+        assert result["successful_detections"] == 3
+        by_lane = {r["alert_api_sequence_id"]: r for r in result["sequence_results"]}
+        assert by_lane[47105]["annotation_id"] == 80
+        assert sorted(
+            r["annotation_detection_id"] for r in by_lane[47105]["detection_results"]
+        ) == [501, 502]
+
+    def test_unavailable_import_falls_back_per_lane(self, monkeypatch):
+        created = []
+        _patch_clients(monkeypatch, created)
+
+        def unavailable(url, token, source_api, platform_alert_id, lanes):
+            raise shared.AnnotationAPIError("Not Found", status_code=404)
+
+        result = self._post(monkeypatch, self._alert_records(), unavailable)
+
+        assert sorted(created) == [1, 2, 3]
+        assert result["successful_sequences"] == 2
+        assert not any(r.get("annotation_id") for r in result["sequence_results"])
+
+    def test_existing_alert_refreshes_stored_lanes_and_posts_new_ones(
+        self, monkeypatch
+    ):
+        created = []
+        _patch_clients(monkeypatch, created)
+        batches = []
+
+        def batch_refresh(url, token, updates):
+            batches.append([update["alert_api_id"] for update in updates])
+            return [
+                {"alert_api_id": update["alert_api_id"], "status": "updated"}
+                for update in updates
+            ]
+
+        monkeypatch.setattr(shared, "update_sequence_temporal_scores", batch_refresh)
+
+        def single_refresh(url, token, payload):
+            raise AssertionError("no per-lane refresh expected")
+
+        monkeypatch.setattr(shared, "update_sequence_temporal_score", single_refresh)
+
+        def exists(url, token, source_api, platform_alert_id, lanes):
+            return {
+                "status": "exists",
+                "lanes": [
+                    {
+                        "alert_api_id": 47105,
+                        "sequence_id": 90,
+                        "annotation_id": 80,
+                        "detection_ids": {"1": 501, "2": 502},
+                    }
+                ],
+            }
+
+        result = self._post(monkeypatch, self._alert_records(), exists)
+
+        assert batches == [[47105]]
+        assert created == [3]
+        assert result["skipped_sequences"] == 1
+        assert result["successful_sequences"] == 1
+
+    def test_existing_alert_refreshes_its_lanes_in_one_batch(self, monkeypatch):
+        batches = []
+
+        def batch_refresh(url, token, updates):
+            batches.append([update["alert_api_id"] for update in updates])
+            return [
+                {
+                    "alert_api_id": update["alert_api_id"],
+                    "status": "not_found" if i == 1 else "updated",
+                }
+                for i, update in enumerate(updates)
+            ]
+
+        monkeypatch.setattr(shared, "update_sequence_temporal_scores", batch_refresh)
+        singles = []
+        monkeypatch.setattr(
+            shared,
+            "update_sequence_temporal_score",
+            lambda url, token, payload: singles.append(payload["alert_api_id"]),
+        )
+        records = self._alert_records()
+        for record in records:
+            record["platform_alert_id"] = 47105
+        lanes_records, _lanes, posted = shared.build_alert_import(records)
+        response = {
+            "status": "exists",
+            "lanes": [
+                {"alert_api_id": sid, "sequence_id": 90 + i, "detection_ids": {}}
+                for i, sid in enumerate(lanes_records)
+            ],
+        }
+
+        results, remaining = shared.settle_alert_import(
+            "http://annotation.test", "token", response, lanes_records, posted
+        )
+
+        assert batches == [[47105, 1047105001]]
+        # Only the row the batch could not find is retried on its own.
+        assert singles == [1047105001]
+        assert remaining == {}
+        assert [r["refresh_status"] for r in results] == [
+            shared.REFRESH_REFRESHED,
+            shared.REFRESH_REFRESHED,
+        ]
+
+
 class TestDetection409Recovery:
     def test_409_recovers_existing_detection(self, monkeypatch):
         monkeypatch.setattr(
@@ -90,6 +402,7 @@ class TestDetection409Recovery:
         assert result["detection_results"][0]["xyxyns"] == [[0.1, 0.1, 0.2, 0.2]]
         assert [call["page"] for call in list_calls] == [1, 2]
         assert all(call["sequence_id"] == 99 for call in list_calls)
+        assert all(call["alert_api_id"] == 1 for call in list_calls)
 
     def test_409_with_unfindable_detection_stays_failed(self, monkeypatch):
         monkeypatch.setattr(
@@ -126,6 +439,7 @@ class TestSkippedSequenceStats:
             raise shared.AnnotationAPIError("duplicate sequence", status_code=409)
 
         monkeypatch.setattr(shared, "create_sequence", conflicting_sequence)
+        monkeypatch.setattr(shared, "lookup_sequences", _nothing_stored)
 
         records = [
             make_record(1, "2026-07-01T10:00:00", [BOX]),
@@ -141,6 +455,133 @@ class TestSkippedSequenceStats:
         assert result["successful_sequences"] == 0
 
 
+class TestExistencePreflight:
+    def _records(self):
+        records = [
+            make_record(1, "2026-07-01T10:00:00", [BOX], sid=11),
+            make_record(2, "2026-07-01T10:00:00", [BOX], sid=12),
+            make_record(3, "2026-07-01T10:00:00", [BOX], sid=13),
+        ]
+        for record in records:
+            record["sequence_temporal_model_score"] = 0.8
+            record["sequence_temporal_model_version"] = "v2"
+            record["sequence_temporal_api_version"] = "1.0"
+        return records
+
+    def test_stored_lanes_are_settled_without_posting(self, monkeypatch):
+        monkeypatch.setattr(
+            shared, "get_auth_token", lambda url, username, password: "token"
+        )
+        lookups = []
+
+        def fake_lookup(url, token, keys):
+            lookups.append(keys)
+            stored = {"temporal_model_version": "v2", "temporal_api_version": "1.0"}
+            return [
+                {"alert_api_id": 11, "id": 1, "temporal_model_score": 0.8, **stored},
+                {"alert_api_id": 12, "id": 2, "temporal_model_score": 0.3, **stored},
+            ]
+
+        monkeypatch.setattr(shared, "lookup_sequences", fake_lookup)
+        refreshed = []
+
+        def fake_refresh(url, token, updates):
+            refreshed.extend(update["alert_api_id"] for update in updates)
+            return [
+                {"alert_api_id": update["alert_api_id"], "status": "updated"}
+                for update in updates
+            ]
+
+        monkeypatch.setattr(shared, "update_sequence_temporal_scores", fake_refresh)
+        created = []
+
+        def create_sequence(url, token, data):
+            created.append(data["alert_api_id"])
+            return {"id": 99}
+
+        monkeypatch.setattr(shared, "create_sequence", create_sequence)
+        monkeypatch.setattr(
+            shared,
+            "create_detection_from_bucket_key",
+            lambda url, token, data, source_key: {"id": 500},
+        )
+
+        result = shared.post_records_to_annotation_api(
+            "http://annotation.test",
+            self._records(),
+            max_workers=1,
+            max_detection_workers=1,
+        )
+
+        assert lookups == [
+            [
+                {"source_api": "pyronear_french", "alert_api_id": sid}
+                for sid in (11, 12, 13)
+            ]
+        ]
+        # 11 is up to date, 12 only needs its score refreshed, 13 is new.
+        assert refreshed == [12]
+        assert created == [13]
+        assert result["skipped_sequences"] == 2
+        assert result["refreshed_sequences"] == 1
+        assert result["successful_sequences"] == 1
+        statuses = {
+            r["alert_api_sequence_id"]: r.get("refresh_status")
+            for r in result["sequence_results"]
+        }
+        assert statuses[11] == shared.REFRESH_UNCHANGED
+
+    def test_batch_refresh_falls_back_per_sequence(self, monkeypatch):
+        def unavailable(url, token, updates):
+            raise shared.AnnotationAPIError("Method Not Allowed", status_code=405)
+
+        def single_refresh(url, token, payload):
+            if payload["alert_api_id"] == 2:
+                raise shared.AnnotationAPIError("Not found", status_code=404)
+            return {"id": 1}
+
+        monkeypatch.setattr(shared, "update_sequence_temporal_scores", unavailable)
+        monkeypatch.setattr(shared, "update_sequence_temporal_score", single_refresh)
+        payloads = [
+            {"source_api": "pyronear_french", "alert_api_id": sid} for sid in (1, 2)
+        ]
+        assert shared._refresh_temporal_scores("http://a", "t", payloads) == {
+            1: shared.REFRESH_REFRESHED,
+            2: shared.REFRESH_FAILED,
+        }
+
+    def test_failed_lookup_posts_every_lane(self, monkeypatch):
+        monkeypatch.setattr(
+            shared, "get_auth_token", lambda url, username, password: "token"
+        )
+
+        def unavailable(url, token, keys):
+            raise shared.AnnotationAPIError("Not Found", status_code=404)
+
+        monkeypatch.setattr(shared, "lookup_sequences", unavailable)
+        created = []
+
+        def create_sequence(url, token, data):
+            created.append(data["alert_api_id"])
+            return {"id": 99}
+
+        monkeypatch.setattr(shared, "create_sequence", create_sequence)
+        monkeypatch.setattr(
+            shared,
+            "create_detection_from_bucket_key",
+            lambda url, token, data, source_key: {"id": 500},
+        )
+
+        result = shared.post_records_to_annotation_api(
+            "http://annotation.test",
+            self._records(),
+            max_workers=1,
+            max_detection_workers=1,
+        )
+        assert sorted(created) == [11, 12, 13]
+        assert result["successful_sequences"] == 3
+
+
 class TestTransformSequenceData:
     def test_platform_alert_id_passed_through(self):
         record = make_record(1, "2026-07-01T10:00:00", [BOX])
@@ -122,7 +122,9 @@ class TestRefreshAggregation:
                 raise failure
             return {"id": 1}
 
-        with patch.object(shared, "get_auth_token", return_value="t"):
+        with patch.object(shared, "get_auth_token", return_value="t"), patch.object(
+            shared, "lookup_sequences", return_value=[]
+        ):
             with patch.object(shared, "create_sequence", side_effect=_conflict()):
                 with patch.object(
                     shared, "update_sequence_temporal_score", side_effect=fake_refresh
@@ -0,0 +1,106 @@
+import os
+import signal
+import time
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import app.worker as worker
+from app.core.config import settings
+from app.services import inference_pool, smoke_detector
+from app.services.inference_pool import InferencePool, inference_threads
+
+
+def test_inference_threads_split_cpus_across_processes(monkeypatch):
+    monkeypatch.setattr(inference_pool, "available_cpus", lambda: 8)
+    monkeypatch.setattr(settings, "AUTOANNOTATE_INTRA_OP_THREADS", 0)
+    monkeypatch.setattr(settings, "AUTOANNOTATE_INTER_OP_THREADS", 1)
+
+    assert inference_threads(1) == (8, 1)
+    assert inference_threads(4) == (2, 1)
+    # more processes than cores still gets one thread each, never zero
+    assert inference_threads(16) == (1, 1)
+
+
+def test_inference_threads_explicit_setting_wins(monkeypatch):
+    monkeypatch.setattr(settings, "AUTOANNOTATE_INTRA_OP_THREADS", 3)
+    assert inference_threads(4)[0] == 3
+
+
+@pytest.mark.parametrize("processes,expected", [(1, "SmokeDetector"), (3, "pool")])
+def test_get_detector_picks_in_process_or_pool(monkeypatch, processes, expected):
+    built = []
+    monkeypatch.setattr(worker, "_detector", None)
+    monkeypatch.setattr(settings, "AUTOANNOTATE_INFERENCE_PROCESSES", processes)
+    monkeypatch.setattr(worker, "build_detector", lambda: built.append(1) or "det")
+    monkeypatch.setattr(InferencePool, "_start", lambda self: None)
+
+    detector = worker.get_detector()
+
+    if expected == "pool":
+        assert isinstance(detector, InferencePool)
+        assert detector.processes == processes
+        assert detector.max_batch_size == settings.AUTOANNOTATE_BATCH_SIZE
+        assert built == []  # the worker process itself never loads the model
+    else:
+        assert detector == "det"
+    assert worker.get_detector() is detector
+
+
+def test_worker_runs_one_job_per_inference_process():
+    assert worker.app.worker_defaults["concurrency"] == max(
+        1, settings.AUTOANNOTATE_INFERENCE_PROCESSES
+    )
+
+
+class _FakeSession:
+    """Stands in for onnxruntime.InferenceSession in pool children: one box
+    per frame, whose confidence is the frame's mean letterboxed pixel."""
+
+    def __init__(self, _path, sess_options=None):
+        self.sess_options = sess_options
+
+    def get_inputs(self):
+        return [type("Input", (), {"shape": ["batch", 3, 64, 64]})]
+
+    def run(self, _names, feed):
+        images = feed["images"]
+        out = np.zeros((images.shape[0], 5, 1), dtype=np.float32)
+        out[:, :4, 0] = [32, 32, 8, 8]
+        out[:, 4, 0] = images.mean(axis=(1, 2, 3))
+        return [out]
+
+
+def _init_fake_process(processes):
+    # Runs in each spawned child: the real initializer, over a fake model.
+    smoke_detector.onnxruntime.InferenceSession = _FakeSession
+    settings.AUTOANNOTATE_MODEL_PATH = "model.onnx"
+    settings.AUTOANNOTATE_IMGSZ = 64
+    inference_pool._init_process(processes)
+    assert inference_pool._process_detector.imgsz == 64
+
+
+def test_pool_children_run_inference_and_restart_when_one_dies(monkeypatch):
+    monkeypatch.setattr(inference_pool, "_init_process", _init_fake_process)
+    imgs = [Image.new("RGB", (64, 48), (v, v, v)) for v in (60, 120, 250)]
+    pool = InferencePool(2)
+    try:
+        preds = pool.predict_batch(imgs)
+        assert [p.shape for p in preds] == [(1, 5)] * 3
+        # The border stays grey, so brighter frames score higher.
+        assert preds[0][0, 4] < preds[1][0, 4] < preds[2][0, 4]
+
+        child = next(iter(pool._executor._processes.values()))
+        os.kill(child.pid, signal.SIGKILL)
+        child.join()
+        deadline = time.monotonic() + 10
+        while not pool._executor._broken and time.monotonic() < deadline:
+            time.sleep(0.05)
+        with pytest.raises(inference_pool.BrokenProcessPool):
+            pool.predict_batch(imgs)
+
+        restarted = pool.predict_batch(imgs)
+        assert all(np.array_equal(a, b) for a, b in zip(restarted, preds))
+    finally:
+        pool.shutdown()
@@ -1,8 +1,17 @@
+import io
+
 import numpy as np
+import pytest
+from PIL import Image
 
+from app.services import smoke_detector
 from app.services.smoke_detector import (
+    box_iou,
+    decode_image,
     group_and_merge_boxes,
     keep_boxes_overlapping,
+    letterbox,
+    letterbox_into,
     nms,
     xywh2xyxy,
 )
@@ -65,3 +74,223 @@ def test_keep_boxes_overlapping_drops_non_overlapping():
 def test_keep_boxes_overlapping_empty_anchor_keeps_nothing():
     preds = np.array([[0.2, 0.2, 0.35, 0.35, 0.5]])
     assert keep_boxes_overlapping(preds, np.zeros((0, 4))).shape[0] == 0
+
+
+class _FakeInput:
+    def __init__(self, batch_dim):
+        self.shape = [batch_dim, 3, 64, 64]
+
+
+class _FakeSession:
+    """Stands in for onnxruntime.InferenceSession: one confident box per frame,
+    centred on the letterboxed image, plus a record of every run's batch."""
+
+    batch_dim: object = "batch"
+
+    def __init__(self, _path, sess_options=None):
+        self.sess_options = sess_options
+        self.batches = []
+
+    def get_inputs(self):
+        return [_FakeInput(self.batch_dim)]
+
+    def run(self, _names, feed):
+        images = feed["images"]
+        self.batches.append(images.shape[0])
+        # (B, 5, 2): cx, cy, w, h, conf for two candidates; the second is
+        # below the confidence threshold.
+        out = np.zeros((images.shape[0], 5, 2), dtype=np.float32)
+        out[:, :, 0] = [32, 32, 8, 8, 0.9]
+        out[:, :, 1] = [10, 10, 4, 4, 0.001]
+        return [out]
+
+
+def _detector(monkeypatch, batch_dim="batch", max_batch_size=8):
+    monkeypatch.setattr(_FakeSession, "batch_dim", batch_dim)
+    monkeypatch.setattr(smoke_detector.onnxruntime, "InferenceSession", _FakeSession)
+    return smoke_detector.SmokeDetector(
+        "model.onnx", imgsz=64, max_batch_size=max_batch_size
+    )
+
+
+def test_predict_batch_runs_one_session_call_per_chunk(monkeypatch):
+    detector = _detector(monkeypatch, max_batch_size=4)
+    imgs = [Image.new("RGB", (128, 96 + i)) for i in range(6)]
+
+    preds = detector.predict_batch(imgs)
+
+    assert detector.ort_session.batches == [4, 2]
+    assert len(preds) == 6
+    for img, pred in zip(imgs, preds):
+        assert np.array_equal(pred, detector.predict(img))
+        assert pred.shape == (1, 5)
+
+
+def test_session_gets_explicit_thread_pools(monkeypatch):
+    monkeypatch.setattr(smoke_detector.onnxruntime, "InferenceSession", _FakeSession)
+    detector = smoke_detector.SmokeDetector(
+        "model.onnx", intra_op_num_threads=3, inter_op_num_threads=1
+    )
+    assert detector.ort_session.sess_options.intra_op_num_threads == 3
+    assert detector.ort_session.sess_options.inter_op_num_threads == 1
+
+
+def test_predict_batch_respects_fixed_model_batch_dim(monkeypatch):
+    detector = _detector(monkeypatch, batch_dim=1, max_batch_size=8)
+    assert detector.max_batch_size == 1
+
+    detector.predict_batch([Image.new("RGB", (64, 64))] * 3)
+
+    assert detector.ort_session.batches == [1, 1, 1]
+
+
+@pytest.mark.parametrize("size", [(64, 64), (128, 96), (97, 131), (640, 360)])
+def test_letterbox_into_matches_letterbox_then_scale(size):
+    rng = np.random.default_rng(0)
+    im = rng.integers(0, 256, size=(size[1], size[0], 3), dtype=np.uint8)
+    expected, expected_pad = letterbox(im, 64)
+    expected = expected.astype("float32").transpose((2, 0, 1))
+    expected /= 255.0
+
+    out = np.full((3, 64, 64), np.nan, dtype=np.float32)
+    pad = letterbox_into(im, out)
+
+    assert pad == expected_pad
+    assert np.array_equal(out, expected)
+
+
+def test_predict_batch_reuses_its_input_buffer(monkeypatch):
+    detector = _detector(monkeypatch, max_batch_size=4)
+    detector.predict_batch([Image.new("RGB", (64, 64))] * 4)
+    buffer = detector._batch_buffer(4)
+    detector.predict_batch([Image.new("RGB", (64, 64))] * 2)
+    assert detector._batch_buffer(2).base is buffer.base
+
+
+def test_threads_share_one_input_buffer(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    detector = _detector(monkeypatch, max_batch_size=4)
+    imgs = [Image.new("RGB", (64, 48 + i)) for i in range(4)]
+    expected = detector.predict_batch(imgs)
+    buffer = detector._batch_buffer(4)
+
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(detector.predict_batch, [imgs] * 8))
+
+    assert all(
+        np.array_equal(a, b) for preds in results for a, b in zip(preds, expected)
+    )
+    assert detector._batch_buffer(4).base is buffer.base
+
+
+def test_decode_image_drafts_large_jpegs_only():
+    def jpeg(size):
+        buf = io.BytesIO()
+        Image.new("RGB", size, (10, 20, 30)).save(buf, format="JPEG")
+        return buf.getvalue()
+
+    large = decode_image(jpeg((512, 256)), imgsz=64)
+    assert large.mode == "RGB"
+    assert large.size == (64, 32)  # 1/8 DCT scale, still covers 64x32
+    assert decode_image(jpeg((100, 50)), imgsz=64).size == (100, 50)
+
+
+# Reference implementations: the retired script's nms / group_and_merge_boxes,
+# verbatim. The vectorized versions must reproduce them exactly.
+def _reference_nms(boxes, overlapThresh=0.0):
+    boxes = boxes[boxes[:, -1].argsort()]
+    if len(boxes) == 0:
+        return []
+    indices = np.arange(len(boxes))
+    rr = box_iou(boxes[:, :4], boxes[:, :4])
+    for i, _ in enumerate(boxes):
+        temp_indices = indices[indices != i]
+        if np.any(rr[i, temp_indices] > overlapThresh):
+            indices = indices[indices != i]
+    return boxes[indices]
+
+
+def _reference_group_and_merge_boxes(boxes, iou_nms, threshold):
+    if boxes.size == 0:
+        return np.empty((0, boxes.shape[1]), dtype=boxes.dtype), {}
+
+    main_bboxes = _reference_nms(boxes.copy(), overlapThresh=iou_nms)
+    if len(main_bboxes) == 0:
+        return np.empty((0, boxes.shape[1]), dtype=boxes.dtype), {}
+
+    ious = box_iou(boxes[:, :4], main_bboxes[:, :4])
+    X, Y = np.where(ious > threshold)
+    gp = {}
+    for main_index, bbox_index in zip(X, Y):
+        gp.setdefault(int(main_index), []).append(int(bbox_index))
+
+    items = [(k, set(v)) for k, v in gp.items()]
+    used = [False] * len(items)
+    merged = []
+
+    for i, (main_i, set_i) in enumerate(items):
+        if used[i]:
+            continue
+        current_set = set(set_i)
+        used[i] = True
+        changed = True
+        while changed:
+            changed = False
+            for j, (main_j, set_j) in enumerate(items):
+                if used[j]:
+                    continue
+                if current_set & set_j:
+                    current_set |= set_j
+                    used[j] = True
+                    changed = True
+        merged.append((main_i, sorted(current_set)))
+
+    final_main = np.stack([main_bboxes[m] for m, _ in merged], axis=0)
+    groups = {i: boxes[idxs, :] for i, (_, idxs) in enumerate(merged)}
+    return final_main, groups
+
+
+def _random_boxes(rng, n):
+    """Random xyxy + conf boxes. Coordinates and confidences are drawn from a
+    coarse grid so the inputs contain exact duplicates, shared edges,
+    touching boxes and confidence ties, not only generic positions."""
+    grid = rng.choice([0.05, 0.1, 1.0])
+    xy = np.round(rng.random((n, 2)) / grid) * grid * 0.8
+    wh = (np.round(rng.random((n, 2)) / grid) + 1) * grid * rng.choice([0.1, 0.3])
+    conf = np.round(rng.random((n, 1)), int(rng.integers(1, 4)))
+    return np.hstack([xy, xy + wh, conf])
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_nms_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    boxes = _random_boxes(rng, int(rng.integers(0, 600)))
+    thresh = float(rng.choice([0.0, 0.1, 0.45, 0.9]))
+
+    expected = _reference_nms(boxes.copy(), overlapThresh=thresh)
+    actual = nms(boxes.copy(), overlapThresh=thresh)
+
+    if len(boxes) == 0:
+        assert actual == expected == []
+    else:
+        assert actual.dtype == expected.dtype
+        assert np.array_equal(actual, expected)
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_group_and_merge_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    boxes = _random_boxes(rng, int(rng.integers(0, 300)))
+    iou_nms = float(rng.choice([0.0, 0.2, 0.6]))
+    threshold = float(rng.choice([0.0, 0.1, 0.5]))
+
+    expected_main, expected_groups = _reference_group_and_merge_boxes(
+        boxes, iou_nms, threshold
+    )
+    actual_main, actual_groups = group_and_merge_boxes(boxes, iou_nms, threshold)
+
+    assert np.array_equal(actual_main, expected_main)
+    assert actual_groups.keys() == expected_groups.keys()
+    for key, group in expected_groups.items():
+        assert np.array_equal(actual_groups[key], group)
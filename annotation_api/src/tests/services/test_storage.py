@@ -1,5 +1,6 @@
 import asyncio
 import io
+import random
 import threading
 
 import boto3
@@ -355,3 +356,247 @@ async def test_upload_file_from_url_maps_download_failures(
 
     assert excinfo.value.status_code == expected_status
     assert expected_detail in excinfo.value.detail
+
+
+def _jpeg_bytes() -> bytes:
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.effect_noise((256, 256), 64).convert("RGB").save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def test_digest_and_sniff_matches_whole_body_reference():
+    """One chunked pass gives the same digests as hashing the whole body, and
+    sniffing the head gives the same type as sniffing everything."""
+    import hashlib
+
+    import magic
+
+    body = _jpeg_bytes()
+    chunks = [body[i : i + 700] for i in range(0, len(body), 700)]
+    assert storage._digest_and_sniff(chunks) == (
+        hashlib.sha256(body).hexdigest(),
+        hashlib.md5(body).hexdigest(),  # noqa: S324
+        magic.from_buffer(body, mime=True),
+    )
+
+
+class _ChunkReadSpy(io.BytesIO):
+    def __init__(self, data: bytes) -> None:
+        super().__init__(data)
+        self.read_sizes = []
+
+    def read(self, size=-1):
+        self.read_sizes.append(size)
+        return super().read(size)
+
+
+@pytest.mark.asyncio
+async def test_upload_file_hashes_in_bounded_chunks(monkeypatch):
+    """The upload body is hashed in one pass of bounded reads (never read
+    whole), then handed to the bucket from the start."""
+    import hashlib
+
+    from fastapi import UploadFile
+
+    body = _jpeg_bytes()
+    spy = _ChunkReadSpy(body)
+    uploaded = {}
+
+    class Bucket:
+        def upload_file(self, key, file_obj, content_md5=None):
+            uploaded[key] = file_obj.read()
+            return True
+
+    monkeypatch.setattr(storage.s3_service, "get_bucket", lambda _name: Bucket())
+    monkeypatch.setattr(storage, "_READ_CHUNK_BYTES", 1024)
+
+    key = await storage.upload_file(UploadFile(spy), sequence_id=1, detection_id=2)
+
+    hash_reads = spy.read_sizes[: spy.read_sizes.index(-1)]
+    assert hash_reads and set(hash_reads) == {1024}
+    assert key.endswith(f"_det2_{hashlib.sha256(body).hexdigest()[:8]}.jpg")
+    assert uploaded[key] == body
+
+
+def test_store_downloaded_image_puts_content_md5_without_head(monkeypatch):
+    """Default mode: one PUT carrying the body's Content-MD5 and no
+    read-back HEAD."""
+    import base64
+    import hashlib
+
+    body = _jpeg_bytes()
+    bucket = storage.s3_service.get_bucket(storage.s3_service.resolve_bucket_name())
+    sent = []
+
+    def capture(request, **kwargs):
+        sent.append(request.headers.get("Content-MD5"))
+
+    heads = []
+    monkeypatch.setattr(
+        S3Bucket, "get_file_metadata", lambda self, key: heads.append(key)
+    )
+    bucket._s3.meta.events.register("before-send.s3.PutObject", capture)
+    try:
+        key = storage._store_downloaded_image(body, 1, 2, None)
+    finally:
+        bucket._s3.meta.events.unregister("before-send.s3.PutObject", capture)
+
+    assert sent == [base64.b64encode(hashlib.md5(body).digest())]  # noqa: S324
+    assert heads == []
+    assert bucket.download_file(key) == body
+    bucket.delete_file(key)
+
+
+@pytest.mark.parametrize("multipart", [False, True])
+def test_store_downloaded_image_mismatched_md5_is_rejected(monkeypatch, multipart):
+    """A body S3 finds not to match its Content-MD5 is refused, reported as
+    corruption, and leaves no pending multipart upload behind.
+
+    S3's BadDigest answer is stubbed, so the check does not depend on the
+    backend under test validating Content-MD5 itself.
+    """
+    from botocore.stub import ANY, Stubber
+
+    bucket = storage.s3_service.get_bucket(storage.s3_service.resolve_bucket_name())
+    monkeypatch.setattr(storage.s3_service, "get_bucket", lambda _name: bucket)
+    if multipart:
+        monkeypatch.setattr(storage, "_MULTIPART_CHUNK_BYTES", 1024)
+    stubber = Stubber(bucket._s3)
+    bad_digest = {
+        "service_error_code": "BadDigest",
+        "service_message": "The Content-MD5 you specified did not match",
+        "http_status_code": 400,
+    }
+    if multipart:
+        upload = {"Bucket": bucket.name, "Key": ANY, "UploadId": "upload-1"}
+        stubber.add_response(
+            "create_multipart_upload",
+            {"UploadId": "upload-1"},
+            {"Bucket": bucket.name, "Key": ANY, "ContentType": "image/jpeg"},
+        )
+        stubber.add_client_error(
+            "upload_part",
+            expected_params={**upload, "PartNumber": 1, "Body": ANY, "ContentMD5": ANY},
+            **bad_digest,
+        )
+        stubber.add_response("abort_multipart_upload", {}, upload)
+    else:
+        stubber.add_client_error(
+            "put_object",
+            expected_params={
+                "Bucket": bucket.name,
+                "Key": ANY,
+                "Body": ANY,
+                "ContentMD5": ANY,
+                "ContentType": "image/jpeg",
+            },
+            **bad_digest,
+        )
+
+    with stubber, pytest.raises(HTTPException) as exc_info:
+        storage._store_downloaded_image(_jpeg_bytes(), 1, 2, None)
+
+    assert exc_info.value.status_code == 500
+    assert exc_info.value.detail == "Data was corrupted during upload"
+    # Every stubbed call was made: for a multipart body, the abort included.
+    stubber.assert_no_pending_responses()
+
+
+class _FakeUploadBucket:
+    def __init__(self, etag=None, error_code=None):
+        self.etag = etag
+        self.error_code = error_code
+        self.content_md5 = "unset"
+        self.deleted = []
+
+    def upload_file_bytes(self, data, key, content_type, content_md5=None):
+        from botocore.exceptions import ClientError
+
+        self.content_md5 = content_md5
+        if self.error_code:
+            raise ClientError({"Error": {"Code": self.error_code}}, "PutObject")
+        return True
+
+    def get_file_metadata(self, key):
+        return {"ETag": f'"{self.etag}"'}
+
+    def delete_file(self, key):
+        self.deleted.append(key)
+
+
+def test_bad_digest_maps_to_corruption_error(monkeypatch):
+    bucket = _FakeUploadBucket(error_code="BadDigest")
+    monkeypatch.setattr(storage.s3_service, "get_bucket", lambda _name: bucket)
+    with pytest.raises(HTTPException) as exc_info:
+        storage._store_downloaded_image(b"\xff\xd8\xff body", 1, 2, None)
+    assert exc_info.value.status_code == 500
+    assert exc_info.value.detail == "Data was corrupted during upload"
+
+
+def test_head_verification_setting_restores_etag_check(monkeypatch):
+    """S3_VERIFY_UPLOADS_WITH_HEAD: no Content-MD5 on the PUT; the object is
+    read back and deleted when its ETag disagrees."""
+    bucket = _FakeUploadBucket(etag="not-the-md5")
+    monkeypatch.setattr(storage.s3_service, "get_bucket", lambda _name: bucket)
+    monkeypatch.setattr(settings, "S3_VERIFY_UPLOADS_WITH_HEAD", True)
+    with pytest.raises(HTTPException) as exc_info:
+        storage._store_downloaded_image(b"\xff\xd8\xff body", 1, 2, None)
+    assert exc_info.value.detail == "Data was corrupted during upload"
+    assert bucket.content_md5 is None
+    assert len(bucket.deleted) == 1
+
+
+def test_large_upload_streams_parts_each_with_content_md5(monkeypatch):
+    """With Content-MD5, a body larger than one part is still uploaded in
+    parts, and every part carries its own digest."""
+    import base64
+    import hashlib
+
+    monkeypatch.setattr(storage, "_MULTIPART_CHUNK_BYTES", 5 * 1024 * 1024)
+    body = random.randbytes(11 * 1024 * 1024)
+    bucket = storage.s3_service.get_bucket(storage.s3_service.resolve_bucket_name())
+    sent = []
+
+    def capture(request, **kwargs):
+        sent.append(request.headers.get("Content-MD5"))
+
+    bucket._s3.meta.events.register("before-send.s3.UploadPart", capture)
+    try:
+        bucket.upload_file(
+            "multipart.bin", io.BytesIO(body), content_md5=hashlib.md5(body).hexdigest()
+        )
+    finally:
+        bucket._s3.meta.events.unregister("before-send.s3.UploadPart", capture)
+
+    chunks = [
+        body[i : i + 5 * 1024 * 1024] for i in range(0, len(body), 5 * 1024 * 1024)
+    ]
+    assert sent == [base64.b64encode(hashlib.md5(c).digest()) for c in chunks]
+    assert bucket.download_file("multipart.bin") == body
+    bucket.delete_file("multipart.bin")
+
+
+def test_large_upload_not_matching_content_md5_is_aborted(monkeypatch):
+    """Parts that do not add up to the expected digest are never completed
+    into an object, and the failure reads as corruption."""
+    monkeypatch.setattr(storage, "_MULTIPART_CHUNK_BYTES", 5 * 1024 * 1024)
+    bucket = storage.s3_service.get_bucket(storage.s3_service.resolve_bucket_name())
+    aborted = []
+    abort = bucket._s3.abort_multipart_upload
+    monkeypatch.setattr(
+        bucket._s3,
+        "abort_multipart_upload",
+        lambda **kwargs: aborted.append(kwargs["Key"]) or abort(**kwargs),
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        with storage._bad_digest_is_corruption():
+            bucket.upload_file(
+                "mismatch.bin", io.BytesIO(random.randbytes(6 * 1024 * 1024)), "0" * 32
+            )
+
+    assert exc_info.value.detail == "Data was corrupted during upload"
+    assert aborted == ["mismatch.bin"]
+    assert not bucket.check_file_existence("mismatch.bin")
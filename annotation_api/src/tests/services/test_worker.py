@@ -3,7 +3,10 @@ import pytest
 from sqlalchemy import select
 
 import app.worker as worker
-from app.models import Detection, Sequence
+from app.core.config import settings
+from app.models import AutoPredictionCache, Detection, Sequence
+from app.services.prediction_cache import image_key
+from app.services.storage import s3_service
 from app.worker import auto_annotate_sequence
 
 
@@ -18,13 +21,18 @@ async def test_auto_annotate_keeps_anchored_boxes_drops_fps(
     overlapping it (kept) and one far-away box (dropped)."""
 
     class FakeDetector:
-        def predict(self, _img):
-            return np.array(
-                [
-                    [0.25, 0.25, 0.5, 0.5, 0.5],  # overlaps seq-1 anchor -> kept
-                    [0.80, 0.80, 0.95, 0.95, 0.9],  # no overlap (FP) -> dropped
-                ]
-            )
+        max_batch_size = 8
+
+        def predict_batch(self, imgs):
+            return [
+                np.array(
+                    [
+                        [0.25, 0.25, 0.5, 0.5, 0.5],  # overlaps seq-1 anchor -> kept
+                        [0.80, 0.80, 0.95, 0.95, 0.9],  # no overlap (FP) -> dropped
+                    ]
+                )
+                for _ in imgs
+            ]
 
     monkeypatch.setattr(worker, "get_detector", lambda: FakeDetector())
 
@@ -79,8 +87,10 @@ async def test_auto_annotate_no_engine_anchor_keeps_nothing(
     unconfirmed candidate and is dropped (auto_predictions is empty, not null)."""
 
     class FakeDetector:
-        def predict(self, _img):
-            return np.array([[0.25, 0.25, 0.5, 0.5, 0.9]])
+        max_batch_size = 8
+
+        def predict_batch(self, imgs):
+            return [np.array([[0.25, 0.25, 0.5, 0.5, 0.9]]) for _ in imgs]
 
     monkeypatch.setattr(worker, "get_detector", lambda: FakeDetector())
 
@@ -124,7 +134,9 @@ async def test_auto_annotate_total_failure_raises_and_does_not_stamp(
     layer would surface in the queue and never be revisited."""
 
     class ExplodingDetector:
-        def predict(self, _img):
+        max_batch_size = 8
+
+        def predict_batch(self, _imgs):
             raise RuntimeError("boom")
 
     monkeypatch.setattr(worker, "get_detector", lambda: ExplodingDetector())
@@ -135,3 +147,129 @@ async def test_auto_annotate_total_failure_raises_and_does_not_stamp(
     detection_session.expire_all()
     seq1 = await detection_session.get(Sequence, 1)
     assert seq1.auto_annotated_at is None
+
+
+@pytest.mark.asyncio
+async def test_auto_annotate_skips_frames_that_fail_to_download(
+    detection_session, monkeypatch
+):
+    """A frame missing from S3 is dropped from its batch while the rest of the
+    lane is still inferred, in order, and the lane is stamped."""
+    seen = []
+
+    class RecordingDetector:
+        max_batch_size = 1
+
+        def predict_batch(self, imgs):
+            seen.append(len(imgs))
+            return [np.array([[0.25, 0.25, 0.5, 0.5, 0.5]]) for _ in imgs]
+
+    monkeypatch.setattr(worker, "get_detector", lambda: RecordingDetector())
+
+    missing = await detection_session.get(Detection, 2)
+    missing.bucket_key = "does_not_exist.jpg"
+    detection_session.add(missing)
+    await detection_session.commit()
+
+    await auto_annotate_sequence(sequence_id=1)
+
+    detection_session.expire_all()
+    assert seen == [1]
+    assert (await detection_session.get(Detection, 1)).auto_predictions
+    assert (await detection_session.get(Detection, 2)).auto_predictions is None
+    assert (await detection_session.get(Sequence, 1)).auto_annotated_at is not None
+
+
+@pytest.mark.asyncio
+async def test_auto_annotate_reuses_cached_predictions(detection_session, monkeypatch):
+    """A re-run (or a sibling lane sharing the photos) infers nothing: every
+    frame comes from the prediction cache and yields the same result. A new
+    model version is a different cache key and infers again."""
+    calls = []
+
+    class CountingDetector:
+        max_batch_size = 8
+
+        def predict_batch(self, imgs):
+            calls.append(len(imgs))
+            return [np.array([[0.25, 0.25, 0.5, 0.5, 0.5]]) for _ in imgs]
+
+    monkeypatch.setattr(worker, "get_detector", lambda: CountingDetector())
+
+    await auto_annotate_sequence(sequence_id=1)
+    assert calls == [2]
+    cached = (await detection_session.execute(select(AutoPredictionCache))).scalars()
+    assert sorted(row.image_key for row in cached) == [
+        "seq1_img1.jpg",
+        "seq1_img2.jpg",
+    ]
+
+    # Sibling lane showing the same photo as seq 1's first frame.
+    sibling = await detection_session.get(Detection, 3)
+    sibling.bucket_key = "seq1_img1.jpg"
+    detection_session.add(sibling)
+    await detection_session.commit()
+
+    await auto_annotate_sequence(sequence_id=1)
+    await auto_annotate_sequence(sequence_id=2)
+    assert calls == [2]
+    detection_session.expire_all()
+    assert (await detection_session.get(Detection, 3)).auto_predictions is not None
+
+    monkeypatch.setattr(settings, "AUTOANNOTATE_MODEL_VERSION", "onnx-next")
+    await auto_annotate_sequence(sequence_id=1)
+    assert calls == [2, 2]
+
+
+def test_image_key_drops_the_detection_id():
+    assert (
+        image_key("detections/sequence_7/20260701_100000_det41_0a1b2c3d.jpg")
+        == image_key("detections/sequence_9/20260701_100000_det57_0a1b2c3d.jpg")
+        == "20260701_100000_0a1b2c3d.jpg"
+    )
+    # Same hash prefix, another capture time: another photo.
+    assert image_key("detections/sequence_7/20260701_100001_det41_0a1b2c3d.jpg") != (
+        image_key("detections/sequence_7/20260701_100000_det41_0a1b2c3d.jpg")
+    )
+    assert image_key("seq1_img1.jpg") == "seq1_img1.jpg"
+
+
+@pytest.mark.asyncio
+async def test_sibling_lane_reuses_a_photo_stored_under_its_own_key(
+    detection_session, monkeypatch
+):
+    """Importer-created siblings copy a shared capture to a key of their own
+    (``_det{id}_{hash}``); the photo is still inferred only once."""
+    calls = []
+
+    class CountingDetector:
+        max_batch_size = 8
+
+        def predict_batch(self, imgs):
+            calls.append(len(imgs))
+            return [np.array([[0.25, 0.25, 0.5, 0.5, 0.5]]) for _ in imgs]
+
+    monkeypatch.setattr(worker, "get_detector", lambda: CountingDetector())
+    bucket = s3_service.get_bucket(s3_service.resolve_bucket_name())
+    first_key = "detections/sequence_1/20260701_100000_det1_0a1b2c3d.jpg"
+    bucket._s3.copy_object(
+        Bucket=bucket.name,
+        Key=first_key,
+        CopySource={"Bucket": bucket.name, "Key": "seq1_img1.jpg"},
+    )
+    first = await detection_session.get(Detection, 1)
+    first.bucket_key = first_key
+    # Never uploaded: a download attempt would fail the sibling lane.
+    sibling = await detection_session.get(Detection, 3)
+    sibling.bucket_key = "detections/sequence_2/20260701_100000_det3_0a1b2c3d.jpg"
+    detection_session.add_all([first, sibling])
+    await detection_session.commit()
+    try:
+        await auto_annotate_sequence(sequence_id=1)
+        await auto_annotate_sequence(sequence_id=2)
+    finally:
+        bucket.delete_file(first_key)
+
+    assert calls == [2]
+    detection_session.expire_all()
+    assert (await detection_session.get(Detection, 3)).auto_predictions is not None